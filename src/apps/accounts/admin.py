@@ -1,8 +1,19 @@
+import re
+import uuid
+
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
 
+from core.paginator import EstimatedCountPaginator
+
 from .models import TokenBlacklist, User
+from .revocation.scheduler import run_cleanup_in_background
+from .search import search_users
+
+# shorter hex terms are more likely the start of an email
+JTI_PREFIX = re.compile(r"[0-9a-f]{8,32}")
 
 
 @admin.register(User)
@@ -10,8 +21,12 @@ class UserAdmin(BaseUserAdmin):
     ordering = ["email"]
     list_display = ["email", "first_name", "last_name", "is_staff", "is_active"]
     list_filter = ["is_staff", "is_active"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
 
     search_fields = ("email", "first_name", "last_name")
+    search_help_text = _("Email prefix, or part of an email or name")
 
     fieldsets = (
         (None, {"fields": ("email", "password")}),
@@ -43,29 +58,58 @@ class UserAdmin(BaseUserAdmin):
 
     readonly_fields = ["date_joined", "updated_at", "id"]
 
+    def get_search_results(self, request, queryset, search_term):
+        """Search the indexed document, ranked unless a column was clicked."""
+        results = search_users(queryset, search_term)
+        if search_term.strip() and ORDER_VAR in request.GET:
+            results = results.order_by(*queryset.query.order_by)
+        return results, False
+
 
 @admin.register(TokenBlacklist)
 class TokenBlacklistAdmin(admin.ModelAdmin):
-    """Admin interface for managing blacklisted tokens."""
+    """Admin interface for managing blacklisted tokens.
+
+    Built for a table of tens of millions of rows: the list is ordered by
+    the uuid7 jti, newest first through the primary key index, counts are
+    estimated and searches are jti or email prefix range scans.
+    """
 
     list_display = ["user", "jti_short", "reason", "blacklisted_at", "expires_at"]
     list_filter = ["reason", "blacklisted_at", "expires_at"]
+    list_select_related = ["user"]
+    ordering = ["-jti"]
     search_fields = ["user__email", "jti"]
-    readonly_fields = ["id", "blacklisted_at", "jti"]
+    search_help_text = _("Start of a JWT ID, or of the user's email")
+    readonly_fields = ["blacklisted_at", "jti"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
 
     fieldsets = (
-        (None, {"fields": ("id", "user", "jti")}),
+        (None, {"fields": ("jti", "user")}),
         (_("Reason & Timing"), {"fields": ("reason", "blacklisted_at", "expires_at")}),
     )
 
     def jti_short(self, obj):
         """Display shortened JTI for readability."""
-        if len(obj.jti) > 20:
-            return f"{obj.jti[:20]}..."
-        return obj.jti
+        return f"{obj.jti.hex[:12]}..."
 
     jti_short.short_description = "JWT ID"
 
+    def get_search_results(self, request, queryset, search_term):
+        """Match jti prefixes by primary key range, anything else by email prefix."""
+        term = search_term.strip().lower()
+        if not term:
+            return queryset, False
+        hex_term = term.replace("-", "")
+        if JTI_PREFIX.fullmatch(hex_term):
+            return queryset.filter(
+                jti__gte=uuid.UUID(hex_term.ljust(32, "0")),
+                jti__lte=uuid.UUID(hex_term.ljust(32, "f")),
+            ), False
+        return queryset.filter(user__email__istartswith=term), False
+
     def has_add_permission(self, request):
         """Don't allow manual creation via admin."""
         return False
@@ -77,8 +121,14 @@ class TokenBlacklistAdmin(admin.ModelAdmin):
     actions = ["cleanup_expired_tokens"]
 
     def cleanup_expired_tokens(self, request, queryset):
-        """Admin action to cleanup expired tokens."""
-        deleted_count, _ = TokenBlacklist.cleanup_expired()
-        self.message_user(request, f"Deleted {deleted_count} expired token entries.")
+        """Admin action to cleanup expired tokens.
+
+        Cleans up every expired entry, not only the selected ones, in a
+        background thread like the scheduler so the request returns at once.
+        """
+        run_cleanup_in_background()
+        self.message_user(
+            request, "Cleanup of all expired token entries started in the background."
+        )
 
-    cleanup_expired_tokens.short_description = "Clean up expired tokens"
+    cleanup_expired_tokens.short_description = "Clean up all expired tokens"
@@ -1,15 +1,35 @@
+from django.db.models import Exists
+from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 
-from apps.accounts.models.jwt_token_blacklist import TokenBlacklist
+from apps.accounts.conf import get_setting
+from apps.accounts.revocation.backends import get_blacklist_backend
+from apps.accounts.revocation.sessions import (
+    SESSION_ID_CLAIM,
+    active_session,
+    cached_session_status,
+    remember_session_status,
+)
+from apps.accounts.revocation.versions import token_version_matches
+from apps.accounts.token_cache import verified_tokens
+from apps.accounts.user_cache import user_cache
 
 
 class JWTAuthenticationWithBlacklist(JWTAuthentication):
-    """JWT Authentication that checks if the token's jti is in the blacklist.
+    """JWT Authentication that checks if the token has been revoked.
 
-    Extends the default JWTAuthentication to validate tokens against
-    the TokenBlacklist model. If a token's jti is found in the blacklist,
-    authentication fails.
+    Extends the default JWTAuthentication to reject tokens whose session
+    has been revoked (cached lookup on the ``sid`` claim). Only refresh jtis
+    are ever blacklisted, so the per-request jti lookup against the
+    blacklist backend only runs when ``CHECK_ACCESS_TOKEN_JTI`` is enabled.
+
+    The user, the session status and the jti lookup of the database backend
+    are fetched in a single query when any of them is not cached, warm
+    requests make no query at all. Tokens already seen by the worker skip
+    signature verification, see apps/accounts/token_cache.py.
     """
 
     def authenticate(self, request):
@@ -23,18 +43,109 @@ class JWTAuthenticationWithBlacklist(JWTAuthentication):
             AuthenticationFailed: if token is invalid or blacklisted
 
         """
-        # Call parent authenticate to get user and token
-        result = super().authenticate(request)
+        header = self.get_header(request)
+        if header is None:
+            return None
 
-        if result is None:
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
             return None
 
-        user, token = result
+        token = self.get_validated_token(raw_token)
+        user_id = self.get_user_id(token)
+
+        # checks not answered by a cache ride along with the user query
+        checks = {}
+        session_id = token.get(SESSION_ID_CLAIM)
+        session_revoked = None
+        if session_id is not None:
+            session_revoked = cached_session_status(session_id)
+            if session_revoked is None:
+                checks["session_active"] = Exists(active_session(session_id))
 
-        # Check if the token's jti is blacklisted
         jti = token.get("jti")
+        jti_blacklisted = None
+        backend = get_blacklist_backend()
+        if jti and get_setting("CHECK_ACCESS_TOKEN_JTI"):
+            lookup = backend.lookup_queryset(jti)
+            if lookup is not None:
+                checks["jti_blacklisted"] = Exists(lookup)
+
+        if checks:
+            snapshot, found = user_cache.load(user_id, **checks)
+            if "session_active" in found:
+                session_revoked = not found["session_active"]
+                remember_session_status(session_id, session_revoked)
+            jti_blacklisted = found.get("jti_blacklisted")
+        else:
+            snapshot = user_cache.get(user_id)
+
+        user = self.check_user(token, snapshot)
 
-        if jti and TokenBlacklist.is_blacklisted(jti):
+        if session_revoked:
+            raise AuthenticationFailed("Token has been revoked/blacklisted")
+
+        if (
+            jti
+            and get_setting("CHECK_ACCESS_TOKEN_JTI")
+            and (
+                backend.is_blacklisted(jti)
+                if jti_blacklisted is None
+                else jti_blacklisted
+            )
+        ):
             raise AuthenticationFailed("Token has been revoked/blacklisted")
 
         return user, token
+
+    def get_validated_token(self, raw_token):
+        """Validate the token, or reuse it if it was already verified."""
+        token = verified_tokens.get(raw_token)
+        # introspection caches refresh tokens too, they must not authenticate
+        if not isinstance(token, tuple(jwt_settings.AUTH_TOKEN_CLASSES)):
+            token = super().get_validated_token(raw_token)
+            verified_tokens.add(raw_token, token)
+        return token
+
+    def get_user(self, validated_token):
+        """Resolve the user and reject tokens issued before its last revocation.
+
+        Same checks as SimpleJWT, but the user comes from the per-worker
+        snapshot cache instead of a query per request.
+        """
+        snapshot = user_cache.get(self.get_user_id(validated_token))
+        return self.check_user(validated_token, snapshot)
+
+    def get_user_id(self, validated_token):
+        """Return the user id claim of the token."""
+        try:
+            return validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+    def check_user(self, validated_token, snapshot):
+        """Return the snapshot's user if the token may still act for it."""
+        if snapshot is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        user = snapshot.to_user()
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if (
+            jwt_settings.CHECK_REVOKE_TOKEN
+            and validated_token.get(jwt_settings.REVOKE_TOKEN_CLAIM)
+            != snapshot.password_fingerprint
+        ):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+
+        if not token_version_matches(validated_token, user):
+            raise AuthenticationFailed(
+                "Token has been revoked/blacklisted", code="token_revoked"
+            )
+
+        return user
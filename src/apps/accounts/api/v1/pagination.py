@@ -0,0 +1,58 @@
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+from apps.accounts.conf import get_setting
+from core.db import count_or_estimate
+
+
+class SessionCursorPagination(CursorPagination):
+    """Page through a user's sessions, most recently used first."""
+
+    ordering = ("-last_used_at", "-id")
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = "page_size"
+
+
+class UserCursorPagination(CursorPagination):
+    """Page through all users, newest first.
+
+    The cursor seeks on ``date_joined`` through ``accounts_user_joined_idx``
+    or the partial index of the filter in use, so deep pages cost the same as
+    the first one. Only the first page carries a ``count``, exact below
+    ``USER_COUNT_EXACT_BELOW`` and the planner's estimate above it.
+    """
+
+    ordering = ("-date_joined", "-id")
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = "page_size"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if self.cursor_query_param not in request.query_params:
+            self.count, self.count_is_estimate = count_or_estimate(
+                queryset, get_setting("USER_COUNT_EXACT_BELOW")
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count is None:
+            return response
+        return Response(
+            {
+                "count": self.count,
+                "count_is_estimate": self.count_is_estimate,
+                **response.data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema["properties"] = {
+            "count": {"type": "integer", "example": 123},
+            "count_is_estimate": {"type": "boolean", "example": False},
+            **schema["properties"],
+        }
+        return schema
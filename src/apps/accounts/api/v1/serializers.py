@@ -1,11 +1,35 @@
 import structlog
+from django.contrib.auth.models import update_last_login
 from rest_framework import serializers
 from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework_simplejwt.serializers import TokenRefreshSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
-
-from apps.accounts.models.jwt_token_blacklist import TokenBlacklist
+from rest_framework_simplejwt.serializers import (
+    TokenObtainSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from apps.accounts.conf import get_setting
+from apps.accounts.introspection import introspect
+from apps.accounts.models.opaque_refresh_token import OpaqueRefreshToken
 from apps.accounts.models.user import User
+from apps.accounts.models.user_session import UserSession
+from apps.accounts.revocation.backends import get_blacklist_backend
+from apps.accounts.revocation.replay import get_refresh_replay, remember_refresh_result
+from apps.accounts.revocation.sessions import (
+    SESSION_ID_CLAIM,
+    advance_session,
+    is_session_revoked,
+    revoke_session,
+    start_session,
+    token_session_revoked,
+)
+from apps.accounts.revocation.versions import (
+    TOKEN_VERSION_CLAIM,
+    add_token_version,
+    get_token_state,
+    token_is_current,
+)
+from apps.accounts.tokens import AccessToken, RefreshToken
 from core.email import send_verification_email
 
 logger = structlog.getLogger(__name__)
@@ -89,6 +113,21 @@ class UserSerializer(serializers.ModelSerializer):
         ]
 
 
+class UserSessionSerializer(serializers.ModelSerializer):
+    """List a user's active sessions (logged in devices)."""
+
+    is_current = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UserSession
+        fields = ["id", "user_agent", "created_at", "last_used_at", "is_current"]
+
+    def get_is_current(self, obj):
+        """Flag the session the request was made with."""
+        token = getattr(self.context.get("request"), "auth", None)
+        return bool(token) and token.get(SESSION_ID_CLAIM) == str(obj.id)
+
+
 class ChangePasswordSerializer(serializers.Serializer):
     """Change authenticated user password.
 
@@ -115,15 +154,19 @@ class ChangePasswordSerializer(serializers.Serializer):
         return attrs
 
     def update(self, instance, validated_data):
+        """Set the new password and revoke every token issued before it."""
         instance.set_password(validated_data["new_password"])
         instance.save(update_fields=["password"])
+        instance.revoke_tokens()
         return instance
 
 
 class LogoutSerializer(serializers.Serializer):
     """Logout serializer to blacklist refresh token.
 
-    Validates the refresh token and prepares it for blacklisting.
+    Validates the refresh token and prepares it for blacklisting. Tokens
+    that belong to a session are logged out by revoking the session, which
+    also kills the access tokens issued with it.
     """
 
     refresh = serializers.CharField(
@@ -133,6 +176,9 @@ class LogoutSerializer(serializers.Serializer):
 
     def validate_refresh(self, value):
         """Validate the refresh token."""
+        if get_setting("REFRESH_TOKEN_MODE") == "opaque":
+            # handles are opaque, they are checked against the table on save
+            return value
         try:
             RefreshToken(value)
         except Exception as e:
@@ -141,6 +187,9 @@ class LogoutSerializer(serializers.Serializer):
 
     def save(self, user):
         """Blacklist the refresh token."""
+        if get_setting("REFRESH_TOKEN_MODE") == "opaque":
+            return self._logout_opaque(self.validated_data["refresh"])
+
         refresh_token = RefreshToken(self.validated_data["refresh"])
 
         # Get token claims
@@ -152,44 +201,197 @@ class LogoutSerializer(serializers.Serializer):
                 "Invalid token structure - missing jti or exp claim"
             )
 
-        # Check if already blacklisted
-        if TokenBlacklist.is_blacklisted(jti):
-            return {"detail": "Token already blacklisted"}
+        session_id = refresh_token.get(SESSION_ID_CLAIM)
+        if session_id is not None:
+            if not revoke_session(session_id):
+                return {"detail": "Token already blacklisted"}
+            return {"detail": "Successfully logged out"}
 
-        # Blacklist the token
-        TokenBlacklist.blacklist_token(
-            user=user,
+        # Blacklist the token, a single atomic insert-if-absent
+        claimed = get_blacklist_backend().blacklist_token(
             jti=jti,
             exp_timestamp=exp,
+            user_id=user.pk,
             reason="logout",
         )
+        if not claimed:
+            return {"detail": "Token already blacklisted"}
+
+        return {"detail": "Successfully logged out"}
+
+    def _logout_opaque(self, raw_token):
+        """Delete the refresh handle and revoke its session."""
+        consumed = OpaqueRefreshToken.consume(raw_token)
+        if consumed is None:
+            return {"detail": "Token already blacklisted"}
 
+        _, session_id, _ = consumed
+        revoke_session(session_id)
         return {"detail": "Successfully logged out"}
 
 
+class TokenIntrospectionSerializer(serializers.Serializer):
+    """Batch of tokens to introspect, answered in the order they were sent."""
+
+    tokens = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        write_only=True,
+        help_text="Access or refresh tokens to introspect",
+    )
+
+    def validate_tokens(self, value):
+        """Cap the batch at ``INTROSPECTION_MAX_TOKENS``."""
+        limit = get_setting("INTROSPECTION_MAX_TOKENS")
+        if len(value) > limit:
+            raise serializers.ValidationError(
+                f"At most {limit} tokens can be introspected at once"
+            )
+        return value
+
+    def save(self):
+        """Return the introspection result of every token."""
+        return {"results": introspect(self.validated_data["tokens"])}
+
+
+class CustomTokenObtainPairSerializer(TokenObtainSerializer):
+    """Issue token pairs stamped with the user's token version and a new session."""
+
+    token_class = RefreshToken
+
+    @classmethod
+    def get_token(cls, user):
+        return add_token_version(super().get_token(user), user)
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+
+        refresh = self.get_token(self.user)
+        request = self.context.get("request")
+        session = start_session(
+            refresh,
+            self.user,
+            user_agent=request.META.get("HTTP_USER_AGENT", "") if request else "",
+        )
+
+        data.update(self.get_token_pair(refresh, session))
+
+        if jwt_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, self.user)
+
+        return data
+
+    def get_token_pair(self, refresh, session):
+        """Serialize the pair handed to the client."""
+        return {"refresh": str(refresh), "access": str(refresh.access_token)}
+
+
+class OpaqueTokenObtainPairSerializer(CustomTokenObtainPairSerializer):
+    """Issue a JWT access token with an opaque refresh handle."""
+
+    def get_token_pair(self, refresh, session):
+        return {
+            "refresh": OpaqueRefreshToken.issue(
+                self.user.pk, session.pk, self.user.token_version
+            ),
+            "access": str(refresh.access_token),
+        }
+
+
 class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """Rotate a refresh token, revoking the old one atomically.
+
+    Session tokens advance their family with a single conditional UPDATE,
+    and presenting an already rotated token revokes the whole family.
+    Tokens without a session claim their old jti in the blacklist with a
+    single insert-if-absent instead. Either way, of two concurrent
+    refreshes with the same token only one gets a new pair. The user row is
+    never loaded, its token version and active flag come from a cached
+    lookup. Retries of a rotated token within ``REFRESH_GRACE_PERIOD``
+    seconds get back the pair issued for it.
+    """
+
     def validate(self, attrs):
         refresh_token_str = attrs["refresh"]
         refresh = RefreshToken(refresh_token_str)
 
-        jti = refresh["jti"]
-        # check refresh token alreay in blacklist?
-        if TokenBlacklist.is_blacklisted(jti):
+        if token_session_revoked(refresh):
             raise TokenError("Token has been revoked/blacklisted.")
 
-        # generate new token
-        data = super().validate(attrs)
-
         # extract user_id from jwt payload
-        user_id = refresh.payload.get("user_id")
-        user = User.objects.filter(id=user_id).first()
+        user_id = refresh.payload.get(jwt_settings.USER_ID_CLAIM)
 
-        # save old token in to blacklist
-        TokenBlacklist.blacklist_token(
-            user=user,
-            jti=jti,
-            exp_timestamp=refresh["exp"],
-            reason="rotation",
-        )
+        # inactive users and tokens issued before revoke_tokens() are dead
+        if not user_id or not token_is_current(refresh, user_id):
+            raise TokenError("Token has been revoked/blacklisted.")
+
+        data = {"access": str(refresh.access_token)}
+
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            jti, exp = refresh["jti"], refresh["exp"]
+            session_id = refresh.get(SESSION_ID_CLAIM)
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+
+            if session_id is not None:
+                rotated = advance_session(session_id, jti, refresh["jti"])
+            else:
+                # save old token in to blacklist, fails if it already is
+                rotated = get_blacklist_backend().blacklist_token(
+                    jti=jti, exp_timestamp=exp, user_id=user_id, reason="rotation"
+                )
+
+            if not rotated:
+                replay = get_refresh_replay(jti)
+                if replay is None:
+                    raise TokenError("Token has been revoked/blacklisted.")
+                return replay
+
+            data["refresh"] = str(refresh)
+            remember_refresh_result(jti, data)
+
+        return data
+
+
+class OpaqueTokenRefreshSerializer(serializers.Serializer):
+    """Rotate an opaque refresh handle.
+
+    The old handle is deleted with a single ``DELETE ... RETURNING`` on its
+    hash, which also tells who it was issued to. Nothing is decoded or
+    blacklisted, a handle that was already used is simply gone.
+    """
+
+    refresh = serializers.CharField()
+    access = serializers.CharField(read_only=True)
+
+    def validate(self, attrs):
+        raw_token = attrs["refresh"]
+        token_hash = OpaqueRefreshToken.hash(raw_token)
+
+        consumed = OpaqueRefreshToken.consume(raw_token)
+        if consumed is None:
+            replay = get_refresh_replay(token_hash)
+            if replay is None:
+                raise TokenError("Token has been revoked/blacklisted.")
+            return replay
+
+        user_id, session_id, token_version = consumed
+        if is_session_revoked(session_id) or get_token_state(user_id) != (
+            token_version,
+            True,
+        ):
+            raise TokenError("Token has been revoked/blacklisted.")
+
+        access = AccessToken()
+        access[jwt_settings.USER_ID_CLAIM] = str(user_id)
+        access[TOKEN_VERSION_CLAIM] = token_version
+        access[SESSION_ID_CLAIM] = str(session_id)
 
+        data = {
+            "access": str(access),
+            "refresh": OpaqueRefreshToken.issue(user_id, session_id, token_version),
+        }
+        remember_refresh_result(token_hash, data)
         return data
@@ -1,15 +1,23 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenObtainPairView
 
 from . import viewsets
-from .viewsets import CustomTokenRefreshView
+from .viewsets import (
+    CustomTokenObtainPairView,
+    CustomTokenRefreshView,
+    TokenIntrospectionView,
+)
 
 router = DefaultRouter()
 router.register("users", viewsets.UserViewSet, basename="user")
 
 urlpatterns = [
     path("", include(router.urls)),
-    path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("token/", CustomTokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", CustomTokenRefreshView.as_view(), name="token_refresh"),
+    path(
+        "token/introspect/",
+        TokenIntrospectionView.as_view(),
+        name="token_introspect",
+    ),
 ]
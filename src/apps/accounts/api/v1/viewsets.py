@@ -1,23 +1,37 @@
 import structlog
 from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.generics import GenericAPIView
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
-from rest_framework_simplejwt.views import TokenRefreshView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from apps.accounts.conf import get_setting
+from apps.accounts.export import CONTENT_TYPES, ENCODERS, export_rows
+from apps.accounts.models.user_session import UserSession
+from apps.accounts.revocation.sessions import revoke_session
+from apps.accounts.search import search_users
 from core.email import verify_email_token
 from core.permissions import IsOwnerOrStaff
 
+from .filters import UserFilterBackend
+from .pagination import SessionCursorPagination, UserCursorPagination
 from .serializers import (
     ChangePasswordSerializer,
+    CustomTokenObtainPairSerializer,
     CustomTokenRefreshSerializer,
     LogoutSerializer,
+    OpaqueTokenObtainPairSerializer,
+    OpaqueTokenRefreshSerializer,
+    TokenIntrospectionSerializer,
     UserCreateSerializer,
     UserSerializer,
+    UserSessionSerializer,
     UserUpdateSerializer,
 )
 
@@ -37,6 +51,8 @@ class UserViewSet(ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = UserCursorPagination
+    filter_backends = [UserFilterBackend]
 
     def get_permissions(self):
         """Allow anyone to register, only admin can list/destroy."""
@@ -56,6 +72,67 @@ class UserViewSet(ModelViewSet):
             return UserUpdateSerializer
         return super().get_serializer_class()
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="search",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description=(
+                    "Match email and names, best matches first. Searches "
+                    "return a single page of up to page_size users."
+                ),
+            )
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        """List users newest first, or the best matches of a search."""
+        term = request.query_params.get("search", "").strip()
+        if not term:
+            return super().list(request, *args, **kwargs)
+
+        # ranked results have no stable order to put a cursor on
+        queryset = search_users(self.filter_queryset(self.get_queryset()), term)
+        users = queryset[: self.paginator.get_page_size(request)]
+        serializer = self.get_serializer(users, many=True)
+        return Response({"results": serializer.data})
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="output",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                enum=tuple(ENCODERS),
+                description="Export format, ndjson unless csv is asked for",
+            )
+        ],
+        responses={
+            (200, content_type): OpenApiTypes.STR
+            for content_type in CONTENT_TYPES.values()
+        },
+    )
+    @action(detail=False, methods=["get"], permission_classes=[IsAdminUser])
+    def export(self, request):
+        """Stream every user matching the list filters, oldest first.
+
+        Rows are read through a server-side cursor and written as they
+        arrive, so exports of any size use the same worker memory.
+        """
+        output = request.query_params.get("output", "ndjson")
+        if output not in ENCODERS:
+            return Response(
+                {"output": [f"Must be one of: {', '.join(ENCODERS)}."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rows = export_rows(self.filter_queryset(self.get_queryset()))
+        response = StreamingHttpResponse(
+            ENCODERS[output](rows), content_type=CONTENT_TYPES[output]
+        )
+        response["Content-Disposition"] = f'attachment; filename="users.{output}"'
+        return response
+
     @action(
         detail=False,
         methods=["post"],
@@ -63,7 +140,11 @@ class UserViewSet(ModelViewSet):
         serializer_class=ChangePasswordSerializer,
     )
     def change_password(self, request):
-        """Create change_password route to change current user password."""
+        """Create change_password route to change current user password.
+
+        Changing the password revokes every token issued to the user, so all
+        sessions (including the current one) have to log in again.
+        """
         user = request.user
 
         if not user.check_password(request.data.get("old_password")):
@@ -97,6 +178,50 @@ class UserViewSet(ModelViewSet):
 
         return Response(response_data, status=status.HTTP_200_OK)
 
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[IsAuthenticated],
+        serializer_class=UserSessionSerializer,
+        pagination_class=SessionCursorPagination,
+    )
+    def sessions(self, request):
+        """List the current user's active sessions, one per logged in device."""
+        queryset = UserSession.objects.filter(
+            user=request.user, revoked_at__isnull=True
+        )
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="session_id",
+                type=OpenApiTypes.UUID,
+                location=OpenApiParameter.PATH,
+                description="Id of the session to revoke",
+                required=True,
+            )
+        ],
+        request=None,
+        responses={204: None},
+    )
+    @action(
+        detail=False,
+        methods=["delete"],
+        permission_classes=[IsAuthenticated],
+        url_path="sessions/(?P<session_id>[0-9a-f-]{32,36})",
+        url_name="revoke-session",
+    )
+    def revoke_device(self, request, session_id):
+        """Log a device out by revoking one of the current user's sessions."""
+        if not revoke_session(session_id, user=request.user):
+            return Response(
+                {"detail": "Session not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -179,5 +304,35 @@ class UserViewSet(ModelViewSet):
             )
 
 
+class TokenIntrospectionView(GenericAPIView):
+    """Tell gateways which of a batch of tokens are active, RFC 7662 style.
+
+    Every token gets ``{"active": false}`` or ``{"active": true}`` plus its
+    claims. Only staff accounts, such as the gateway's service account, may
+    introspect tokens.
+    """
+
+    permission_classes = [IsAdminUser]
+    serializer_class = TokenIntrospectionSerializer
+
+    def post(self, request):
+        """Introspect the posted tokens."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.save(), status=status.HTTP_200_OK)
+
+
+class CustomTokenObtainPairView(TokenObtainPairView):
+    def get_serializer_class(self):
+        """Hand out opaque refresh handles when the deployment selects them."""
+        if get_setting("REFRESH_TOKEN_MODE") == "opaque":
+            return OpaqueTokenObtainPairSerializer
+        return CustomTokenObtainPairSerializer
+
+
 class CustomTokenRefreshView(TokenRefreshView):
-    serializer_class = CustomTokenRefreshSerializer
+    def get_serializer_class(self):
+        """Rotate opaque refresh handles when the deployment selects them."""
+        if get_setting("REFRESH_TOKEN_MODE") == "opaque":
+            return OpaqueTokenRefreshSerializer
+        return CustomTokenRefreshSerializer
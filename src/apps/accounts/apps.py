@@ -8,3 +8,5 @@ class AccountsConfig(AppConfig):
     def ready(self):
         # force import OpenAPI extensions
         import apps.accounts.api.v1.openapi  # noqa: F401
+        import apps.accounts.checks  # noqa: F401
+        import apps.accounts.signals  # noqa: F401
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core import checks
+
+from apps.accounts.conf import get_setting
+
+# backends whose entries only the process that wrote them can see
+PROCESS_LOCAL_CACHES = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def default_cache_is_process_local():
+    """Return True if the default cache is not shared between workers."""
+    return settings.CACHES["default"]["BACKEND"] in PROCESS_LOCAL_CACHES
+
+
+@checks.register()
+def check_shared_cache(app_configs, **kwargs):
+    """Warn when revocation state cannot reach the other workers."""
+    if not default_cache_is_process_local():
+        return []
+    return [
+        checks.Warning(
+            "The default cache is local to each process.",
+            hint=(
+                "User cache versions, session statuses and token states are "
+                "not shared, other workers see a deactivated user or revoked "
+                "session only once their copy expires. Set CACHE_BACKEND and "
+                "CACHE_LOCATION to a shared cache such as Redis."
+            ),
+            id="accounts.W001",
+        )
+    ]
+
+
+@checks.register()
+def check_refresh_replay_cache(app_configs, **kwargs):
+    """Warn when retried refreshes cannot find the pair issued by another worker."""
+    if not get_setting("REFRESH_GRACE_PERIOD") or not default_cache_is_process_local():
+        return []
+    return [
+        checks.Warning(
+            "REFRESH_GRACE_PERIOD is set but the default cache is local to "
+            "each process.",
+            hint=(
+                "A retried refresh served by another worker than the first "
+                "attempt is rejected. Configure a shared cache or set "
+                "REFRESH_GRACE_PERIOD to 0."
+            ),
+            id="accounts.W002",
+        )
+    ]
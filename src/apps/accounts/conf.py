@@ -0,0 +1,79 @@
+"""Settings for the accounts app.
+
+Projects override any of the defaults below through the ``ACCOUNTS_AUTH``
+dict in django settings, the same way ``SIMPLE_JWT`` is configured.
+"""
+
+from django.conf import settings
+
+DEFAULTS = {
+    # "jwt" for SimpleJWT refresh tokens, "opaque" for random handles stored
+    # hashed in OpaqueRefreshToken
+    "REFRESH_TOKEN_MODE": "jwt",
+    # storage for blacklisted jtis, see apps/accounts/revocation/backends.py
+    "BLACKLIST_BACKEND": "apps.accounts.revocation.backends.DatabaseBlacklistBackend",
+    "BLACKLIST_BACKEND_OPTIONS": {},
+    # also check access token jtis against the blacklist. Only refresh jtis
+    # are ever blacklisted, access tokens are revoked through their session
+    "CHECK_ACCESS_TOKEN_JTI": False,
+    # seconds a session's revoked/active status is cached
+    "SESSION_STATUS_CACHE_TTL": 30,
+    # active sessions a user may hold, the least recently used are revoked
+    "MAX_SESSIONS_PER_USER": 10,
+    # seconds a user's token version and active flag are cached for refresh
+    "TOKEN_STATE_CACHE_TTL": 30,
+    # seconds a retried refresh of an already rotated token gets back the
+    # pair issued for it instead of a 401, 0 disables the grace window
+    "REFRESH_GRACE_PERIOD": 10,
+    # width of the blacklist table's expires_at partitions, "day" or "hour"
+    "BLACKLIST_PARTITION_INTERVAL": "day",
+    # rows per DELETE when cleaning up expired blacklist entries, and seconds
+    # cleanup_tokens sleeps between batches
+    "CLEANUP_BATCH_SIZE": 5000,
+    "CLEANUP_BATCH_PAUSE": 0.1,
+    # seconds between expired entry cleanups run by the web workers, see
+    # apps/accounts/revocation/scheduler.py. 0 leaves cleanup to cron
+    "CLEANUP_INTERVAL": 300,
+    # users resolved from access tokens are kept per worker for this many
+    # seconds, 0 loads the user on every request
+    "USER_CACHE_TTL": 60,
+    "USER_CACHE_SIZE": 10_000,
+    # access tokens whose signature was verified, kept per worker until they
+    # expire so repeat requests skip decoding. 0 disables the cache
+    "TOKEN_CACHE_SIZE": 10_000,
+    # "EdDSA" or "RS256" signs tokens with rotating SigningKeys and publishes
+    # them at /.well-known/jwks.json, None keeps SIMPLE_JWT's ALGORITHM and
+    # SIGNING_KEY. See apps/accounts/signing.py
+    "SIGNING_ALGORITHM": None,
+    # accept tokens without a kid, signed with SIMPLE_JWT's SIGNING_KEY before
+    # SIGNING_ALGORITHM was set. Turn off once REFRESH_TOKEN_LIFETIME passed
+    "ACCEPT_LEGACY_TOKENS": True,
+    # seconds verifiers may cache the JWKS, rotate_signing_keys publishes new
+    # keys this long before they start signing
+    "JWKS_MAX_AGE": 3600,
+    # seconds between reloads of the signing keys by each worker
+    "SIGNING_KEYS_RELOAD_INTERVAL": 60,
+    # most tokens one call to the introspection endpoint may carry
+    "INTROSPECTION_MAX_TOKENS": 100,
+    # the staff user list counts exactly below this many rows, and reports
+    # the planner's estimate above it
+    "USER_COUNT_EXACT_BELOW": 10_000,
+    # users fetched per round trip, and lines per write, by the user export
+    "USER_EXPORT_CHUNK_SIZE": 2000,
+    # per-worker bloom filter in front of the blacklist lookup
+    "BLACKLIST_FILTER_ENABLED": True,
+    "BLACKLIST_FILTER_CAPACITY": 100_000,
+    "BLACKLIST_FILTER_ERROR_RATE": 0.001,
+    # seconds between pulls of entries blacklisted by other workers
+    "BLACKLIST_FILTER_SYNC_INTERVAL": 5,
+    # look back this many seconds on every pull to cover commit delays
+    "BLACKLIST_FILTER_SYNC_OVERLAP": 5,
+    # announce revocations with NOTIFY, every worker applies them to its
+    # caches through a listener thread, see revocation/listener.py
+    "REVOCATION_NOTIFY": True,
+}
+
+
+def get_setting(name):
+    """Return an accounts setting, falling back to its default."""
+    return getattr(settings, "ACCOUNTS_AUTH", {}).get(name, DEFAULTS[name])
@@ -0,0 +1,90 @@
+"""Batch token introspection in the style of RFC 7662.
+
+Gateways send the tokens they saw in one request instead of one call per
+token. Verified signatures and claims come from the per-worker token cache
+until each token expires. Revocation can happen at any time, so it is
+checked on every call, but for the whole batch at once: one blacklist
+lookup by ``jti__in``, and one query each for uncached sessions and token
+owners. Refresh tokens are also checked against their session's family,
+one already rotated away is inactive, in one more query.
+"""
+
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from apps.accounts.revocation.backends import get_blacklist_backend
+from apps.accounts.revocation.sessions import (
+    SESSION_ID_CLAIM,
+    family_accepts,
+    revoked_sessions,
+    session_families,
+)
+from apps.accounts.revocation.versions import get_token_states, token_matches_state
+from apps.accounts.token_cache import verified_tokens
+from apps.accounts.tokens import AccessToken, RefreshToken
+
+
+def verify(raw_token):
+    """Return the validated access or refresh token, or None if invalid."""
+    raw_token = raw_token.encode()
+    token = verified_tokens.get(raw_token)
+    if token is not None:
+        return token
+
+    for token_class in (AccessToken, RefreshToken):
+        try:
+            token = token_class(raw_token)
+        except TokenError:
+            continue
+        verified_tokens.add(raw_token, token)
+        return token
+    return None
+
+
+def introspect(raw_tokens):
+    """Return ``{"active": ...}`` plus the claims of each token, in order."""
+    user_claim = jwt_settings.USER_ID_CLAIM
+    jti_claim = jwt_settings.JTI_CLAIM
+    tokens = [verify(raw_token) for raw_token in raw_tokens]
+    # tokens made for something other than a user have nothing to introspect
+    tokens = [
+        token if token is not None and user_claim in token else None for token in tokens
+    ]
+    valid = [token for token in tokens if token is not None]
+
+    blacklisted = get_blacklist_backend().blacklisted_among(
+        {token[jti_claim] for token in valid}
+    )
+    session_ids = {
+        token[SESSION_ID_CLAIM] for token in valid if SESSION_ID_CLAIM in token
+    }
+    refresh_session_ids = {
+        token[SESSION_ID_CLAIM]
+        for token in valid
+        if SESSION_ID_CLAIM in token and isinstance(token, RefreshToken)
+    }
+    # a session missing from the families is revoked or gone
+    families = session_families(refresh_session_ids) if refresh_session_ids else {}
+    revoked = revoked_sessions(session_ids - refresh_session_ids)
+    revoked.update(refresh_session_ids - families.keys())
+    states = get_token_states({token[user_claim] for token in valid})
+
+    results = []
+    for token in tokens:
+        if (
+            token is None
+            or token[jti_claim] in blacklisted
+            or token.get(SESSION_ID_CLAIM) in revoked
+            or not token_matches_state(token, states[token[user_claim]])
+            or (
+                token.get(SESSION_ID_CLAIM) in families
+                and isinstance(token, RefreshToken)
+                and not family_accepts(
+                    families[token[SESSION_ID_CLAIM]], token[jti_claim]
+                )
+            )
+        ):
+            results.append({"active": False})
+        else:
+            results.append({"active": True, **token.payload})
+    return results
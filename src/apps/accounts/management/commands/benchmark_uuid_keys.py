@@ -0,0 +1,86 @@
+"""Management command comparing uuid4 and uuid7 primary key inserts."""
+
+import io
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.ids import uuid7
+
+GENERATORS = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+
+class Command(BaseCommand):
+    """Insert the same number of rows keyed by uuid4 and by uuid7.
+
+    Each run COPYs into a fresh table with a uuid primary key, in batches
+    committed one by one like a burst of registrations, and reports the
+    insert rate, the WAL written and the final primary key index size. The
+    tables are dropped afterwards. Run it against a scratch database, the
+    gap only shows once the random index no longer fits in memory.
+    """
+
+    help = "Benchmark uuid4 against uuid7 primary key inserts"
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--rows", type=int, default=10_000_000, help="Rows inserted per key type"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=100_000, help="Rows per COPY"
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        for name, generate in GENERATORS.items():
+            result = self.run(name, generate, options["rows"], options["batch_size"])
+            self.stdout.write(
+                f"{name}: {result['rows']} rows in {result['seconds']:.1f}s "
+                f"({result['rows'] / result['seconds']:.0f} rows/s, last batch "
+                f"{result['last_batch_rate']:.0f} rows/s), "
+                f"WAL {result['wal_bytes'] / 2**20:.1f} MiB, "
+                f"index {result['index_bytes'] / 2**20:.1f} MiB"
+            )
+
+    def run(self, name, generate, rows, batch_size):
+        """Insert rows keyed by generate() into a scratch table."""
+        table = f"benchmark_uuid_keys_{name}"
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            cursor.execute(
+                f"CREATE TABLE {table} (id uuid PRIMARY KEY, "
+                "created_at timestamp with time zone NOT NULL DEFAULT now())"
+            )
+            cursor.execute("SELECT pg_current_wal_lsn()")
+            wal_start = cursor.fetchone()[0]
+
+            started = time.monotonic()
+            inserted = 0
+            last_batch_rate = 0.0
+            while inserted < rows:
+                count = min(batch_size, rows - inserted)
+                batch = io.StringIO("".join(f"{generate()}\n" for _ in range(count)))
+                batch_started = time.monotonic()
+                cursor.copy_expert(f"COPY {table} (id) FROM STDIN", batch)
+                last_batch_rate = count / (time.monotonic() - batch_started)
+                inserted += count
+            seconds = time.monotonic() - started
+
+            cursor.execute(
+                "SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), %s), "
+                "pg_relation_size(%s)",
+                [wal_start, f"{table}_pkey"],
+            )
+            wal_bytes, index_bytes = cursor.fetchone()
+            cursor.execute(f"DROP TABLE {table}")
+
+        return {
+            "rows": inserted,
+            "seconds": seconds,
+            "last_batch_rate": last_batch_rate,
+            "wal_bytes": int(wal_bytes),
+            "index_bytes": index_bytes,
+        }
@@ -1,13 +1,37 @@
 """Management command to cleanup expired tokens from blacklist."""
 
+import time
+from datetime import datetime
+
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
-from apps.accounts.models.jwt_token_blacklist import TokenBlacklist
+from apps.accounts.conf import get_setting
+from apps.accounts.models import JobCheckpoint, OpaqueRefreshToken
+from apps.accounts.revocation.partitions import (
+    DEFAULT_PARTITION,
+    TABLE,
+    delete_expired_rows,
+    drop_expired_partitions,
+    ensure_partitions,
+    expired_partitions,
+)
+from core.db import estimate_count, estimate_table_rows, replication_lag
+
+CHECKPOINT_NAME = "cleanup_tokens"
 
 
 class Command(BaseCommand):
-    """Clean up expired tokens from the blacklist."""
+    """Clean up expired tokens from the blacklist.
+
+    Expired partitions are dropped whole, expired rows left in the default
+    partition are deleted in short batches with a pause in between so the
+    command can run next to live traffic. Progress is checkpointed in the
+    database after every batch and an interrupted run resumes where it
+    stopped, on any node.
+    Blacklist counts are planner estimates, not ``COUNT(*)``. Expired opaque
+    refresh handles of devices that never came back are deleted as well.
+    """
 
     help = "Delete expired tokens from blacklist to save database space"
 
@@ -18,33 +42,117 @@ class Command(BaseCommand):
             action="store_true",
             help="Show what would be deleted without actually deleting",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=get_setting("CLEANUP_BATCH_SIZE"),
+            help="Rows deleted per batch",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=get_setting("CLEANUP_BATCH_PAUSE"),
+            help="Seconds to sleep between batches",
+        )
+        parser.add_argument(
+            "--max-lag",
+            type=float,
+            default=None,
+            help="Wait while the slowest replica lags more than this many seconds",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore the checkpoint of an interrupted run",
+        )
 
     def handle(self, *args, **options):
         """Execute the command."""
-        dry_run = options["dry_run"]
+        if options["dry_run"]:
+            self.dry_run()
+            return
+
+        checkpoint = None if options["restart"] else JobCheckpoint.load(CHECKPOINT_NAME)
+        if checkpoint:
+            now = datetime.fromisoformat(checkpoint["now"])
+            start_page = checkpoint["page"]
+            self.stdout.write(f"Resuming interrupted cleanup from page {start_page}")
+        else:
+            now = timezone.now()
+            start_page = 0
+
+        started = time.monotonic()
+        count = drop_expired_partitions(now)
+
+        for deleted, page in delete_expired_rows(
+            now, batch_size=options["batch_size"], start_page=start_page
+        ):
+            count += deleted
+            JobCheckpoint.store(CHECKPOINT_NAME, {"now": now.isoformat(), "page": page})
+            lag = self.wait_for_replicas(options["max_lag"], options["sleep"])
+            self.stdout.write(
+                f"Deleted {deleted} rows up to page {page}, "
+                f"{count / (time.monotonic() - started):.0f} rows/s, "
+                f"replication lag {'n/a' if lag is None else f'{lag:.1f}s'}"
+            )
+            time.sleep(options["sleep"])
 
-        # Get expired tokens count
-        expired_tokens = TokenBlacklist.objects.filter(expires_at__lt=timezone.now())
-        count = expired_tokens.count()
+        JobCheckpoint.clear(CHECKPOINT_NAME)
+        # runs even when nothing expired, upcoming partitions must exist in time
+        ensure_partitions()
+
+        handles, _ = OpaqueRefreshToken.cleanup_expired(
+            batch_size=options["batch_size"], pause=options["sleep"]
+        )
+        if handles:
+            self.stdout.write(f"Deleted {handles} expired opaque refresh tokens")
 
         if count == 0:
             self.stdout.write(self.style.SUCCESS("No expired tokens to clean up"))
             return
 
-        if dry_run:
-            self.stdout.write(
-                self.style.WARNING(
-                    f"[DRY RUN] Would delete {count} expired token entries"
-                )
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully deleted ~{count} expired token entries "
+                f"in {elapsed:.1f}s ({count / elapsed:.0f} rows/s)"
             )
-        else:
-            TokenBlacklist.cleanup_expired()
+        )
+        self.print_summary()
+
+    def dry_run(self):
+        """Report an estimate of what would be deleted."""
+        now = timezone.now()
+        count = sum(estimate_table_rows(name) for name in expired_partitions(now))
+        # the planner never estimates less than one row, skip an empty table
+        if estimate_table_rows(DEFAULT_PARTITION):
+            count += estimate_count(
+                f"SELECT 1 FROM {DEFAULT_PARTITION} WHERE expires_at <= %s", [now]
+            )
+
+        if count == 0:
+            self.stdout.write(self.style.SUCCESS("No expired tokens to clean up"))
+            return
+
+        self.stdout.write(
+            self.style.WARNING(f"[DRY RUN] Would delete ~{count} expired token entries")
+        )
+        self.print_summary()
+
+    def wait_for_replicas(self, max_lag, pause):
+        """Return the current replication lag, waiting while it is too high."""
+        lag = replication_lag()
+        while max_lag is not None and lag is not None and lag > max_lag:
             self.stdout.write(
-                self.style.SUCCESS(
-                    f"Successfully deleted {count} expired token entries"
-                )
+                self.style.WARNING(f"Replication lag {lag:.1f}s, waiting")
             )
+            time.sleep(max(pause, 1))
+            lag = replication_lag()
+        return lag
 
-        # Print summary
-        remaining = TokenBlacklist.objects.count()
-        self.stdout.write(self.style.SUCCESS(f"Total tokens in blacklist: {remaining}"))
+    def print_summary(self):
+        """Print the estimated blacklist size."""
+        remaining = estimate_table_rows(TABLE)
+        self.stdout.write(
+            self.style.SUCCESS(f"Total tokens in blacklist: ~{remaining}")
+        )
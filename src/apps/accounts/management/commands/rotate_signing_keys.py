@@ -0,0 +1,79 @@
+"""Management command to rotate the JWT signing keys."""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.accounts.conf import get_setting
+from apps.accounts.models import SigningKey
+from apps.accounts.signing import expired_keys, keyring
+from apps.accounts.token_cache import verified_tokens
+
+
+class Command(BaseCommand):
+    """Add a new signing key and remove keys whose tokens have all expired.
+
+    The new key is published in the JWKS right away but only starts signing
+    ``JWKS_MAX_AGE`` seconds later, once every verifier's cached copy of the
+    JWKS includes it. ``--immediately`` skips the wait, at the cost of
+    verifiers refetching the JWKS. Previous keys keep verifying until the
+    tokens they signed have expired, except a compromised key passed to
+    ``--revoke``: it is deleted, dropped from the JWKS and every token it
+    signed is rejected once workers reload their key ring.
+    """
+
+    help = "Rotate the asymmetric JWT signing keys"
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--algorithm",
+            choices=[choice for choice, _label in SigningKey.ALGORITHM_CHOICES],
+            default=get_setting("SIGNING_ALGORITHM"),
+            help="Algorithm of the new key, defaults to SIGNING_ALGORITHM",
+        )
+        parser.add_argument(
+            "--immediately",
+            action="store_true",
+            help="Start signing with the new key now instead of after JWKS_MAX_AGE",
+        )
+        parser.add_argument(
+            "--revoke",
+            metavar="KID",
+            help="Delete a compromised key, implies --immediately",
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        if options["algorithm"] is None:
+            raise CommandError("SIGNING_ALGORITHM is not set, pass --algorithm")
+
+        revoke = options["revoke"]
+        if revoke is not None and not SigningKey.objects.filter(kid=revoke).exists():
+            raise CommandError(f"Unknown signing key {revoke}")
+
+        now = timezone.now()
+        has_active = SigningKey.objects.filter(activates_at__lte=now).exists()
+        activates_at = now
+        if has_active and not options["immediately"] and revoke is None:
+            activates_at += timedelta(seconds=get_setting("JWKS_MAX_AGE"))
+
+        key = SigningKey.generate(options["algorithm"], activates_at)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {key.algorithm} key {key.kid}, "
+                f"signing from {activates_at.isoformat()}"
+            )
+        )
+
+        if revoke is not None:
+            SigningKey.objects.filter(kid=revoke).delete()
+            self.stdout.write(f"Revoked key {revoke}")
+
+        expired = expired_keys(list(SigningKey.objects.all()), now)
+        if expired:
+            SigningKey.objects.filter(kid__in=[k.kid for k in expired]).delete()
+            self.stdout.write(f"Removed {len(expired)} expired keys")
+        keyring.reset()
+        verified_tokens.clear()
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-17 03:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_user_email_verified_alter_user_first_name"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="tokenblacklist",
+            index=models.Index(
+                fields=["blacklisted_at"], name="accounts_to_blackli_6ca3c1_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2026-10-17 03:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_tokenblacklist_blacklisted_at_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="token_version",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Tokens carrying an older version are rejected.",
+                verbose_name="token version",
+            ),
+        ),
+    ]
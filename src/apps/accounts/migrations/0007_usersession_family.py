@@ -0,0 +1,54 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0006_usersession"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="usersession",
+            name="current_jti",
+            field=models.CharField(
+                default="",
+                help_text="jti of the only refresh token of this session still valid",
+                max_length=255,
+                verbose_name="current JWT ID",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="usersession",
+            name="user_agent",
+            field=models.CharField(
+                blank=True,
+                help_text="User agent of the device that logged in",
+                max_length=255,
+                verbose_name="user agent",
+            ),
+        ),
+        migrations.AddField(
+            model_name="usersession",
+            name="last_used_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                help_text="Timestamp of the last login or refresh",
+                verbose_name="last used at",
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="usersession",
+            name="accounts_us_user_id_ab8ad3_idx",
+        ),
+        migrations.AddIndex(
+            model_name="usersession",
+            index=models.Index(
+                condition=models.Q(("revoked_at__isnull", True)),
+                fields=["user", "-last_used_at"],
+                name="accounts_session_active_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.7 on 2026-10-17 03:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_usersession_family"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OpaqueRefreshToken",
+            fields=[
+                (
+                    "token_hash",
+                    models.CharField(
+                        help_text="sha256 of the refresh handle given to the client",
+                        max_length=64,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="token hash",
+                    ),
+                ),
+                (
+                    "token_version",
+                    models.PositiveIntegerField(
+                        help_text="User token version when the handle was issued",
+                        verbose_name="token version",
+                    ),
+                ),
+                (
+                    "expires_at",
+                    models.DateTimeField(
+                        db_index=True,
+                        help_text="The handle can not be used after this time",
+                        verbose_name="token expiry time",
+                    ),
+                ),
+                (
+                    "session",
+                    models.ForeignKey(
+                        help_text="The session (device) the handle belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="opaque_refresh_tokens",
+                        to="accounts.usersession",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        help_text="The user the handle was issued to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="opaque_refresh_tokens",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Opaque Refresh Token",
+                "verbose_name_plural": "Opaque Refresh Tokens",
+            },
+        ),
+    ]
@@ -0,0 +1,151 @@
+"""Convert accounts_tokenblacklist into a table range partitioned by expires_at.
+
+The existing table is renamed, a partitioned table with the same columns is
+created in its place together with the partitions for the current refresh
+token lifetime, and the un-expired rows are copied over. Expired rows are left
+behind since cleanup would delete them anyway.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from django.db import migrations, models
+
+CREATE_PARTITIONED = """
+ALTER TABLE accounts_tokenblacklist RENAME TO accounts_tokenblacklist_old;
+ALTER INDEX accounts_tokenblacklist_pkey RENAME TO accounts_tokenblacklist_old_pkey;
+
+CREATE TABLE accounts_tokenblacklist (
+    id uuid NOT NULL,
+    jti varchar(255) NOT NULL,
+    blacklisted_at timestamp with time zone NOT NULL,
+    expires_at timestamp with time zone NOT NULL,
+    reason varchar(50) NOT NULL,
+    user_id uuid NOT NULL,
+    CONSTRAINT accounts_tokenblacklist_pkey PRIMARY KEY (id, expires_at),
+    CONSTRAINT accounts_tokenblacklist_jti_expires_uniq UNIQUE (jti, expires_at),
+    CONSTRAINT accounts_tokenblacklist_user_id_30ca3bab_fk_accounts_user_id
+        FOREIGN KEY (user_id) REFERENCES accounts_user (id)
+        DEFERRABLE INITIALLY DEFERRED
+) PARTITION BY RANGE (expires_at);
+
+CREATE TABLE accounts_tokenblacklist_default
+    PARTITION OF accounts_tokenblacklist DEFAULT;
+"""
+
+COPY_ROWS = """
+INSERT INTO accounts_tokenblacklist
+    (id, jti, blacklisted_at, expires_at, reason, user_id)
+SELECT id, jti, blacklisted_at, expires_at, reason, user_id
+FROM accounts_tokenblacklist_old
+WHERE expires_at > now();
+
+-- fire the deferred foreign key checks, indexes can not be built before
+SET CONSTRAINTS ALL IMMEDIATE;
+DROP TABLE accounts_tokenblacklist_old;
+
+CREATE INDEX accounts_tokenblacklist_jti_fe2d87f6
+    ON accounts_tokenblacklist (jti);
+CREATE INDEX accounts_tokenblacklist_jti_fe2d87f6_like
+    ON accounts_tokenblacklist (jti varchar_pattern_ops);
+CREATE INDEX accounts_tokenblacklist_user_id_30ca3bab
+    ON accounts_tokenblacklist (user_id);
+CREATE INDEX accounts_to_user_id_2b8ff4_idx
+    ON accounts_tokenblacklist (user_id, blacklisted_at);
+CREATE INDEX accounts_to_expires_e3179c_idx ON accounts_tokenblacklist (expires_at);
+CREATE INDEX accounts_to_blackli_6ca3c1_idx
+    ON accounts_tokenblacklist (blacklisted_at);
+"""
+
+# back to a plain table, the partitions are dropped with their parent
+REVERSE = """
+ALTER TABLE accounts_tokenblacklist RENAME TO accounts_tokenblacklist_partitioned;
+ALTER INDEX accounts_tokenblacklist_pkey
+    RENAME TO accounts_tokenblacklist_partitioned_pkey;
+DROP INDEX accounts_tokenblacklist_jti_fe2d87f6,
+    accounts_tokenblacklist_jti_fe2d87f6_like,
+    accounts_tokenblacklist_user_id_30ca3bab,
+    accounts_to_user_id_2b8ff4_idx,
+    accounts_to_expires_e3179c_idx,
+    accounts_to_blackli_6ca3c1_idx;
+
+CREATE TABLE accounts_tokenblacklist (
+    id uuid NOT NULL PRIMARY KEY,
+    jti varchar(255) NOT NULL UNIQUE,
+    blacklisted_at timestamp with time zone NOT NULL,
+    expires_at timestamp with time zone NOT NULL,
+    reason varchar(50) NOT NULL,
+    user_id uuid NOT NULL
+        CONSTRAINT accounts_tokenblacklist_user_id_30ca3bab_fk_accounts_user_id
+        REFERENCES accounts_user (id) DEFERRABLE INITIALLY DEFERRED
+);
+
+INSERT INTO accounts_tokenblacklist
+    (id, jti, blacklisted_at, expires_at, reason, user_id)
+SELECT id, jti, blacklisted_at, expires_at, reason, user_id
+FROM accounts_tokenblacklist_partitioned;
+
+SET CONSTRAINTS ALL IMMEDIATE;
+DROP TABLE accounts_tokenblacklist_partitioned;
+
+CREATE INDEX accounts_tokenblacklist_jti_fe2d87f6_like
+    ON accounts_tokenblacklist (jti varchar_pattern_ops);
+CREATE INDEX accounts_tokenblacklist_user_id_30ca3bab
+    ON accounts_tokenblacklist (user_id);
+CREATE INDEX accounts_to_user_id_2b8ff4_idx
+    ON accounts_tokenblacklist (user_id, blacklisted_at);
+CREATE INDEX accounts_to_expires_e3179c_idx ON accounts_tokenblacklist (expires_at);
+CREATE INDEX accounts_to_blackli_6ca3c1_idx
+    ON accounts_tokenblacklist (blacklisted_at);
+"""
+
+
+# daily partitions covering the 7 day refresh lifetime from today, the cleanup
+# jobs create the later ones, and any a longer lifetime needs, as time passes
+PARTITION_DAYS = 9
+
+
+def create_partitions(apps, schema_editor):
+    today = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    for day in range(PARTITION_DAYS):
+        start = today + timedelta(days=day)
+        schema_editor.execute(
+            f'CREATE TABLE "accounts_tokenblacklist_p{start:%Y%m%d}" '
+            "PARTITION OF accounts_tokenblacklist FOR VALUES FROM (%s) TO (%s)",
+            [start, start + timedelta(days=1)],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_opaquerefreshtoken"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="tokenblacklist",
+                    name="jti",
+                    field=models.CharField(
+                        db_index=True,
+                        help_text="Unique JWT ID (jti claim) to identify the token",
+                        max_length=255,
+                        verbose_name="JWT ID",
+                    ),
+                ),
+                migrations.AddConstraint(
+                    model_name="tokenblacklist",
+                    constraint=models.UniqueConstraint(
+                        fields=("jti", "expires_at"),
+                        name="accounts_tokenblacklist_jti_expires_uniq",
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(CREATE_PARTITIONED, REVERSE),
+                migrations.RunPython(create_partitions, migrations.RunPython.noop),
+                migrations.RunSQL(COPY_ROWS, migrations.RunSQL.noop),
+            ],
+        ),
+    ]
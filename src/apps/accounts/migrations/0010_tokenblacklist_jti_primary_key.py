@@ -0,0 +1,113 @@
+"""Make the jti a uuid primary key and index the time columns with BRIN.
+
+The surrogate id goes away, and so do the jti indexes, which were
+duplicated. The (jti, expires_at) unique constraint becomes the primary key,
+since partitioned tables need the partition key in it. Jtis issued by
+SimpleJWT are uuid hex strings and cast directly.
+"""
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+FORWARD = """
+ALTER TABLE accounts_tokenblacklist DROP CONSTRAINT accounts_tokenblacklist_pkey;
+ALTER TABLE accounts_tokenblacklist
+    DROP CONSTRAINT accounts_tokenblacklist_jti_expires_uniq;
+DROP INDEX accounts_tokenblacklist_jti_fe2d87f6,
+    accounts_tokenblacklist_jti_fe2d87f6_like,
+    accounts_to_user_id_2b8ff4_idx,
+    accounts_to_expires_e3179c_idx,
+    accounts_to_blackli_6ca3c1_idx;
+
+ALTER TABLE accounts_tokenblacklist DROP COLUMN id;
+ALTER TABLE accounts_tokenblacklist ALTER COLUMN jti TYPE uuid USING jti::uuid;
+ALTER TABLE accounts_tokenblacklist
+    ADD CONSTRAINT accounts_tokenblacklist_pkey PRIMARY KEY (jti, expires_at);
+
+CREATE INDEX accounts_to_expires_brin_idx
+    ON accounts_tokenblacklist USING brin (expires_at);
+CREATE INDEX accounts_to_blackli_brin_idx
+    ON accounts_tokenblacklist USING brin (blacklisted_at);
+"""
+
+REVERSE = """
+DROP INDEX accounts_to_expires_brin_idx, accounts_to_blackli_brin_idx;
+ALTER TABLE accounts_tokenblacklist DROP CONSTRAINT accounts_tokenblacklist_pkey;
+
+ALTER TABLE accounts_tokenblacklist
+    ALTER COLUMN jti TYPE varchar(255) USING replace(jti::text, '-', '');
+ALTER TABLE accounts_tokenblacklist
+    ADD COLUMN id uuid NOT NULL DEFAULT gen_random_uuid();
+ALTER TABLE accounts_tokenblacklist ALTER COLUMN id DROP DEFAULT;
+ALTER TABLE accounts_tokenblacklist
+    ADD CONSTRAINT accounts_tokenblacklist_pkey PRIMARY KEY (id, expires_at);
+ALTER TABLE accounts_tokenblacklist
+    ADD CONSTRAINT accounts_tokenblacklist_jti_expires_uniq UNIQUE (jti, expires_at);
+
+CREATE INDEX accounts_tokenblacklist_jti_fe2d87f6
+    ON accounts_tokenblacklist (jti);
+CREATE INDEX accounts_tokenblacklist_jti_fe2d87f6_like
+    ON accounts_tokenblacklist (jti varchar_pattern_ops);
+CREATE INDEX accounts_to_user_id_2b8ff4_idx
+    ON accounts_tokenblacklist (user_id, blacklisted_at);
+CREATE INDEX accounts_to_expires_e3179c_idx ON accounts_tokenblacklist (expires_at);
+CREATE INDEX accounts_to_blackli_6ca3c1_idx
+    ON accounts_tokenblacklist (blacklisted_at);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0009_partition_tokenblacklist"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveConstraint(
+                    model_name="tokenblacklist",
+                    name="accounts_tokenblacklist_jti_expires_uniq",
+                ),
+                migrations.RemoveIndex(
+                    model_name="tokenblacklist",
+                    name="accounts_to_user_id_2b8ff4_idx",
+                ),
+                migrations.RemoveIndex(
+                    model_name="tokenblacklist",
+                    name="accounts_to_expires_e3179c_idx",
+                ),
+                migrations.RemoveIndex(
+                    model_name="tokenblacklist",
+                    name="accounts_to_blackli_6ca3c1_idx",
+                ),
+                migrations.RemoveField(
+                    model_name="tokenblacklist",
+                    name="id",
+                ),
+                migrations.AlterField(
+                    model_name="tokenblacklist",
+                    name="jti",
+                    field=models.UUIDField(
+                        help_text="Unique JWT ID (jti claim) to identify the token",
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="JWT ID",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="tokenblacklist",
+                    index=django.contrib.postgres.indexes.BrinIndex(
+                        fields=["expires_at"], name="accounts_to_expires_brin_idx"
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="tokenblacklist",
+                    index=django.contrib.postgres.indexes.BrinIndex(
+                        fields=["blacklisted_at"], name="accounts_to_blackli_brin_idx"
+                    ),
+                ),
+            ],
+            database_operations=[migrations.RunSQL(FORWARD, REVERSE)],
+        ),
+    ]
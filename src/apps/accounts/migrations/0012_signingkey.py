@@ -0,0 +1,70 @@
+# Generated by Django 5.2.7 on 2026-10-17 04:35
+
+import apps.accounts.models.signing_key
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0011_uuid7_primary_keys"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SigningKey",
+            fields=[
+                (
+                    "kid",
+                    models.CharField(
+                        default=apps.accounts.models.signing_key._new_kid,
+                        editable=False,
+                        help_text="Value of the kid header of tokens signed with this key",
+                        max_length=32,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="key id",
+                    ),
+                ),
+                (
+                    "algorithm",
+                    models.CharField(
+                        choices=[("EdDSA", "EdDSA"), ("RS256", "RS256")],
+                        help_text="JWS algorithm of the key",
+                        max_length=10,
+                        verbose_name="algorithm",
+                    ),
+                ),
+                (
+                    "private_key",
+                    models.TextField(
+                        help_text="PKCS8 PEM of the private key",
+                        verbose_name="private key",
+                    ),
+                ),
+                (
+                    "public_key",
+                    models.TextField(
+                        help_text="SubjectPublicKeyInfo PEM of the public key",
+                        verbose_name="public key",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="created at"),
+                ),
+                (
+                    "activates_at",
+                    models.DateTimeField(
+                        help_text="The key signs new tokens from this time on",
+                        verbose_name="activates at",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Signing Key",
+                "verbose_name_plural": "Signing Keys",
+                "ordering": ["activates_at", "created_at"],
+            },
+        ),
+    ]
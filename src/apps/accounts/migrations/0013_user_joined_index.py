@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-17 04:58
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # build the index without blocking writes to the users table
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0012_signingkey"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(
+                fields=["date_joined", "id"], name="accounts_user_joined_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-17 05:02
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # build the indexes without blocking writes to the users table
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0013_user_joined_index"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("email_verified", False)),
+                fields=["date_joined", "id"],
+                name="accounts_user_unverified_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("is_active", False)),
+                fields=["date_joined", "id"],
+                name="accounts_user_inactive_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("is_staff", True)),
+                fields=["date_joined", "id"],
+                name="accounts_user_staff_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(fields=["updated_at"], name="accounts_user_updated_idx"),
+        ),
+        # replaced by accounts_user_unverified_idx
+        migrations.AlterField(
+            model_name="user",
+            name="email_verified",
+            field=models.BooleanField(default=False, verbose_name="verified email"),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.7 on 2026-10-17 05:09
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+# the expression of apps.accounts.search.search_document() as it was when
+# this migration was written, queries only use the index while they match
+CREATE_SEARCH_INDEX = """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_user_search_idx
+ON accounts_user USING gin ((UPPER((
+    COALESCE("email", '') || COALESCE((COALESCE(' ', '') || COALESCE((
+        COALESCE("first_name", '') || COALESCE((
+            COALESCE(' ', '') || COALESCE("last_name", '')
+        ), '')
+    ), '')), '')
+))) gin_trgm_ops)
+"""
+
+
+def create_search_index(apps, schema_editor):
+    """Build the trigram index, where the pg_trgm extension is available.
+
+    The index is not part of the model state, so databases without pg_trgm
+    still migrate and search without it, scanning the table.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        cursor.execute(CREATE_SEARCH_INDEX)
+
+
+def drop_search_index(apps, schema_editor):
+    schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS accounts_user_search_idx")
+
+
+class Migration(migrations.Migration):
+    # build the indexes without blocking writes to the users table
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0014_user_filter_indexes"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("email"),
+                    name="text_pattern_ops",
+                ),
+                name="accounts_user_email_prefix_idx",
+            ),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
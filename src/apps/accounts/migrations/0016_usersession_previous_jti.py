@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-17 06:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0015_user_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="usersession",
+            name="previous_jti",
+            field=models.CharField(
+                blank=True,
+                help_text="jti of the refresh token the current one replaced",
+                max_length=255,
+                verbose_name="previous JWT ID",
+            ),
+        ),
+    ]
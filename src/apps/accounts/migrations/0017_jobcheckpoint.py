@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-17 07:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0016_usersession_previous_jti"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobCheckpoint",
+            fields=[
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Name of the job the checkpoint belongs to",
+                        max_length=100,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="name",
+                    ),
+                ),
+                (
+                    "state",
+                    models.JSONField(
+                        help_text="Where the job stopped, in the job's own format",
+                        verbose_name="state",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Timestamp of the last checkpoint",
+                        verbose_name="updated at",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Job Checkpoint",
+                "verbose_name_plural": "Job Checkpoints",
+            },
+        ),
+    ]
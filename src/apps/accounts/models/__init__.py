@@ -1,4 +1,15 @@
+from .job_checkpoint import JobCheckpoint
 from .jwt_token_blacklist import TokenBlacklist
+from .opaque_refresh_token import OpaqueRefreshToken
+from .signing_key import SigningKey
 from .user import User
+from .user_session import UserSession
 
-__all__ = ["User", "TokenBlacklist"]
+__all__ = [
+    "User",
+    "TokenBlacklist",
+    "UserSession",
+    "OpaqueRefreshToken",
+    "SigningKey",
+    "JobCheckpoint",
+]
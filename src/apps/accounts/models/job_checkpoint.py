@@ -0,0 +1,48 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class JobCheckpoint(models.Model):
+    """Progress of a long running maintenance job, kept across processes.
+
+    A job that is killed or interrupted finds its last checkpoint here on the
+    next run, whichever process or node that run happens on.
+    """
+
+    name = models.CharField(
+        _("name"),
+        max_length=100,
+        primary_key=True,
+        help_text=_("Name of the job the checkpoint belongs to"),
+    )
+    state = models.JSONField(
+        _("state"),
+        help_text=_("Where the job stopped, in the job's own format"),
+    )
+    updated_at = models.DateTimeField(
+        _("updated at"),
+        auto_now=True,
+        help_text=_("Timestamp of the last checkpoint"),
+    )
+
+    class Meta:
+        verbose_name = _("Job Checkpoint")
+        verbose_name_plural = _("Job Checkpoints")
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def load(cls, name):
+        """Return the saved state of a job, or None if it has none."""
+        return cls.objects.filter(name=name).values_list("state", flat=True).first()
+
+    @classmethod
+    def store(cls, name, state):
+        """Save the state of a job, replacing the previous checkpoint."""
+        cls.objects.update_or_create(name=name, defaults={"state": state})
+
+    @classmethod
+    def clear(cls, name):
+        """Forget the checkpoint of a job that finished."""
+        cls.objects.filter(name=name).delete()
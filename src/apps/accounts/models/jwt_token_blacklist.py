@@ -1,6 +1,7 @@
 import uuid
 
-from django.db import models
+from django.contrib.postgres.indexes import BrinIndex
+from django.db import connection, models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -11,22 +12,25 @@ class TokenBlacklist(models.Model):
     When a user logs out or a token is rotated, the token's jti (JWT ID)
     is added to this blacklist. During token validation, we check if the
     jti is in the blacklist.
+
+    The jti is stored as a 16 byte uuid and is the primary key. The table is
+    range partitioned by ``expires_at`` (see
+    ``apps.accounts.revocation.partitions``), which is why the database
+    primary key is (jti, expires_at). A token's expiry never changes, so this
+    still allows a jti only once.
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    jti = models.UUIDField(
+        _("JWT ID"),
+        primary_key=True,
+        help_text=_("Unique JWT ID (jti claim) to identify the token"),
+    )
     user = models.ForeignKey(
         "accounts.User",
         on_delete=models.CASCADE,
         related_name="blacklisted_tokens",
         help_text=_("The user who logged out or had token rotated"),
     )
-    jti = models.CharField(
-        _("JWT ID"),
-        max_length=255,
-        unique=True,
-        db_index=True,
-        help_text=_("Unique JWT ID (jti claim) to identify the token"),
-    )
     blacklisted_at = models.DateTimeField(
         _("blacklisted at"),
         auto_now_add=True,
@@ -53,9 +57,11 @@ class TokenBlacklist(models.Model):
         verbose_name = _("Token Blacklist")
         verbose_name_plural = _("Token Blacklists")
         ordering = ["-blacklisted_at"]
+        # rows are appended in time order, BRIN indexes a whole block range in
+        # a few bytes instead of every row
         indexes = [
-            models.Index(fields=["user", "blacklisted_at"]),
-            models.Index(fields=["expires_at"]),
+            BrinIndex(fields=["expires_at"], name="accounts_to_expires_brin_idx"),
+            BrinIndex(fields=["blacklisted_at"], name="accounts_to_blackli_brin_idx"),
         ]
 
     def __str__(self):
@@ -64,7 +70,31 @@ class TokenBlacklist(models.Model):
     @classmethod
     def is_blacklisted(cls, jti: str) -> bool:
         """Check if a JWT ID is blacklisted."""
-        return cls.objects.filter(jti=jti).exists()
+        return cls.entries_for(jti).exists()
+
+    @classmethod
+    def blacklisted_among(cls, jtis) -> set:
+        """Return the jtis that are blacklisted, looked up in one query."""
+        by_uuid = {}
+        for jti in jtis:
+            try:
+                by_uuid[uuid.UUID(str(jti))] = jti
+            except ValueError:
+                continue
+        if not by_uuid:
+            return set()
+        found = cls.objects.filter(jti__in=by_uuid).values_list("jti", flat=True)
+        return {by_uuid[jti] for jti in found}
+
+    @classmethod
+    def entries_for(cls, jti: str):
+        """Return a queryset of the blacklist entry for a JWT ID."""
+        try:
+            jti = uuid.UUID(str(jti))
+        except ValueError:
+            # not issued by us, it can't have been blacklisted either
+            return cls.objects.none()
+        return cls.objects.filter(jti=jti)
 
     @classmethod
     def blacklist_token(
@@ -91,12 +121,62 @@ class TokenBlacklist(models.Model):
             reason=reason,
         )
 
+    @classmethod
+    def claim(
+        cls,
+        jti: str,
+        exp_timestamp: int,
+        user_id,
+        reason: str = "logout",
+        notify_channel: str | None = None,
+    ):
+        """Atomically blacklist a jti in a single round trip.
+
+        Uses ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` so concurrent
+        callers presenting the same token cannot both succeed. With
+        ``notify_channel``, ``jti:<jti>`` is sent on it by the same statement
+        when the jti was claimed.
+
+        Returns:
+            bool: True if this call blacklisted the jti, False if it already was
+
+        """
+        from datetime import datetime
+
+        expires_at = datetime.fromtimestamp(
+            exp_timestamp, tz=timezone.get_current_timezone()
+        )
+        params = [uuid.UUID(jti), user_id, timezone.now(), expires_at, reason]
+        insert = f"""
+            INSERT INTO {cls._meta.db_table}
+                (jti, user_id, blacklisted_at, expires_at, reason)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (jti, expires_at) DO NOTHING
+            RETURNING jti
+        """
+        if notify_channel is not None:
+            insert = f"""
+                WITH claimed AS ({insert})
+                SELECT jti, pg_notify(%s, %s) FROM claimed
+            """
+            params += [notify_channel, f"jti:{jti}"]
+        with connection.cursor() as cursor:
+            cursor.execute(insert, params)
+            return cursor.fetchone() is not None
+
     @classmethod
     def cleanup_expired(cls):
-        """Delete expired tokens from blacklist to save space.
+        """Drop expired partitions and create the upcoming ones.
+
+        Rows in the dropped partitions are counted from planner estimates,
+        rows deleted from the default partition exactly. Runs the whole
+        cleanup, which can take long on a large table.
 
         Returns:
             tuple: (deleted_count, delete_details_dict)
 
         """
-        return cls.objects.filter(expires_at__lte=timezone.now()).delete()
+        from apps.accounts.revocation.partitions import cleanup_expired
+
+        deleted_count = cleanup_expired()
+        return deleted_count, {cls._meta.label: deleted_count}
@@ -0,0 +1,128 @@
+import hashlib
+import secrets
+import time
+
+from django.db import connection, models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from apps.accounts.conf import get_setting
+
+
+class OpaqueRefreshToken(models.Model):
+    """Server issued refresh handle, used instead of JWT refresh tokens.
+
+    Only the sha256 of the random handle is stored, as a fixed width primary
+    key. Rotation and logout are a single ``DELETE ... RETURNING`` on that
+    key, there is no blacklist and no JWT to decode.
+    """
+
+    token_hash = models.CharField(
+        _("token hash"),
+        max_length=64,
+        primary_key=True,
+        help_text=_("sha256 of the refresh handle given to the client"),
+    )
+    user = models.ForeignKey(
+        "accounts.User",
+        on_delete=models.CASCADE,
+        related_name="opaque_refresh_tokens",
+        help_text=_("The user the handle was issued to"),
+    )
+    session = models.ForeignKey(
+        "accounts.UserSession",
+        on_delete=models.CASCADE,
+        related_name="opaque_refresh_tokens",
+        help_text=_("The session (device) the handle belongs to"),
+    )
+    token_version = models.PositiveIntegerField(
+        _("token version"),
+        help_text=_("User token version when the handle was issued"),
+    )
+    expires_at = models.DateTimeField(
+        _("token expiry time"),
+        db_index=True,
+        help_text=_("The handle can not be used after this time"),
+    )
+
+    class Meta:
+        verbose_name = _("Opaque Refresh Token")
+        verbose_name_plural = _("Opaque Refresh Tokens")
+
+    def __str__(self):
+        return f"{self.user_id} - {self.token_hash[:12]}"
+
+    @staticmethod
+    def hash(raw_token: str) -> str:
+        """Return the stored form of a refresh handle."""
+        return hashlib.sha256(raw_token.encode()).hexdigest()
+
+    @classmethod
+    def issue(cls, user_id, session_id, token_version: int) -> str:
+        """Create a new refresh handle and return it, only its hash is kept."""
+        raw_token = secrets.token_urlsafe(32)
+        cls.objects.create(
+            token_hash=cls.hash(raw_token),
+            user_id=user_id,
+            session_id=session_id,
+            token_version=token_version,
+            expires_at=timezone.now() + jwt_settings.REFRESH_TOKEN_LIFETIME,
+        )
+        return raw_token
+
+    @classmethod
+    def consume(cls, raw_token: str):
+        """Delete an unexpired handle and return what it was issued for.
+
+        Returns:
+            tuple: (user_id, session_id, token_version), or None if the handle
+            is unknown, expired or was already used
+
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                DELETE FROM {cls._meta.db_table}
+                WHERE token_hash = %s AND expires_at > %s
+                RETURNING user_id, session_id, token_version
+                """,
+                [cls.hash(raw_token), timezone.now()],
+            )
+            return cursor.fetchone()
+
+    @classmethod
+    def cleanup_expired(cls, batch_size=None, pause=0):
+        """Delete expired handles of devices that never came back.
+
+        Rows go in batches of ``CLEANUP_BATCH_SIZE``, each its own short
+        ``DELETE``, with a pause in between like the blacklist cleanup.
+
+        Args:
+            batch_size: Rows per batch, defaults to ``CLEANUP_BATCH_SIZE``
+            pause: Seconds to sleep between batches
+
+        Returns:
+            tuple: (deleted_count, delete_details_dict)
+
+        """
+        batch_size = batch_size or get_setting("CLEANUP_BATCH_SIZE")
+        now = timezone.now()
+        deleted = 0
+        while True:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    DELETE FROM {cls._meta.db_table}
+                    WHERE token_hash = ANY(ARRAY(
+                        SELECT token_hash FROM {cls._meta.db_table}
+                        WHERE expires_at <= %s
+                        LIMIT %s
+                    ))
+                    """,
+                    [now, batch_size],
+                )
+                deleted += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                return deleted, {cls._meta.label: deleted}
+            time.sleep(pause)
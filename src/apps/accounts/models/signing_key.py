@@ -0,0 +1,106 @@
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+
+from core.ids import uuid7
+
+
+def _new_kid():
+    return uuid7().hex
+
+
+class SigningKey(models.Model):
+    """Asymmetric key pair used to sign JWTs, identified by the ``kid`` header.
+
+    The newest key whose ``activates_at`` has passed signs new tokens. Older
+    keys keep verifying until every token they signed has expired, keys not
+    yet active are already published in the JWKS so verifiers have them
+    cached before the first token signed with them shows up.
+    """
+
+    ALGORITHM_CHOICES = [("EdDSA", "EdDSA"), ("RS256", "RS256")]
+
+    kid = models.CharField(
+        _("key id"),
+        max_length=32,
+        primary_key=True,
+        default=_new_kid,
+        editable=False,
+        help_text=_("Value of the kid header of tokens signed with this key"),
+    )
+    algorithm = models.CharField(
+        _("algorithm"),
+        max_length=10,
+        choices=ALGORITHM_CHOICES,
+        help_text=_("JWS algorithm of the key"),
+    )
+    private_key = models.TextField(
+        _("private key"), help_text=_("PKCS8 PEM of the private key")
+    )
+    public_key = models.TextField(
+        _("public key"), help_text=_("SubjectPublicKeyInfo PEM of the public key")
+    )
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True)
+    activates_at = models.DateTimeField(
+        _("activates at"),
+        help_text=_("The key signs new tokens from this time on"),
+    )
+
+    class Meta:
+        verbose_name = _("Signing Key")
+        verbose_name_plural = _("Signing Keys")
+        ordering = ["activates_at", "created_at"]
+
+    def __str__(self):
+        return f"{self.algorithm} {self.kid}"
+
+    @classmethod
+    def build(cls, algorithm, activates_at=None):
+        """Return a new, unsaved key pair for algorithm.
+
+        Args:
+            algorithm: "EdDSA" (Ed25519) or "RS256" (RSA 2048)
+            activates_at: When the key starts signing, defaults to now
+
+        """
+        if algorithm == "EdDSA":
+            private = ed25519.Ed25519PrivateKey.generate()
+        elif algorithm == "RS256":
+            private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        else:
+            raise ValueError(f"Unsupported signing algorithm {algorithm!r}")
+
+        return cls(
+            algorithm=algorithm,
+            private_key=private.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            ).decode(),
+            public_key=private.public_key()
+            .public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+            .decode(),
+            activates_at=activates_at or timezone.now(),
+        )
+
+    @classmethod
+    def generate(cls, algorithm, activates_at=None):
+        """Create and save a new key pair, see build()."""
+        key = cls.build(algorithm, activates_at)
+        key.save(force_insert=True)
+        return key
+
+    def public_jwk(self):
+        """Return the public key as a JWK for the JWKS endpoint."""
+        public = serialization.load_pem_public_key(self.public_key.encode())
+        if self.algorithm == "EdDSA":
+            jwk = OKPAlgorithm.to_jwk(public, as_dict=True)
+        else:
+            jwk = RSAAlgorithm.to_jwk(public, as_dict=True)
+        return {**jwk, "kid": self.kid, "alg": self.algorithm, "use": "sig"}
@@ -1,17 +1,19 @@
-import uuid
-
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from core.ids import uuid7
+
 from ..managers import CustomUserManager
 
 
 class User(AbstractBaseUser, PermissionsMixin):
     """Custom User Model utilizing Email as the unique identifier and UUID as the primary key."""
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     email = models.EmailField(
         _("email address"),
         unique=True,
@@ -19,9 +21,7 @@ class User(AbstractBaseUser, PermissionsMixin):
             "Required. 254 characters or fewer. Must be a valid email address."
         ),
     )
-    email_verified = models.BooleanField(
-        _("verified email"), default=False, db_index=True
-    )
+    email_verified = models.BooleanField(_("verified email"), default=False)
     first_name = models.CharField(_("first name"), max_length=150, blank=False)
     last_name = models.CharField(_("last name"), max_length=150, blank=True)
 
@@ -39,6 +39,13 @@ class User(AbstractBaseUser, PermissionsMixin):
         ),
     )
 
+    # bumped to invalidate every token issued before, see revoke_tokens()
+    token_version = models.PositiveIntegerField(
+        _("token version"),
+        default=0,
+        help_text=_("Tokens carrying an older version are rejected."),
+    )
+
     # Timestamps
     date_joined = models.DateTimeField(_("date joined"), default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
@@ -52,6 +59,32 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name = _("user")
         verbose_name_plural = _("users")
         ordering = ["-date_joined"]
+        indexes = [
+            # newest users first, read backwards by the staff user list
+            models.Index(fields=["date_joined", "id"], name="accounts_user_joined_idx"),
+            # the minorities staff filter the list down to, in list order
+            models.Index(
+                fields=["date_joined", "id"],
+                condition=models.Q(email_verified=False),
+                name="accounts_user_unverified_idx",
+            ),
+            models.Index(
+                fields=["date_joined", "id"],
+                condition=models.Q(is_active=False),
+                name="accounts_user_inactive_idx",
+            ),
+            models.Index(
+                fields=["date_joined", "id"],
+                condition=models.Q(is_staff=True),
+                name="accounts_user_staff_idx",
+            ),
+            models.Index(fields=["updated_at"], name="accounts_user_updated_idx"),
+            # email prefix searches, see apps.accounts.search
+            models.Index(
+                OpClass(Upper("email"), name="text_pattern_ops"),
+                name="accounts_user_email_prefix_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.email
@@ -59,3 +92,21 @@ class User(AbstractBaseUser, PermissionsMixin):
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
+
+    def revoke_tokens(self):
+        """Invalidate every access and refresh token issued to this user.
+
+        Tokens carry the version they were issued with, so bumping it logs the
+        user out everywhere with a single UPDATE instead of one blacklist row
+        per outstanding token.
+        """
+        type(self).objects.filter(pk=self.pk).update(
+            token_version=models.F("token_version") + 1
+        )
+        self.refresh_from_db(fields=["token_version"])
+
+        from apps.accounts.revocation.notify import notify
+        from apps.accounts.signals import forget_user
+
+        forget_user(self.pk)
+        notify("user", self.pk)
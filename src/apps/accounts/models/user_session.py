@@ -0,0 +1,108 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from core.ids import uuid7
+
+
+class UserSession(models.Model):
+    """A login session, the family of every token pair issued for one device.
+
+    Every token pair issued at login carries the session id in its ``sid``
+    claim, and refreshed tokens keep it. Revoking the session kills the access
+    and refresh tokens of that login at once.
+
+    Rotation advances ``current_jti`` to the new refresh token and keeps the
+    one it replaced in ``previous_jti``. Presenting an older refresh token of
+    the family means it was stolen or replayed, and the whole family is
+    revoked.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    user = models.ForeignKey(
+        "accounts.User",
+        on_delete=models.CASCADE,
+        related_name="sessions",
+        help_text=_("The user who logged in"),
+    )
+    current_jti = models.CharField(
+        _("current JWT ID"),
+        max_length=255,
+        help_text=_("jti of the only refresh token of this session still valid"),
+    )
+    previous_jti = models.CharField(
+        _("previous JWT ID"),
+        max_length=255,
+        blank=True,
+        help_text=_("jti of the refresh token the current one replaced"),
+    )
+    user_agent = models.CharField(
+        _("user agent"),
+        max_length=255,
+        blank=True,
+        help_text=_("User agent of the device that logged in"),
+    )
+    created_at = models.DateTimeField(
+        _("created at"),
+        auto_now_add=True,
+        help_text=_("Timestamp of the login that started the session"),
+    )
+    last_used_at = models.DateTimeField(
+        _("last used at"),
+        default=timezone.now,
+        help_text=_("Timestamp of the last login or refresh"),
+    )
+    revoked_at = models.DateTimeField(
+        _("revoked at"),
+        null=True,
+        blank=True,
+        help_text=_("Timestamp when the session was revoked"),
+    )
+
+    class Meta:
+        verbose_name = _("User Session")
+        verbose_name_plural = _("User Sessions")
+        ordering = ["-created_at"]
+        indexes = [
+            # active sessions of a user, most recently used first
+            models.Index(
+                fields=["user", "-last_used_at"],
+                condition=models.Q(revoked_at__isnull=True),
+                name="accounts_session_active_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.created_at:%Y-%m-%d %H:%M}"
+
+    @property
+    def is_revoked(self):
+        return self.revoked_at is not None
+
+    @classmethod
+    def advance(cls, session_id, old_jti, new_jti):
+        """Move the family to a new refresh token in a single UPDATE.
+
+        Returns:
+            bool: False if the session is revoked or old_jti is not the
+            current refresh token of the family
+
+        """
+        return bool(
+            cls.objects.filter(
+                id=session_id, current_jti=old_jti, revoked_at__isnull=True
+            ).update(
+                current_jti=new_jti, previous_jti=old_jti, last_used_at=timezone.now()
+            )
+        )
+
+    @classmethod
+    def revoke(cls, session_id, user=None):
+        """Revoke a session, returning True if it was active.
+
+        When user is given, only a session owned by that user is revoked.
+        """
+        sessions = cls.objects.filter(id=session_id, revoked_at__isnull=True)
+        if user is not None:
+            sessions = sessions.filter(user=user)
+        return bool(sessions.update(revoked_at=timezone.now()))
@@ -0,0 +1,294 @@
+import functools
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+
+import structlog
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.accounts.conf import get_setting
+from apps.accounts.models.jwt_token_blacklist import TokenBlacklist
+from core.jti_snapshot import SnapshotWatcher, jti_bytes
+
+from .filter import blacklist_filter
+from .notify import CHANNEL
+
+logger = structlog.get_logger(__name__)
+
+
+class BaseBlacklistBackend:
+    """Storage interface for blacklisted token ids (jti).
+
+    Subclasses must implement is_blacklisted, blacklist_token and
+    cleanup_expired. Backends are instantiated once per worker with the
+    keyword arguments from ``BLACKLIST_BACKEND_OPTIONS``.
+    """
+
+    def is_blacklisted(self, jti):
+        """Return True if the jti is blacklisted."""
+        raise NotImplementedError
+
+    def blacklist_token(self, jti, exp_timestamp, user_id, reason="logout"):
+        """Blacklist a jti until its token expires.
+
+        Args:
+            jti: JWT ID claim from the token
+            exp_timestamp: Token expiration timestamp (from 'exp' claim)
+            user_id: Primary key of the token owner
+            reason: Reason for blacklisting
+
+        Returns:
+            bool: True if the jti was added, False if it was already blacklisted
+
+        """
+        raise NotImplementedError
+
+    def cleanup_expired(self):
+        """Drop expired entries and return how many were removed."""
+        raise NotImplementedError
+
+    def blacklisted_among(self, jtis):
+        """Return the set of jtis among jtis that are blacklisted."""
+        return {jti for jti in jtis if self.is_blacklisted(jti)}
+
+    def lookup_queryset(self, jti):
+        """Return a queryset that exists if the jti is blacklisted.
+
+        Backends storing the blacklist in the database return one so the
+        check can run in the same query as the user lookup. Others return
+        None and are asked through is_blacklisted.
+        """
+        return None
+
+    def remember(self, jti):
+        """Note a jti another worker blacklisted, for backends caching lookups."""
+
+    def resync(self):
+        """Refresh cached lookups that may have missed blacklisted jtis."""
+
+
+class DatabaseBlacklistBackend(BaseBlacklistBackend):
+    """Store the blacklist in the TokenBlacklist table.
+
+    Lookups go through the per-worker bloom filter when
+    ``BLACKLIST_FILTER_ENABLED`` is set.
+    """
+
+    def is_blacklisted(self, jti):
+        if get_setting("BLACKLIST_FILTER_ENABLED"):
+            return blacklist_filter.is_blacklisted(jti)
+        return TokenBlacklist.is_blacklisted(jti)
+
+    def blacklist_token(self, jti, exp_timestamp, user_id, reason="logout"):
+        # other workers learn about it from the claim's own NOTIFY
+        notify_channel = CHANNEL if get_setting("REVOCATION_NOTIFY") else None
+        claimed = TokenBlacklist.claim(
+            jti, exp_timestamp, user_id, reason, notify_channel=notify_channel
+        )
+        if claimed:
+            blacklist_filter.add(jti)
+        return claimed
+
+    def cleanup_expired(self):
+        deleted_count, _ = TokenBlacklist.cleanup_expired()
+        return deleted_count
+
+    def blacklisted_among(self, jtis):
+        if get_setting("BLACKLIST_FILTER_ENABLED"):
+            return blacklist_filter.blacklisted_among(jtis)
+        return TokenBlacklist.blacklisted_among(jtis)
+
+    def lookup_queryset(self, jti):
+        if get_setting("BLACKLIST_FILTER_ENABLED"):
+            # the filter answers most lookups without a query at all
+            return None
+        return TokenBlacklist.entries_for(jti)
+
+    def remember(self, jti):
+        blacklist_filter.add(jti)
+
+    def resync(self):
+        blacklist_filter.expire()
+
+
+class InMemoryBlacklistBackend(BaseBlacklistBackend):
+    """Keep the blacklist in a dict inside the worker process.
+
+    Only suitable for tests and single process deployments, since nothing is
+    shared between workers and entries are lost on restart.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def is_blacklisted(self, jti):
+        exp = self._entries.get(jti)
+        if exp is None:
+            return False
+        if exp <= time.time():
+            self._entries.pop(jti, None)
+            return False
+        return True
+
+    def blacklist_token(self, jti, exp_timestamp, user_id, reason="logout"):
+        with self._lock:
+            if self.is_blacklisted(jti):
+                return False
+            self._entries[jti] = exp_timestamp
+            return True
+
+    def cleanup_expired(self):
+        now = time.time()
+        with self._lock:
+            expired = [jti for jti, exp in self._entries.items() if exp <= now]
+            for jti in expired:
+                del self._entries[jti]
+        return len(expired)
+
+
+class RedisBlacklistBackend(BaseBlacklistBackend):
+    """Store the blacklist in Redis (or any server speaking its protocol).
+
+    Every jti is a key with a TTL matching the token lifetime, so expired
+    entries disappear on their own and cleanup_expired has nothing to do.
+
+    Args:
+        url: Connection url passed to ``redis.Redis.from_url``
+        client: Ready made client exposing redis-py's ``set`` and ``exists``
+        key_prefix: Prefix for every blacklist key
+
+    """
+
+    def __init__(self, url=None, client=None, key_prefix="accounts:blacklist:"):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise ImproperlyConfigured(
+                    "RedisBlacklistBackend requires the 'redis' package"
+                ) from e
+            if url is None:
+                raise ImproperlyConfigured("RedisBlacklistBackend requires a url")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.key_prefix = key_prefix
+
+    def _key(self, jti):
+        return f"{self.key_prefix}{jti}"
+
+    def is_blacklisted(self, jti):
+        return bool(self.client.exists(self._key(jti)))
+
+    def blacklist_token(self, jti, exp_timestamp, user_id, reason="logout"):
+        ttl = int(exp_timestamp - time.time())
+        if ttl <= 0:
+            # the token is already expired and can never be used again
+            return True
+        return bool(self.client.set(self._key(jti), reason, ex=ttl, nx=True))
+
+    def cleanup_expired(self):
+        return 0
+
+
+class SnapshotBlacklistBackend(DatabaseBlacklistBackend):
+    """Answer lookups from a memory-mapped snapshot of the blacklist.
+
+    ``export_blacklist_snapshot`` writes the file on every host, all workers
+    on the host map it and share one page cache copy. Entries blacklisted
+    after the snapshot was taken are pulled from the database into a small
+    set every ``BLACKLIST_FILTER_SYNC_INTERVAL`` seconds, so lookups never
+    query. Until the file exists it works like DatabaseBlacklistBackend.
+
+    Args:
+        path: Snapshot file written by ``export_blacklist_snapshot``
+
+    """
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._watcher = SnapshotWatcher(path, interval=0)
+        self._snapshot = None
+        self._recent = set()
+        self._synced_until = None
+        self._next_sync = 0.0
+
+    def is_blacklisted(self, jti):
+        snapshot = self._ensure_fresh()
+        if snapshot is None:
+            return super().is_blacklisted(jti)
+        try:
+            key = jti_bytes(jti)
+        except ValueError:
+            return False
+        return key in self._recent or key in snapshot
+
+    def blacklisted_among(self, jtis):
+        if self._ensure_fresh() is None:
+            return super().blacklisted_among(jtis)
+        return {jti for jti in jtis if self.is_blacklisted(jti)}
+
+    def blacklist_token(self, jti, exp_timestamp, user_id, reason="logout"):
+        claimed = super().blacklist_token(jti, exp_timestamp, user_id, reason)
+        if claimed and exp_timestamp > time.time():
+            self._recent.add(jti_bytes(jti))
+        return claimed
+
+    def lookup_queryset(self, jti):
+        return None
+
+    def remember(self, jti):
+        super().remember(jti)
+        try:
+            self._recent.add(jti_bytes(jti))
+        except ValueError:
+            pass
+
+    def resync(self):
+        super().resync()
+        self._next_sync = 0.0
+
+    def _ensure_fresh(self):
+        if time.monotonic() < self._next_sync:
+            return self._snapshot
+        with self._lock:
+            try:
+                snapshot = self._watcher.current()
+            except ValueError:
+                logger.exception("blacklist snapshot unreadable")
+                snapshot = None
+
+            if snapshot is not self._snapshot:
+                self._recent = set()
+                self._synced_until = None
+                if snapshot is not None:
+                    self._synced_until = datetime.fromtimestamp(
+                        snapshot.generation / 1_000_000, tz=UTC
+                    )
+                self._snapshot = snapshot
+            if snapshot is not None:
+                self._sync()
+            self._next_sync = time.monotonic() + get_setting(
+                "BLACKLIST_FILTER_SYNC_INTERVAL"
+            )
+        return self._snapshot
+
+    def _sync(self):
+        """Pull entries blacklisted since the snapshot or the last pull."""
+        started_at = timezone.now()
+        overlap = timedelta(seconds=get_setting("BLACKLIST_FILTER_SYNC_OVERLAP"))
+        recent = TokenBlacklist.objects.filter(
+            blacklisted_at__gte=self._synced_until - overlap,
+            expires_at__gt=started_at,
+        ).values_list("jti", flat=True)
+        self._recent.update(jti.bytes for jti in recent)
+        self._synced_until = started_at
+
+
+@functools.cache
+def get_blacklist_backend():
+    """Return the configured blacklist backend, created once per worker."""
+    backend_class = import_string(get_setting("BLACKLIST_BACKEND"))
+    return backend_class(**get_setting("BLACKLIST_BACKEND_OPTIONS"))
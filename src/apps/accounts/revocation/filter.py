@@ -0,0 +1,137 @@
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+import structlog
+from django.utils import timezone
+
+from apps.accounts.conf import get_setting
+from apps.accounts.models.jwt_token_blacklist import TokenBlacklist
+from core.bloom import BloomFilter
+
+logger = structlog.get_logger(__name__)
+
+
+def _key(jti):
+    """Return the form jtis are hashed in, tokens carry them as uuid hex."""
+    return jti.hex if isinstance(jti, uuid.UUID) else str(jti).replace("-", "")
+
+
+class BlacklistFilter:
+    """Per-worker bloom filter in front of ``TokenBlacklist.is_blacklisted``.
+
+    The filter holds every un-expired blacklisted jti. A jti that is not in the
+    filter is definitely not blacklisted, so the database is only queried when
+    the filter answers "maybe". Entries written by other workers are pulled in
+    every ``BLACKLIST_FILTER_SYNC_INTERVAL`` seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._synced_until = None
+        self._next_sync = 0.0
+        self.lookups = 0
+        self.negatives = 0
+        self.hits = 0
+        self.false_positives = 0
+
+    def reset(self):
+        """Drop the filter so the next lookup rebuilds it from the database."""
+        with self._lock:
+            self._bloom = None
+            self._synced_until = None
+            self._next_sync = 0.0
+
+    def expire(self):
+        """Pull entries from the database on the next lookup."""
+        self._next_sync = 0.0
+
+    def stats(self):
+        """Return counters used to size the filter."""
+        bloom = self._bloom
+        return {
+            "lookups": self.lookups,
+            "negatives": self.negatives,
+            "hits": self.hits,
+            "false_positives": self.false_positives,
+            "entries": len(bloom) if bloom else 0,
+            "capacity": bloom.capacity if bloom else 0,
+        }
+
+    def add(self, jti):
+        """Add a jti blacklisted by this or another worker without a sync."""
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(_key(jti))
+
+    def is_blacklisted(self, jti):
+        """Check a jti, hitting the database only when the filter says maybe."""
+        self._ensure_fresh()
+        self.lookups += 1
+
+        if _key(jti) not in self._bloom:
+            self.negatives += 1
+            return False
+
+        if TokenBlacklist.is_blacklisted(jti):
+            self.hits += 1
+            return True
+
+        self.false_positives += 1
+        return False
+
+    def blacklisted_among(self, jtis):
+        """Return the blacklisted jtis, with one query for all the maybes."""
+        self._ensure_fresh()
+        maybe = [jti for jti in jtis if _key(jti) in self._bloom]
+        found = TokenBlacklist.blacklisted_among(maybe) if maybe else set()
+
+        self.lookups += len(jtis)
+        self.negatives += len(jtis) - len(maybe)
+        self.hits += len(found)
+        self.false_positives += len(maybe) - len(found)
+        return found
+
+    def _ensure_fresh(self):
+        if self._bloom is not None and time.monotonic() < self._next_sync:
+            return
+        with self._lock:
+            if self._bloom is None or self._bloom.is_full:
+                self._rebuild()
+            elif time.monotonic() >= self._next_sync:
+                self._sync()
+            self._next_sync = time.monotonic() + get_setting(
+                "BLACKLIST_FILTER_SYNC_INTERVAL"
+            )
+
+    def _rebuild(self):
+        """Build a new filter from all un-expired blacklist entries."""
+        started_at = timezone.now()
+        active = TokenBlacklist.objects.filter(expires_at__gt=started_at)
+        count = active.count()
+        # leave room to grow before the next rebuild
+        capacity = max(get_setting("BLACKLIST_FILTER_CAPACITY"), count * 2)
+
+        bloom = BloomFilter(capacity, get_setting("BLACKLIST_FILTER_ERROR_RATE"))
+        for jti in active.values_list("jti", flat=True).iterator(chunk_size=10_000):
+            bloom.add(_key(jti))
+
+        self._bloom = bloom
+        self._synced_until = started_at
+        logger.info("blacklist filter rebuilt", **self.stats())
+
+    def _sync(self):
+        """Add entries blacklisted by other workers since the last sync."""
+        started_at = timezone.now()
+        overlap = timedelta(seconds=get_setting("BLACKLIST_FILTER_SYNC_OVERLAP"))
+        recent = TokenBlacklist.objects.filter(
+            blacklisted_at__gte=self._synced_until - overlap
+        ).values_list("jti", flat=True)
+        for jti in recent:
+            self._bloom.add(_key(jti))
+        self._synced_until = started_at
+
+
+blacklist_filter = BlacklistFilter()
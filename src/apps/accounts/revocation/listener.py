@@ -0,0 +1,157 @@
+"""Apply revocations announced by other workers to this worker's caches.
+
+Every worker runs a ``RevocationListener`` thread, started from the gunicorn
+``post_worker_init`` hook, on its own connection LISTENing on the channel of
+notify.py. Notifications reach the in-process caches within milliseconds of
+the commit, instead of whenever their TTL or the next sync comes around.
+Notifications sent while the connection was down are lost, so after a
+reconnect the caches are resynced from the database.
+"""
+
+import select
+import threading
+import time
+
+import structlog
+from django.db import connection
+
+from apps.accounts.conf import get_setting
+from apps.accounts.user_cache import user_cache
+
+from .backends import get_blacklist_backend
+from .notify import CHANNEL
+from .sessions import remember_session_status
+from .versions import forget_token_state
+
+logger = structlog.get_logger(__name__)
+
+# seconds between checks of the stop flag, and of an idle connection
+_POLL_TIMEOUT = 1
+_PING_INTERVAL = 30
+_MAX_RECONNECT_DELAY = 30
+
+
+def apply_notification(payload):
+    """Apply one ``<kind>:<id>`` notification to this worker's caches."""
+    kind, _sep, value = payload.partition(":")
+    if kind == "jti":
+        get_blacklist_backend().remember(value)
+    elif kind == "session":
+        remember_session_status(value, True)
+    elif kind == "user":
+        forget_token_state(value)
+        user_cache.forget(value)
+    else:
+        logger.warning("unknown revocation notification", payload=payload)
+
+
+def resync():
+    """Drop or refresh caches that may have missed notifications."""
+    user_cache.clear()
+    get_blacklist_backend().resync()
+
+
+class RevocationListener:
+    """Thread applying revocation notifications as they arrive.
+
+    Args:
+        handler: Called with the payload of every notification
+        on_reconnect: Called once listening again after a lost connection
+
+    """
+
+    def __init__(self, handler=apply_notification, on_reconnect=resync):
+        self.handler = handler
+        self.on_reconnect = on_reconnect
+        self.listening = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the listener thread, unless it is already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="accounts-revocation-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop the thread and close its connection."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        delay = 1
+        reconnect = False
+        while not self._stop.is_set():
+            try:
+                conn = self._connect()
+            except Exception:
+                logger.exception("revocation listener could not connect")
+                self._stop.wait(delay)
+                delay = min(delay * 2, _MAX_RECONNECT_DELAY)
+                continue
+
+            delay = 1
+            try:
+                if reconnect:
+                    self.on_reconnect()
+                reconnect = True
+                self.listening.set()
+                self._listen(conn)
+            except Exception:
+                logger.exception("revocation listener disconnected")
+            finally:
+                self.listening.clear()
+                conn.close()
+
+    def _connect(self):
+        # a connection of its own, outside django's per-thread handling
+        conn = connection.get_new_connection(connection.get_connection_params())
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        return conn
+
+    def _listen(self, conn):
+        last_seen = time.monotonic()
+        while not self._stop.is_set():
+            if select.select([conn], [], [], _POLL_TIMEOUT) == ([], [], []):
+                if time.monotonic() - last_seen > _PING_INTERVAL:
+                    # nothing arrives on a dead connection, find out
+                    with conn.cursor() as cursor:
+                        cursor.execute("SELECT 1")
+                    last_seen = time.monotonic()
+                continue
+
+            conn.poll()
+            last_seen = time.monotonic()
+            while conn.notifies:
+                payload = conn.notifies.pop(0).payload
+                try:
+                    self.handler(payload)
+                except Exception:
+                    logger.exception("revocation notification failed", payload=payload)
+
+
+revocation_listener = None
+
+
+def start_revocation_listener():
+    """Start this process's listener, unless ``REVOCATION_NOTIFY`` is off."""
+    global revocation_listener
+    if not get_setting("REVOCATION_NOTIFY"):
+        return None
+    if revocation_listener is None:
+        revocation_listener = RevocationListener()
+    revocation_listener.start()
+    return revocation_listener
+
+
+def stop_revocation_listener(timeout=5):
+    """Stop this process's listener if it was started, waiting at most timeout."""
+    if revocation_listener is not None:
+        revocation_listener.stop(timeout)
@@ -0,0 +1,24 @@
+"""Announce revocations to every worker through Postgres NOTIFY.
+
+Blacklisted jtis, revoked sessions and changed users are sent on
+``CHANNEL`` as ``<kind>:<id>``. NOTIFY is delivered when the transaction
+commits, so a rolled back revocation is never announced. listener.py
+applies them to each worker's caches.
+"""
+
+from django.db import connection
+
+from apps.accounts.conf import get_setting
+
+CHANNEL = "accounts_revocation"
+
+
+def notify(kind, *values):
+    """Announce revoked ids of one kind: "jti", "session" or "user"."""
+    if not values or not get_setting("REVOCATION_NOTIFY"):
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            "SELECT pg_notify(%s, %s)",
+            [(CHANNEL, f"{kind}:{value}") for value in values],
+        )
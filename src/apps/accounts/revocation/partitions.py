@@ -0,0 +1,221 @@
+"""Range partitions of the blacklist table by ``expires_at``.
+
+Every partition covers one day (or hour) of expiry times, so once its upper
+bound has passed all of its rows are expired and the whole partition is
+detached and dropped instead of deleting them row by row. Rows outside every
+premade range land in the default partition, whose expired rows are deleted in
+small batches and which is expected to stay small.
+"""
+
+import time
+import zlib
+from datetime import UTC, datetime, timedelta
+
+import structlog
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from apps.accounts.conf import get_setting
+from core.db import estimate_table_rows
+
+logger = structlog.get_logger(__name__)
+
+TABLE = "accounts_tokenblacklist"
+DEFAULT_PARTITION = f"{TABLE}_default"
+PARTITION_PREFIX = f"{TABLE}_p"
+
+# interval name -> (partition width, strftime format of the name suffix)
+INTERVALS = {
+    "day": (timedelta(days=1), "%Y%m%d"),
+    "hour": (timedelta(hours=1), "%Y%m%d%H"),
+}
+
+# serializes partition maintenance between workers
+_LOCK_KEY = zlib.crc32(TABLE.encode())
+
+
+def _floor(moment, step):
+    moment = moment.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+    if step == INTERVALS["day"][0]:
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def _partition_range(name):
+    """Return the (start, end) expiry range a partition was created for."""
+    suffix = name.removeprefix(PARTITION_PREFIX)
+    step, fmt = INTERVALS["hour" if len(suffix) == 10 else "day"]
+    start = datetime.strptime(suffix, fmt).replace(tzinfo=UTC)
+    return start, start + step
+
+
+def list_partitions():
+    """Return the names of the range partitions, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+            """,
+            [TABLE],
+        )
+        names = [name for (name,) in cursor.fetchall()]
+    return sorted(name for name in names if name.startswith(PARTITION_PREFIX))
+
+
+def expired_partitions(now=None):
+    """Return the partitions whose whole expiry range has passed."""
+    now = now or timezone.now()
+    return [name for name in list_partitions() if _partition_range(name)[1] <= now]
+
+
+def ensure_partitions(now=None):
+    """Create the partitions for every expiry a token issued now can have.
+
+    Ranges already covered by an existing partition are skipped, so changing
+    ``BLACKLIST_PARTITION_INTERVAL`` only affects partitions made afterwards.
+
+    Returns:
+        list: Names of the partitions created
+
+    """
+    now = now or timezone.now()
+    step, fmt = INTERVALS[get_setting("BLACKLIST_PARTITION_INTERVAL")]
+    until = now + jwt_settings.REFRESH_TOKEN_LIFETIME + step
+
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", [_LOCK_KEY])
+        existing = [_partition_range(name) for name in list_partitions()]
+
+        start = _floor(now, step)
+        while start < until:
+            end = start + step
+            if not any(lo < end and start < hi for lo, hi in existing):
+                name = f"{PARTITION_PREFIX}{start.strftime(fmt)}"
+                _create_partition(cursor, name, start, end)
+                created.append(name)
+            start = end
+
+    if created:
+        logger.info("blacklist partitions created", partitions=created)
+    return created
+
+
+def _create_partition(cursor, name, start, end):
+    cursor.execute(
+        f'CREATE TABLE "{name}" (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+    )
+    # rows written before the partition existed sit in the default partition,
+    # attaching fails unless they are moved over first
+    cursor.execute(
+        f"""
+        WITH moved AS (
+            DELETE FROM {DEFAULT_PARTITION}
+            WHERE expires_at >= %s AND expires_at < %s
+            RETURNING *
+        )
+        INSERT INTO "{name}" SELECT * FROM moved
+        """,
+        [start, end],
+    )
+    cursor.execute(
+        f'ALTER TABLE {TABLE} ATTACH PARTITION "{name}" FOR VALUES FROM (%s) TO (%s)',
+        [start, end],
+    )
+
+
+def drop_expired_partitions(now=None):
+    """Drop every partition whose rows have all expired.
+
+    Each partition is detached and dropped in its own short transaction, the
+    lock on the parent table is only held for the catalog change.
+
+    Returns:
+        int: Planner estimate of the blacklist entries removed
+
+    """
+    now = now or timezone.now()
+    removed = 0
+
+    for name in expired_partitions(now):
+        count = estimate_table_rows(name)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [_LOCK_KEY])
+            if name not in list_partitions():
+                # dropped by a concurrent cleanup
+                continue
+            # deferred foreign key checks of this transaction would block DROP
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+            cursor.execute(f'ALTER TABLE {TABLE} DETACH PARTITION "{name}"')
+            cursor.execute(f'DROP TABLE "{name}"')
+        removed += count
+        logger.info("blacklist partition dropped", partition=name, entries=count)
+
+    return removed
+
+
+def delete_expired_rows(now=None, batch_size=5000, start_page=0):
+    """Delete expired rows of the default partition in batches.
+
+    The partition is walked in physical order from ``start_page`` and every
+    batch is a separate ``DELETE`` of at most ``batch_size`` rows picked by
+    ctid, so locks and transactions stay short. Yields after each batch so
+    the caller can pause, report progress or checkpoint.
+
+    Yields:
+        tuple: (rows deleted by the batch, heap page to resume from)
+
+    """
+    now = now or timezone.now()
+    page = start_page
+
+    while True:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE ctid = ANY(ARRAY(
+                    SELECT ctid FROM {DEFAULT_PARTITION}
+                    WHERE ctid >= %s::tid AND expires_at <= %s
+                    LIMIT %s
+                ))
+                RETURNING ctid
+                """,
+                [f"({page},0)", now, batch_size],
+            )
+            ctids = [ctid for (ctid,) in cursor.fetchall()]
+        if not ctids:
+            return
+
+        # ctids come back as "(page,offset)", the last page may hold more
+        # expired rows so the next batch starts on it
+        page = max(int(ctid.strip("()").split(",")[0]) for ctid in ctids)
+        yield len(ctids), page
+
+        if len(ctids) < batch_size:
+            return
+
+
+def cleanup_expired(now=None, pause=0):
+    """Remove every expired entry and create the upcoming partitions.
+
+    Args:
+        now: Entries expired at this time are removed, defaults to now
+        pause: Seconds to sleep between row delete batches
+
+    Returns:
+        int: Entries removed, estimated for dropped partitions
+
+    """
+    now = now or timezone.now()
+    removed = drop_expired_partitions(now)
+    for deleted, _page in delete_expired_rows(
+        now, batch_size=get_setting("CLEANUP_BATCH_SIZE")
+    ):
+        removed += deleted
+        time.sleep(pause)
+    ensure_partitions(now)
+    return removed
@@ -0,0 +1,34 @@
+"""Replay of refresh responses inside ``REFRESH_GRACE_PERIOD``.
+
+The issued pair is kept in the default cache, not the database, which would
+hold live refresh tokens in clear. The cache must be shared by every worker
+and node, a retry landing on another worker than the first attempt misses a
+per-process cache and gets a 401, see checks.py.
+"""
+
+from django.core.cache import cache
+
+from apps.accounts.conf import get_setting
+
+
+def _cache_key(jti):
+    return f"accounts:refresh_replay:{jti}"
+
+
+def remember_refresh_result(jti, data):
+    """Keep the pair issued for a rotated jti for the grace window."""
+    grace_period = get_setting("REFRESH_GRACE_PERIOD")
+    if grace_period:
+        cache.set(_cache_key(jti), data, grace_period)
+
+
+def get_refresh_replay(jti):
+    """Return the pair already issued for a jti inside the grace window.
+
+    Clients on flaky networks retry refreshes whose response they never got.
+    Handing back the same pair keeps them logged in without minting and
+    blacklisting again.
+    """
+    if not get_setting("REFRESH_GRACE_PERIOD"):
+        return None
+    return cache.get(_cache_key(jti))
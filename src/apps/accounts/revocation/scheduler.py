@@ -0,0 +1,161 @@
+"""Periodic cleanup of expired revocation state inside the web workers.
+
+Every worker runs a ``CleanupScheduler`` thread, started from the gunicorn
+``post_worker_init`` hook. On each tick the thread tries to take a session
+level ``pg_try_advisory_lock``: the worker holding it is the leader and runs
+the cleanup, every other worker on every node skips the tick. The leader
+keeps the lock between ticks, when it dies its connection closes, the lock
+is released and another worker takes over on its next tick.
+"""
+
+import threading
+import zlib
+
+import structlog
+from django.db import connection
+
+from apps.accounts.conf import get_setting
+from apps.accounts.models import OpaqueRefreshToken
+
+from .partitions import cleanup_expired
+
+logger = structlog.get_logger(__name__)
+
+_LOCK_KEY = zlib.crc32(b"accounts:cleanup_scheduler")
+
+
+def run_cleanup():
+    """Remove expired blacklist entries and opaque refresh handles.
+
+    Rows of both are deleted in batches with a pause in between.
+    """
+    pause = get_setting("CLEANUP_BATCH_PAUSE")
+    removed = cleanup_expired(pause=pause)
+    handles, _ = OpaqueRefreshToken.cleanup_expired(pause=pause)
+    logger.info("blacklist cleanup finished", removed=removed, handles=handles)
+
+
+class CleanupScheduler:
+    """Run a job every ``interval`` seconds in one process across the cluster.
+
+    Args:
+        interval: Seconds between ticks
+        job: Callable run on every tick while this process is the leader
+
+    """
+
+    def __init__(self, interval, job=run_cleanup):
+        self.interval = interval
+        self.job = job
+        self.is_leader = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the scheduler thread, unless it is already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="accounts-cleanup", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop the thread, giving up the leader lock."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.interval):
+                self.tick()
+        finally:
+            self.resign()
+            connection.close()
+
+    def tick(self):
+        """Run the job if this process is, or becomes, the leader."""
+        try:
+            if self._elect():
+                self.job()
+        except Exception:
+            logger.exception("blacklist cleanup failed")
+            # a broken connection may have lost the lock, start over
+            self.is_leader = False
+            connection.close()
+
+    def _elect(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", [_LOCK_KEY])
+            acquired = cursor.fetchone()[0]
+            if acquired and self.is_leader:
+                # already held, session locks stack so drop the extra hold
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [_LOCK_KEY])
+
+        if acquired and not self.is_leader:
+            logger.info("blacklist cleanup leader elected")
+        self.is_leader = acquired
+        return acquired
+
+    def resign(self):
+        """Release the leader lock so another process can take over."""
+        if not self.is_leader:
+            return
+        self.is_leader = False
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [_LOCK_KEY])
+        except Exception:
+            # the lock went away with the connection
+            logger.warning("blacklist cleanup lock release failed")
+
+
+def run_cleanup_in_background(job=run_cleanup):
+    """Run the job once in a thread, unless another process is the leader.
+
+    For callers such as the admin that must not wait for a full cleanup.
+    When the leader lock is taken the leader's next tick does the work.
+
+    Returns:
+        threading.Thread: The started thread
+
+    """
+
+    def target():
+        once = CleanupScheduler(0, job=job)
+        try:
+            once.tick()
+        finally:
+            once.resign()
+            connection.close()
+
+    thread = threading.Thread(target=target, name="accounts-cleanup-once", daemon=True)
+    thread.start()
+    return thread
+
+
+cleanup_scheduler = None
+
+
+def start_cleanup_scheduler():
+    """Start this process's scheduler, unless ``CLEANUP_INTERVAL`` is 0."""
+    global cleanup_scheduler
+    interval = get_setting("CLEANUP_INTERVAL")
+    if not interval:
+        return None
+    if cleanup_scheduler is None:
+        cleanup_scheduler = CleanupScheduler(interval)
+    cleanup_scheduler.start()
+    return cleanup_scheduler
+
+
+def stop_cleanup_scheduler(timeout=5):
+    """Stop this process's scheduler if it was started.
+
+    Waits at most timeout seconds for a running job, the thread is a daemon
+    and the lock is released with the connection if the process exits first.
+    """
+    if cleanup_scheduler is not None:
+        cleanup_scheduler.stop(timeout)
@@ -0,0 +1,179 @@
+from datetime import timedelta
+
+import structlog
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.accounts.conf import get_setting
+from apps.accounts.models.user_session import UserSession
+
+from .notify import notify
+
+logger = structlog.get_logger(__name__)
+
+SESSION_ID_CLAIM = "sid"
+
+
+def _cache_key(session_id):
+    return f"accounts:session_revoked:{session_id}"
+
+
+def _mark_revoked(session_ids):
+    ttl = get_setting("SESSION_STATUS_CACHE_TTL")
+    cache.set_many({_cache_key(session_id): True for session_id in session_ids}, ttl)
+    notify("session", *session_ids)
+
+
+def start_session(token, user, user_agent=""):
+    """Open a new session for the user and stamp its id on the refresh token.
+
+    Users are capped at ``MAX_SESSIONS_PER_USER`` active sessions, the least
+    recently used ones beyond the cap are revoked.
+    """
+    session = UserSession.objects.create(
+        user=user, current_jti=token["jti"], user_agent=user_agent[:255]
+    )
+    token[SESSION_ID_CLAIM] = str(session.id)
+
+    max_sessions = get_setting("MAX_SESSIONS_PER_USER")
+    if max_sessions:
+        evicted = list(
+            UserSession.objects.filter(user=user, revoked_at__isnull=True)
+            .order_by("-last_used_at")
+            .values_list("id", flat=True)[max_sessions:]
+        )
+        if evicted:
+            UserSession.objects.filter(id__in=evicted).update(revoked_at=timezone.now())
+            _mark_revoked(evicted)
+    return session
+
+
+def is_session_revoked(session_id):
+    """Return True if the session was revoked or does not exist.
+
+    The answer is cached for ``SESSION_STATUS_CACHE_TTL`` seconds, so most
+    requests never reach the database.
+    """
+    revoked = cached_session_status(session_id)
+    if revoked is None:
+        revoked = not active_session(session_id).exists()
+        remember_session_status(session_id, revoked)
+    return revoked
+
+
+def revoked_sessions(session_ids):
+    """Return the ids among session_ids of sessions revoked or gone.
+
+    Cached statuses are read in one call and the rest looked up in one
+    query, then cached like is_session_revoked() does.
+    """
+    keys = {_cache_key(session_id): session_id for session_id in session_ids}
+    cached = cache.get_many(keys)
+    revoked = {keys[key] for key, status in cached.items() if status}
+
+    missing = [session_id for key, session_id in keys.items() if key not in cached]
+    if missing:
+        active = {
+            str(session_id)
+            for session_id in UserSession.objects.filter(
+                id__in=missing, revoked_at__isnull=True
+            ).values_list("id", flat=True)
+        }
+        statuses = {session_id: str(session_id) not in active for session_id in missing}
+        cache.set_many(
+            {_cache_key(session_id): status for session_id, status in statuses.items()},
+            get_setting("SESSION_STATUS_CACHE_TTL"),
+        )
+        revoked.update(session_id for session_id, status in statuses.items() if status)
+    return revoked
+
+
+def session_families(session_ids):
+    """Return the refresh token state of the active sessions among session_ids.
+
+    Rotation moves it on every refresh, so unlike the revoked flag it is not
+    cached and is read in one query.
+
+    Returns:
+        dict: session id -> (current_jti, previous_jti, last_used_at)
+
+    """
+    return {
+        str(session_id): family
+        for session_id, *family in UserSession.objects.filter(
+            id__in=session_ids, revoked_at__isnull=True
+        ).values_list("id", "current_jti", "previous_jti", "last_used_at")
+    }
+
+
+def family_accepts(family, jti):
+    """Return True if refreshing with jti would not count as reuse.
+
+    That is the family's current refresh token, or the one the last rotation
+    replaced within ``REFRESH_GRACE_PERIOD``, whose retry gets the pair
+    already issued for it.
+    """
+    current_jti, previous_jti, last_used_at = family
+    if jti == current_jti:
+        return True
+    grace_period = timedelta(seconds=get_setting("REFRESH_GRACE_PERIOD"))
+    return jti == previous_jti and last_used_at >= timezone.now() - grace_period
+
+
+def active_session(session_id):
+    """Return a queryset matching the session if it is still active."""
+    return UserSession.objects.filter(id=session_id, revoked_at__isnull=True)
+
+
+def cached_session_status(session_id):
+    """Return the cached revoked flag of a session, or None if not cached."""
+    return cache.get(_cache_key(session_id))
+
+
+def remember_session_status(session_id, revoked):
+    """Cache a session's revoked flag looked up elsewhere."""
+    cache.set(_cache_key(session_id), revoked, get_setting("SESSION_STATUS_CACHE_TTL"))
+
+
+def revoke_session(session_id, user=None):
+    """Revoke a session and its access/refresh tokens as a unit."""
+    revoked = UserSession.revoke(session_id, user=user)
+    if revoked:
+        _mark_revoked([session_id])
+    return revoked
+
+
+def advance_session(session_id, old_jti, new_jti):
+    """Rotate the family to a new refresh token.
+
+    If old_jti is not the family's current refresh token it was already
+    rotated, so the family is revoked. A retry of the token the last
+    rotation replaced, within ``REFRESH_GRACE_PERIOD`` of it, is treated as
+    a lost response rather than reuse and only fails.
+
+    Returns:
+        bool: True if the session now points at new_jti
+
+    """
+    if UserSession.advance(session_id, old_jti, new_jti):
+        return True
+
+    grace_period = timedelta(seconds=get_setting("REFRESH_GRACE_PERIOD"))
+    reused = (
+        UserSession.objects.filter(id=session_id, revoked_at__isnull=True)
+        .exclude(previous_jti=old_jti, last_used_at__gte=timezone.now() - grace_period)
+        .update(revoked_at=timezone.now())
+    )
+    if reused:
+        logger.warning("refresh token reuse detected", session_id=str(session_id))
+        _mark_revoked([session_id])
+    return False
+
+
+def token_session_revoked(token):
+    """Return True if the token belongs to a revoked session.
+
+    Tokens issued before sessions existed carry no ``sid`` and are let through.
+    """
+    session_id = token.get(SESSION_ID_CLAIM)
+    return session_id is not None and is_session_revoked(session_id)
@@ -0,0 +1,41 @@
+"""Export of the blacklist to a memory-mapped snapshot file.
+
+See core/jti_snapshot.py for the file format and SnapshotBlacklistBackend in
+backends.py for the reader side.
+"""
+
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.accounts.models.jwt_token_blacklist import TokenBlacklist
+from core.jti_snapshot import write_snapshot
+
+
+def export_snapshot(path, now=None):
+    """Write every unexpired blacklisted jti to path.
+
+    Entries blacklisted from ``now`` on are not guaranteed to be in the file,
+    readers pull them from the database.
+
+    Returns:
+        tuple: (number of jtis written, generation stamped on the file)
+
+    """
+    now = now or timezone.now()
+    active = TokenBlacklist.objects.filter(expires_at__gt=now)
+    max_expiry = active.aggregate(max_expiry=Max("expires_at"))["max_expiry"]
+    # uuids sort by their bytes in postgres too, the file needs that order
+    jtis = (
+        active.order_by("jti")
+        .distinct("jti")
+        .values_list("jti", flat=True)
+        .iterator(chunk_size=10_000)
+    )
+    generation = int(now.timestamp() * 1_000_000)
+    count = write_snapshot(
+        path,
+        jtis,
+        generation=generation,
+        max_expiry=int(max_expiry.timestamp()) if max_expiry else 0,
+    )
+    return count, generation
@@ -0,0 +1,84 @@
+from django.core.cache import cache
+
+from apps.accounts.conf import get_setting
+from apps.accounts.models.user import User
+
+TOKEN_VERSION_CLAIM = "ver"
+
+
+def _cache_key(user_id):
+    return f"accounts:token_state:{user_id}"
+
+
+def add_token_version(token, user):
+    """Stamp a token with the user's current token version."""
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+    return token
+
+
+def token_version_matches(token, user):
+    """Return True if the token was issued after the user's last revocation.
+
+    Tokens issued before the claim existed are treated as version 0.
+    """
+    return token.get(TOKEN_VERSION_CLAIM, 0) == user.token_version
+
+
+def get_token_state(user_id):
+    """Return ``(token_version, is_active)`` for a user, or None if it is gone.
+
+    The answer is cached for ``TOKEN_STATE_CACHE_TTL`` seconds so the refresh
+    endpoint does not have to load the user row.
+    """
+    key = _cache_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        row = (
+            User.objects.filter(pk=user_id)
+            .values_list("token_version", "is_active")
+            .first()
+        )
+        state = tuple(row) if row else False
+        cache.set(key, state, get_setting("TOKEN_STATE_CACHE_TTL"))
+    return state or None
+
+
+def get_token_states(user_ids):
+    """Return get_token_state() for many users with one query for cache misses."""
+    keys = {_cache_key(user_id): user_id for user_id in user_ids}
+    cached = cache.get_many(keys)
+    states = {keys[key]: state for key, state in cached.items()}
+
+    missing = [user_id for key, user_id in keys.items() if key not in cached]
+    if missing:
+        rows = {
+            str(pk): (token_version, is_active)
+            for pk, token_version, is_active in User.objects.filter(
+                pk__in=missing
+            ).values_list("pk", "token_version", "is_active")
+        }
+        loaded = {user_id: rows.get(str(user_id), False) for user_id in missing}
+        cache.set_many(
+            {_cache_key(user_id): state for user_id, state in loaded.items()},
+            get_setting("TOKEN_STATE_CACHE_TTL"),
+        )
+        states.update(loaded)
+    return {user_id: state or None for user_id, state in states.items()}
+
+
+def forget_token_state(user_id):
+    """Drop the cached token state after the user row changed."""
+    cache.delete(_cache_key(user_id))
+
+
+def token_is_current(token, user_id):
+    """Return True if the token owner is active and the token not revoked."""
+    return token_matches_state(token, get_token_state(user_id))
+
+
+def token_matches_state(token, state):
+    """Return True if a token is current for its owner's token state."""
+    if state is None:
+        return False
+    token_version, is_active = state
+    return is_active and token.get(TOKEN_VERSION_CLAIM, 0) == token_version
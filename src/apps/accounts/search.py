@@ -0,0 +1,83 @@
+"""Ranked user search for the staff API and the admin.
+
+A term containing "@", or too short for trigrams, only matches email
+prefixes, a range scan of ``accounts_user_email_prefix_idx``. Anything else
+is matched anywhere in one document of email and names, which the
+``accounts_user_search_idx`` trigram index answers when the pg_trgm
+extension is installed. Exact emails rank first, then email prefixes, then
+the closest trigram matches and the newest users.
+"""
+
+import functools
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection
+from django.db.models import Case, TextField, Value, When
+from django.db.models.functions import Concat, Upper
+
+# the extension is needed to build the search index and to rank matches
+TRIGRAM_EXTENSION = "pg_trgm"
+# trigram indexes cannot narrow down shorter terms
+MIN_TRIGRAM_TERM = 3
+
+
+def search_document():
+    """Return the expression searched for terms, the same one indexed."""
+    return Upper(
+        Concat(
+            "email",
+            Value(" "),
+            "first_name",
+            Value(" "),
+            "last_name",
+            output_field=TextField(),
+        )
+    )
+
+
+def search_index():
+    """Return the trigram index over search_document()."""
+    return GinIndex(
+        OpClass(search_document(), name="gin_trgm_ops"),
+        name="accounts_user_search_idx",
+    )
+
+
+@functools.cache
+def has_trigram_extension():
+    """Return True if pg_trgm is installed, checked once per worker."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = %s)",
+            [TRIGRAM_EXTENSION],
+        )
+        return cursor.fetchone()[0]
+
+
+def search_users(queryset, term):
+    """Return the users of queryset matching term, best matches first."""
+    term = term.strip()
+    if not term:
+        return queryset
+
+    queryset = queryset.annotate(
+        search_rank=Case(
+            When(email__iexact=term, then=Value(2)),
+            When(email__istartswith=term, then=Value(1)),
+            default=Value(0),
+        )
+    )
+    if "@" in term or len(term) < MIN_TRIGRAM_TERM:
+        return queryset.filter(email__istartswith=term).order_by(
+            "-search_rank", "email"
+        )
+
+    queryset = queryset.alias(search_document=search_document()).filter(
+        search_document__contains=term.upper()
+    )
+    if not has_trigram_extension():
+        return queryset.order_by("-search_rank", "-date_joined")
+    return queryset.annotate(
+        search_similarity=TrigramSimilarity("search_document", term.upper())
+    ).order_by("-search_rank", "-search_similarity", "-date_joined")
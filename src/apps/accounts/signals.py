@@ -0,0 +1,47 @@
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import TokenBlacklist, User
+from .revocation.backends import get_blacklist_backend
+from .revocation.filter import blacklist_filter
+from .revocation.notify import notify
+from .revocation.versions import forget_token_state
+from .user_cache import user_cache
+
+
+@receiver(post_save, sender=TokenBlacklist)
+def add_to_blacklist_filter(sender, instance, created, **kwargs):
+    """Make a new blacklist entry visible to every worker's filter immediately."""
+    if created:
+        blacklist_filter.add(instance.jti)
+        notify("jti", instance.jti)
+
+
+def forget_user(user_id):
+    """Drop the cached token state and snapshots of a user on commit.
+
+    Dropping them before the change is committed lets a concurrent request
+    cache the old row again, under the new version.
+    """
+
+    def forget():
+        forget_token_state(user_id)
+        user_cache.invalidate(user_id)
+
+    transaction.on_commit(forget)
+
+
+@receiver([post_save, post_delete], sender=User)
+def forget_user_token_state(sender, instance, **kwargs):
+    """Refresh tokens must see a deactivated or deleted user straight away."""
+    forget_user(instance.pk)
+    notify("user", instance.pk)
+
+
+@receiver(setting_changed)
+def reset_blacklist_backend(sender, setting, **kwargs):
+    """Pick up a new blacklist backend when settings are overridden."""
+    if setting == "ACCOUNTS_AUTH":
+        get_blacklist_backend.cache_clear()
@@ -0,0 +1,219 @@
+"""Asymmetric JWT signing with rotating keys.
+
+With ``SIGNING_ALGORITHM`` set to "EdDSA" or "RS256", tokens are signed with
+the active ``SigningKey`` and carry its id in the ``kid`` header, so other
+services verify them locally with the public keys served at
+``/.well-known/jwks.json``. Every worker keeps a key ring: one prepared
+TokenBackend per key in a dict keyed by kid, rebuilt from the database every
+``SIGNING_KEYS_RELOAD_INTERVAL`` seconds and whenever a token names a kid
+the worker does not know yet. Run ``rotate_signing_keys`` before setting
+``SIGNING_ALGORITHM`` to create the first key, otherwise the first request
+creates it.
+"""
+
+import threading
+import time
+import zlib
+
+import jwt
+import structlog
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from jwt.exceptions import InvalidTokenError
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.state import token_backend as legacy_backend
+
+from apps.accounts.conf import get_setting
+from apps.accounts.models.signing_key import SigningKey
+from apps.accounts.token_cache import verified_tokens
+
+logger = structlog.get_logger(__name__)
+
+# unknown kids reload the key ring at most this often, per worker
+_MISS_RELOAD_INTERVAL = 1
+
+# serializes creating the first key between workers and nodes
+_FIRST_KEY_LOCK = zlib.crc32(b"accounts:first_signing_key")
+
+
+def expired_keys(keys, now):
+    """Return the keys, sorted by activation, whose tokens have all expired.
+
+    A key stops signing when the next one activates, no token it signed
+    lives longer than ``REFRESH_TOKEN_LIFETIME`` past that.
+    """
+    cutoff = now - jwt_settings.REFRESH_TOKEN_LIFETIME
+    return [
+        key
+        for key, successor in zip(keys, keys[1:], strict=False)
+        if successor.activates_at <= cutoff
+    ]
+
+
+def create_first_key():
+    """Create the first signing key, unless another process already has.
+
+    Workers meeting an empty key table at the same time queue on an advisory
+    lock and the ones after the first find its key, so a single key is
+    generated and published.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", [_FIRST_KEY_LOCK])
+        if SigningKey.objects.filter(activates_at__lte=timezone.now()).exists():
+            return
+        key = SigningKey.generate(get_setting("SIGNING_ALGORITHM"))
+    logger.info("first signing key created", kid=key.kid)
+
+
+class KeyedTokenBackend(TokenBackend):
+    """TokenBackend for one SigningKey, stamping its kid on encoded tokens."""
+
+    def __init__(self, key):
+        super().__init__(
+            key.algorithm,
+            key.private_key,
+            key.public_key,
+            jwt_settings.AUDIENCE,
+            jwt_settings.ISSUER,
+            None,
+            jwt_settings.LEEWAY,
+            jwt_settings.JSON_ENCODER,
+        )
+        self.kid = key.kid
+
+    def encode(self, payload):
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload["aud"] = self.audience
+        if self.issuer is not None:
+            jwt_payload["iss"] = self.issuer
+
+        return jwt.encode(
+            jwt_payload,
+            self.prepared_signing_key,
+            algorithm=self.algorithm,
+            headers={"kid": self.kid},
+            json_encoder=self.json_encoder,
+        )
+
+
+class KeyRing:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget the loaded keys, the next use reloads them."""
+        with self._lock:
+            self._backends = {}
+            self._signing = None
+            self._jwks = {"keys": []}
+            self._loaded_at = None
+            self._missed_at = None
+
+    def signing_backend(self):
+        """Return the backend of the key currently signing new tokens."""
+        self._ensure_fresh()
+        return self._signing
+
+    def verifying_backend(self, kid):
+        """Return the backend verifying tokens signed by kid, or None."""
+        self._ensure_fresh()
+        backend = self._backends.get(kid)
+        now = time.monotonic()
+        if backend is None and (
+            self._missed_at is None or now - self._missed_at > _MISS_RELOAD_INTERVAL
+        ):
+            # published by another node since the last reload
+            self._missed_at = now
+            self.load()
+            backend = self._backends.get(kid)
+        return backend
+
+    def jwks(self):
+        """Return the JWKS document of every key that still verifies."""
+        self._ensure_fresh()
+        return self._jwks
+
+    def _ensure_fresh(self):
+        interval = get_setting("SIGNING_KEYS_RELOAD_INTERVAL")
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > interval:
+            self.load()
+
+    def load(self):
+        """Rebuild the key ring from the database."""
+        now = timezone.now()
+        keys = list(SigningKey.objects.all())
+        active = [key for key in keys if key.activates_at <= now]
+        if not active:
+            # first use after SIGNING_ALGORITHM was set
+            create_first_key()
+            now = timezone.now()
+            keys = list(SigningKey.objects.all())
+            active = [key for key in keys if key.activates_at <= now]
+
+        expired = {key.kid for key in expired_keys(keys, now)}
+        keys = [key for key in keys if key.kid not in expired]
+        backends = {}
+        for key in keys:
+            backend = KeyedTokenBackend(key)
+            # parse the PEMs now rather than on the first request using them
+            backend.prepared_signing_key  # noqa: B018
+            backend.prepared_verifying_key  # noqa: B018
+            backends[key.kid] = backend
+
+        with self._lock:
+            if self._backends.keys() - backends.keys():
+                # tokens of a removed key must be verified again, and fail
+                verified_tokens.clear()
+            self._backends = backends
+            self._signing = backends[active[-1].kid]
+            self._jwks = {"keys": [key.public_jwk() for key in keys]}
+            self._loaded_at = time.monotonic()
+
+
+keyring = KeyRing()
+
+
+class KeyRingTokenBackend:
+    """Token backend signing with the active key and verifying by kid.
+
+    Tokens without a kid were signed with SIMPLE_JWT's ``SIGNING_KEY``
+    before asymmetric signing was enabled, they are accepted while
+    ``ACCEPT_LEGACY_TOKENS`` is set.
+    """
+
+    def get_leeway(self):
+        return legacy_backend.get_leeway()
+
+    def encode(self, payload):
+        return keyring.signing_backend().encode(payload)
+
+    def decode(self, token, verify=True):
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except InvalidTokenError as e:
+            raise TokenBackendError(_("Token is invalid")) from e
+
+        if kid is None:
+            if not get_setting("ACCEPT_LEGACY_TOKENS"):
+                raise TokenBackendError(_("Token is invalid"))
+            return legacy_backend.decode(token, verify=verify)
+
+        backend = keyring.verifying_backend(kid)
+        if backend is None:
+            raise TokenBackendError(_("Token is invalid"))
+        return backend.decode(token, verify=verify)
+
+
+keyring_backend = KeyRingTokenBackend()
+
+
+def get_token_backend():
+    """Return the backend tokens are signed and verified with."""
+    if get_setting("SIGNING_ALGORITHM") is None:
+        return legacy_backend
+    return keyring_backend
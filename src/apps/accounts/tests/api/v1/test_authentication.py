@@ -1,10 +1,14 @@
 import pytest
 from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APIClient
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient, APIRequestFactory
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.accounts.api.v1.authentication import JWTAuthenticationWithBlacklist
+from apps.accounts.models import UserSession
 from apps.accounts.models.jwt_token_blacklist import TokenBlacklist
+from apps.accounts.revocation.sessions import revoke_session, start_session
 
 
 @pytest.mark.django_db
@@ -20,7 +24,8 @@ class TestBlacklistAuthentication:
         response = client.get("/api/v1/users/")
         assert response.status_code in [status.HTTP_200_OK, status.HTTP_403_FORBIDDEN]
 
-    def test_authenticated_user_with_blacklisted_token(self, user_factory):
+    def test_authenticated_user_with_blacklisted_token(self, settings, user_factory):
+        settings.ACCOUNTS_AUTH = {"CHECK_ACCESS_TOKEN_JTI": True}
         user = user_factory()
         refresh = RefreshToken.for_user(user)
         access = refresh.access_token
@@ -45,3 +50,133 @@ class TestBlacklistAuthentication:
         )
         assert TokenBlacklist.is_blacklisted(jti1)
         assert not TokenBlacklist.is_blacklisted(jti2)
+
+    def test_token_issued_before_revocation_is_rejected(self, user_factory):
+        user = user_factory()
+        access = RefreshToken.for_user(user).access_token
+        user.revoke_tokens()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = client.get(f"/api/v1/users/{user.id}/")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_access_jti_not_checked_by_default(self, user_factory):
+        user = user_factory()
+        access = RefreshToken.for_user(user).access_token
+        exp_timestamp = int((timezone.now() + timezone.timedelta(hours=1)).timestamp())
+        TokenBlacklist.blacklist_token(
+            user=user, jti=access["jti"], exp_timestamp=exp_timestamp
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = client.get(f"/api/v1/users/{user.id}/")
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_access_token_of_revoked_session_is_rejected(self, user_factory):
+        user = user_factory()
+        refresh = RefreshToken.for_user(user)
+        session = start_session(refresh, user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        assert client.get(f"/api/v1/users/{user.id}/").status_code == 200
+
+        revoke_session(session.id)
+
+        response = client.get(f"/api/v1/users/{user.id}/")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_token_of_deleted_user_is_rejected(self, user_factory):
+        user = user_factory()
+        access = RefreshToken.for_user(user).access_token
+        user.delete()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = client.get("/api/v1/users/")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_token_without_user_claim_is_rejected(self, user_factory):
+        access = RefreshToken.for_user(user_factory()).access_token
+        del access["user_id"]
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = client.get("/api/v1/users/")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestSingleQueryAuthentication:
+    """Test that a cold authenticated request costs one query."""
+
+    @pytest.fixture(autouse=True)
+    def check_jti_in_database(self, settings):
+        settings.ACCOUNTS_AUTH = {
+            "CHECK_ACCESS_TOKEN_JTI": True,
+            "BLACKLIST_FILTER_ENABLED": False,
+        }
+
+    def authenticate(self, access):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {access}")
+        return JWTAuthenticationWithBlacklist().authenticate(request)
+
+    def test_cold_request_makes_one_query(
+        self, user_factory, django_assert_num_queries
+    ):
+        user = user_factory()
+        refresh = RefreshToken.for_user(user)
+        start_session(refresh, user)
+
+        with django_assert_num_queries(1):
+            authenticated, _token = self.authenticate(refresh.access_token)
+        assert authenticated == user
+
+    def test_warm_request_makes_one_query_for_the_jti(
+        self, user_factory, django_assert_num_queries
+    ):
+        user = user_factory()
+        refresh = RefreshToken.for_user(user)
+        start_session(refresh, user)
+        self.authenticate(refresh.access_token)
+
+        # the user and session are cached, only the uncached jti is looked up
+        with django_assert_num_queries(1):
+            self.authenticate(refresh.access_token)
+
+    def test_revoked_session_in_same_query(self, user_factory):
+        user = user_factory()
+        refresh = RefreshToken.for_user(user)
+        session = start_session(refresh, user)
+        UserSession.revoke(session.id)
+
+        with pytest.raises(AuthenticationFailed):
+            self.authenticate(refresh.access_token)
+
+    def test_blacklisted_jti_in_same_query(self, user_factory):
+        user = user_factory()
+        access = RefreshToken.for_user(user).access_token
+        exp_timestamp = int((timezone.now() + timezone.timedelta(hours=1)).timestamp())
+        TokenBlacklist.blacklist_token(
+            user=user, jti=access["jti"], exp_timestamp=exp_timestamp
+        )
+
+        with pytest.raises(AuthenticationFailed):
+            self.authenticate(access)
+
+    def test_repeat_token_skips_signature_verification(self, user_factory, monkeypatch):
+        from rest_framework_simplejwt.backends import TokenBackend
+
+        user = user_factory()
+        refresh = RefreshToken.for_user(user)
+        start_session(refresh, user)
+        decode = TokenBackend.decode
+        calls = []
+
+        def counting_decode(backend, token, verify=True):
+            calls.append(token)
+            return decode(backend, token, verify)
+
+        monkeypatch.setattr(TokenBackend, "decode", counting_decode)
+        access = refresh.access_token
+        self.authenticate(access)
+        authenticated, _token = self.authenticate(access)
+        assert authenticated == user
+        assert len(calls) == 1
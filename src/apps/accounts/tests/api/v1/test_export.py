@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+
+import pytest
+
+URL = "/api/v1/users/export/"
+
+
+def body(response):
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestUserExport:
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, admin_user, user_factory):
+        self.client = api_client
+        self.client.force_authenticate(admin_user)
+        self.admin = admin_user
+        self.users = [user_factory() for _i in range(3)]
+
+    def test_streams_ndjson_oldest_first(self):
+        response = self.client.get(URL)
+        assert response.status_code == 200
+        assert response.streaming
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert 'filename="users.ndjson"' in response["Content-Disposition"]
+
+        rows = [json.loads(line) for line in body(response).splitlines()]
+        assert [row["id"] for row in rows] == [
+            str(user.id) for user in [self.admin, *self.users]
+        ]
+        assert rows[1]["email"] == self.users[0].email
+        assert rows[1]["is_active"] is True
+
+    def test_streams_csv(self):
+        response = self.client.get(URL, {"output": "csv"})
+        assert response["Content-Type"] == "text/csv"
+
+        rows = list(csv.DictReader(io.StringIO(body(response))))
+        assert [row["email"] for row in rows] == [
+            user.email for user in [self.admin, *self.users]
+        ]
+        assert rows[0]["is_staff"] == "True"
+
+    def test_csv_escapes_formulas(self):
+        self.users[0].first_name = "=HYPERLINK(1)"
+        self.users[0].last_name = "-2+3"
+        self.users[0].save()
+        response = self.client.get(URL, {"output": "csv"})
+
+        rows = list(csv.DictReader(io.StringIO(body(response))))
+        assert rows[1]["first_name"] == "'=HYPERLINK(1)"
+        assert rows[1]["last_name"] == "'-2+3"
+        assert rows[2]["first_name"] == self.users[1].first_name
+
+    def test_writes_in_chunks(self, settings):
+        settings.ACCOUNTS_AUTH = {"USER_EXPORT_CHUNK_SIZE": 2}
+        response = self.client.get(URL)
+        chunks = list(response.streaming_content)
+        assert [chunk.count(b"\n") for chunk in chunks] == [2, 2]
+
+    def test_applies_list_filters(self):
+        response = self.client.get(URL, {"is_staff": "true"})
+        rows = [json.loads(line) for line in body(response).splitlines()]
+        assert [row["id"] for row in rows] == [str(self.admin.id)]
+
+    def test_rejects_unknown_output(self):
+        response = self.client.get(URL, {"output": "xml"})
+        assert response.status_code == 400
+        assert "output" in response.data
+
+    def test_staff_only(self):
+        self.client.force_authenticate(self.users[0])
+        assert self.client.get(URL).status_code == 403
@@ -0,0 +1,180 @@
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.backends import TokenBackend
+
+from apps.accounts.introspection import introspect
+from apps.accounts.revocation.backends import get_blacklist_backend
+from apps.accounts.revocation.sessions import (
+    advance_session,
+    revoke_session,
+    start_session,
+)
+from apps.accounts.tokens import RefreshToken
+
+URL = "/api/v1/token/introspect/"
+
+
+def login(user):
+    """Return a refresh token bound to a new session, like the login view."""
+    refresh = RefreshToken.for_user(user)
+    start_session(refresh, user)
+    return refresh
+
+
+@pytest.fixture
+def gateway_client(staff_user):
+    client = APIClient()
+    client.force_authenticate(staff_user)
+    return client
+
+
+@pytest.mark.django_db
+class TestIntrospectionEndpoint:
+    """Test the batch token introspection endpoint."""
+
+    def test_requires_staff(self, user_factory):
+        client = APIClient()
+        assert client.post(URL, {"tokens": ["x"]}, format="json").status_code == 401
+
+        client.force_authenticate(user_factory())
+        assert client.post(URL, {"tokens": ["x"]}, format="json").status_code == 403
+
+    def test_batch_results_in_order(self, gateway_client, user_factory):
+        user = user_factory()
+        refresh = login(user)
+        access = str(refresh.access_token)
+
+        response = gateway_client.post(
+            URL, {"tokens": [access, "garbage", str(refresh)]}, format="json"
+        )
+
+        assert response.status_code == 200
+        first, second, third = response.json()["results"]
+        assert first["active"] is True
+        assert first["token_type"] == "access"
+        assert first["user_id"] == str(user.id)
+        assert second == {"active": False}
+        assert third["active"] is True
+        assert third["token_type"] == "refresh"
+
+    def test_batch_size_is_capped(self, settings, gateway_client):
+        settings.ACCOUNTS_AUTH = {"INTROSPECTION_MAX_TOKENS": 2}
+        response = gateway_client.post(URL, {"tokens": ["a", "b", "c"]}, format="json")
+        assert response.status_code == 400
+
+    def test_empty_batch_is_rejected(self, gateway_client):
+        assert (
+            gateway_client.post(URL, {"tokens": []}, format="json").status_code == 400
+        )
+
+
+@pytest.mark.django_db
+class TestIntrospect:
+    """Test revocation checks and query counts of introspect()."""
+
+    def test_revoked_tokens_are_inactive(self, user_factory):
+        logged_out, revoked_owner, deactivated, current = user_factory.create_batch(4)
+
+        session_token = login(logged_out)
+        revoke_session(session_token["sid"])
+
+        blacklisted = RefreshToken.for_user(current)
+        get_blacklist_backend().blacklist_token(
+            blacklisted["jti"], blacklisted["exp"], current.pk
+        )
+
+        old_version = login(revoked_owner)
+        revoked_owner.revoke_tokens()
+
+        inactive_owner = login(deactivated)
+        deactivated.is_active = False
+        deactivated.save()
+
+        active = login(current)
+        results = introspect(
+            [
+                str(session_token),
+                str(blacklisted),
+                str(old_version),
+                str(inactive_owner),
+                str(active),
+            ]
+        )
+        assert [result["active"] for result in results] == [
+            False,
+            False,
+            False,
+            False,
+            True,
+        ]
+
+    def test_batch_costs_three_queries(
+        self, settings, user_factory, django_assert_num_queries
+    ):
+        settings.ACCOUNTS_AUTH = {"BLACKLIST_FILTER_ENABLED": False}
+        users = user_factory.create_batch(10)
+        tokens = [str(login(user).access_token) for user in users]
+
+        # blacklist, sessions and token owners, whatever the batch size
+        with django_assert_num_queries(3):
+            results = introspect(tokens)
+        assert all(result["active"] for result in results)
+
+        # statuses are cached, only the blacklist is asked again
+        with django_assert_num_queries(1):
+            introspect(tokens)
+
+        # refresh tokens read their session families on every call
+        tokens = [str(login(user)) for user in users]
+        for _call in range(2):
+            with django_assert_num_queries(2):
+                assert all(result["active"] for result in introspect(tokens))
+
+    def test_rotated_refresh_token_is_inactive(self, settings, user_factory):
+        settings.ACCOUNTS_AUTH = {"REFRESH_GRACE_PERIOD": 0}
+        user = user_factory()
+        old = login(user)
+        new = RefreshToken.for_user(user)
+        new["sid"] = old["sid"]
+        assert advance_session(old["sid"], old["jti"], new["jti"])
+
+        results = introspect([str(old), str(new)])
+        assert [result["active"] for result in results] == [False, True]
+
+    def test_replaced_refresh_token_is_active_within_grace_period(self, user_factory):
+        user = user_factory()
+        first = login(user)
+        second, third = RefreshToken.for_user(user), RefreshToken.for_user(user)
+        advance_session(first["sid"], first["jti"], second["jti"])
+        advance_session(first["sid"], second["jti"], third["jti"])
+        second["sid"] = third["sid"] = first["sid"]
+
+        results = introspect([str(first), str(second), str(third)])
+        assert [result["active"] for result in results] == [False, True, True]
+
+    def test_verification_is_cached(self, user_factory, monkeypatch):
+        raw = str(login(user_factory()).access_token)
+        decode = TokenBackend.decode
+        calls = []
+
+        def counting_decode(backend, token, verify=True):
+            calls.append(token)
+            return decode(backend, token, verify)
+
+        monkeypatch.setattr(TokenBackend, "decode", counting_decode)
+        introspect([raw])
+        introspect([raw])
+        assert len(calls) == 1
+
+    def test_expired_token_is_inactive(self, user_factory):
+        refresh = login(user_factory())
+        refresh.set_exp(lifetime=-refresh.lifetime)
+        assert introspect([str(refresh)]) == [{"active": False}]
+
+    def test_cached_refresh_token_does_not_authenticate(self, user_factory):
+        refresh = str(login(user_factory()))
+        introspect([refresh])
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh}")
+        assert client.get("/api/v1/users/sessions/").status_code == 401
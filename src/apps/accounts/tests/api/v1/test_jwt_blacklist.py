@@ -77,3 +77,162 @@ class TestJWTBlacklistBehavior:
 
         assert response.status_code == 401
         assert "Token has been revoked" in str(response.content)
+
+    def test_obtain_pair_carries_token_version(self, api_client, user_factory):
+        user = user_factory(password="password1234")
+        user.revoke_tokens()
+
+        response = api_client.post(
+            "/api/v1/token/",
+            {"email": user.email, "password": "password1234"},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        refresh = RefreshToken(response.json()["refresh"])
+        assert refresh["ver"] == 1
+
+    def test_refresh_after_revocation_fails(self, api_client, user_factory):
+        user = user_factory()
+        refresh = RefreshToken.for_user(user)
+        user.revoke_tokens()
+
+        response = api_client.post(
+            "/api/v1/token/refresh/", {"refresh": str(refresh)}, format="json"
+        )
+
+        assert response.status_code == 401
+        assert not TokenBlacklist.objects.filter(jti=refresh["jti"]).exists()
+
+    def test_logout_revokes_session_tokens(
+        self, api_client, user_factory, obtain_tokens
+    ):
+        user = user_factory()
+        tokens = obtain_tokens(user)
+
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        response = api_client.post(
+            "/api/v1/users/logout/", {"refresh": tokens["refresh"]}, format="json"
+        )
+        assert response.json()["detail"] == "Successfully logged out"
+        # the session is revoked, no blacklist row needed
+        assert not TokenBlacklist.objects.exists()
+
+        # the access token died with its session
+        response = api_client.get(f"/api/v1/users/{user.id}/")
+        assert response.status_code == 401
+
+        api_client.credentials()
+        response = api_client.post(
+            "/api/v1/token/refresh/", {"refresh": tokens["refresh"]}, format="json"
+        )
+        assert response.status_code == 401
+
+    def test_logout_twice_with_session_token(
+        self, api_client, user_factory, obtain_tokens
+    ):
+        user = user_factory()
+        tokens = obtain_tokens(user)
+        api_client.force_authenticate(user=user)
+        api_client.post(
+            "/api/v1/users/logout/", {"refresh": tokens["refresh"]}, format="json"
+        )
+        response = api_client.post(
+            "/api/v1/users/logout/", {"refresh": tokens["refresh"]}, format="json"
+        )
+        assert response.json()["detail"] == "Token already blacklisted"
+
+    def test_refresh_is_a_single_query_when_warm(
+        self, api_client, user_factory, django_assert_num_queries
+    ):
+        user = user_factory()
+        first = api_client.post(
+            "/api/v1/token/refresh/",
+            {"refresh": str(RefreshToken.for_user(user))},
+            format="json",
+        )
+        assert first.status_code == 200
+
+        # token version and active flag now come from the cache
+        with django_assert_num_queries(1):
+            response = api_client.post(
+                "/api/v1/token/refresh/",
+                {"refresh": first.json()["refresh"]},
+                format="json",
+            )
+        assert response.status_code == 200
+
+    def test_refresh_for_inactive_or_deleted_user_fails(self, api_client, user_factory):
+        inactive = user_factory()
+        inactive_refresh = RefreshToken.for_user(inactive)
+        inactive.is_active = False
+        inactive.save()
+
+        deleted = user_factory()
+        deleted_refresh = RefreshToken.for_user(deleted)
+        deleted.delete()
+
+        for refresh in (inactive_refresh, deleted_refresh):
+            response = api_client.post(
+                "/api/v1/token/refresh/", {"refresh": str(refresh)}, format="json"
+            )
+            assert response.status_code == 401
+
+    def test_retry_within_grace_period_gets_same_pair(self, api_client, user_factory):
+        refresh = str(RefreshToken.for_user(user_factory()))
+
+        first = api_client.post(
+            "/api/v1/token/refresh/", {"refresh": refresh}, format="json"
+        )
+        retry = api_client.post(
+            "/api/v1/token/refresh/", {"refresh": refresh}, format="json"
+        )
+
+        assert retry.status_code == 200
+        assert retry.json() == first.json()
+        assert TokenBlacklist.objects.count() == 1
+
+    def test_retry_without_grace_period_fails(self, settings, api_client, user_factory):
+        settings.ACCOUNTS_AUTH = {"REFRESH_GRACE_PERIOD": 0}
+        refresh = str(RefreshToken.for_user(user_factory()))
+
+        api_client.post("/api/v1/token/refresh/", {"refresh": refresh}, format="json")
+        retry = api_client.post(
+            "/api/v1/token/refresh/", {"refresh": refresh}, format="json"
+        )
+
+        assert retry.status_code == 401
+
+    def test_session_rotation_writes_no_blacklist_row(
+        self, api_client, user_factory, obtain_tokens
+    ):
+        tokens = obtain_tokens(user_factory())
+        response = api_client.post(
+            "/api/v1/token/refresh/", {"refresh": tokens["refresh"]}, format="json"
+        )
+        assert response.status_code == 200
+        assert (
+            RefreshToken(response.json()["refresh"])["sid"]
+            == (RefreshToken(tokens["refresh"])["sid"])
+        )
+        assert not TokenBlacklist.objects.exists()
+
+    def test_reused_session_token_revokes_family(
+        self, settings, api_client, user_factory, obtain_tokens
+    ):
+        settings.ACCOUNTS_AUTH = {"REFRESH_GRACE_PERIOD": 0}
+        tokens = obtain_tokens(user_factory())
+        rotated = api_client.post(
+            "/api/v1/token/refresh/", {"refresh": tokens["refresh"]}, format="json"
+        ).json()
+
+        # the old token shows up again: stolen, the family is revoked
+        reuse = api_client.post(
+            "/api/v1/token/refresh/", {"refresh": tokens["refresh"]}, format="json"
+        )
+        assert reuse.status_code == 401
+
+        response = api_client.post(
+            "/api/v1/token/refresh/", {"refresh": rotated["refresh"]}, format="json"
+        )
+        assert response.status_code == 401
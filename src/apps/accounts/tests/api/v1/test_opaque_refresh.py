@@ -0,0 +1,112 @@
+import pytest
+
+from apps.accounts.models import OpaqueRefreshToken, TokenBlacklist
+
+
+@pytest.fixture
+def opaque_mode(settings):
+    settings.ACCOUNTS_AUTH = {"REFRESH_TOKEN_MODE": "opaque"}
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("opaque_mode")
+class TestOpaqueRefreshTokens:
+    """Tests for the opaque refresh token mode."""
+
+    def test_obtain_returns_opaque_refresh_handle(self, user_factory, obtain_tokens):
+        tokens = obtain_tokens(user_factory())
+
+        assert tokens["refresh"].count(".") == 0
+        assert OpaqueRefreshToken.objects.filter(
+            token_hash=OpaqueRefreshToken.hash(tokens["refresh"])
+        ).exists()
+
+    def test_refresh_rotates_handle(self, api_client, user_factory, obtain_tokens):
+        user = user_factory()
+        tokens = obtain_tokens(user)
+
+        response = api_client.post(
+            "/api/v1/token/refresh/", {"refresh": tokens["refresh"]}, format="json"
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["refresh"] != tokens["refresh"]
+        assert OpaqueRefreshToken.objects.count() == 1
+        assert not TokenBlacklist.objects.exists()
+
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {data['access']}")
+        sessions = api_client.get("/api/v1/users/sessions/")
+        assert sessions.status_code == 200
+        assert sessions.json()["results"][0]["is_current"] is True
+
+    def test_reused_handle_fails_after_grace_period(
+        self, settings, api_client, user_factory, obtain_tokens
+    ):
+        settings.ACCOUNTS_AUTH = {
+            "REFRESH_TOKEN_MODE": "opaque",
+            "REFRESH_GRACE_PERIOD": 0,
+        }
+        tokens = obtain_tokens(user_factory())
+        api_client.post(
+            "/api/v1/token/refresh/", {"refresh": tokens["refresh"]}, format="json"
+        )
+
+        reuse = api_client.post(
+            "/api/v1/token/refresh/", {"refresh": tokens["refresh"]}, format="json"
+        )
+        assert reuse.status_code == 401
+
+    def test_retry_within_grace_period_gets_same_pair(
+        self, api_client, user_factory, obtain_tokens
+    ):
+        tokens = obtain_tokens(user_factory())
+        first = api_client.post(
+            "/api/v1/token/refresh/", {"refresh": tokens["refresh"]}, format="json"
+        )
+        retry = api_client.post(
+            "/api/v1/token/refresh/", {"refresh": tokens["refresh"]}, format="json"
+        )
+
+        assert retry.status_code == 200
+        assert retry.json() == first.json()
+
+    def test_refresh_after_revocation_fails(
+        self, api_client, user_factory, obtain_tokens
+    ):
+        user = user_factory()
+        tokens = obtain_tokens(user)
+        user.revoke_tokens()
+
+        response = api_client.post(
+            "/api/v1/token/refresh/", {"refresh": tokens["refresh"]}, format="json"
+        )
+        assert response.status_code == 401
+
+    def test_logout_deletes_handle_and_revokes_session(
+        self, api_client, user_factory, obtain_tokens
+    ):
+        tokens = obtain_tokens(user_factory())
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+        response = api_client.post(
+            "/api/v1/users/logout/", {"refresh": tokens["refresh"]}, format="json"
+        )
+        assert response.json()["detail"] == "Successfully logged out"
+        assert not OpaqueRefreshToken.objects.exists()
+
+        # the access token of the session stops working as well
+        assert api_client.get("/api/v1/users/sessions/").status_code == 401
+
+        api_client.credentials()
+        refresh = api_client.post(
+            "/api/v1/token/refresh/", {"refresh": tokens["refresh"]}, format="json"
+        )
+        assert refresh.status_code == 401
+
+    def test_logout_with_unknown_handle(self, api_client, user_factory):
+        api_client.force_authenticate(user=user_factory())
+        response = api_client.post(
+            "/api/v1/users/logout/", {"refresh": "unknown"}, format="json"
+        )
+        assert response.json()["detail"] == "Token already blacklisted"
@@ -65,6 +65,27 @@ class TestUserViewSet:
         response = self.client.get(self.url)
         assert response.status_code == 200
 
+    def test_user_list_is_cursor_paginated_newest_first(
+        self, django_assert_num_queries
+    ):
+        self.client.force_authenticate(self.admin)
+        # count estimate, bounded count and the page
+        with django_assert_num_queries(3):
+            response = self.client.get(self.url, {"page_size": 2})
+        assert response.data["count"] == 3
+        assert response.data["count_is_estimate"] is False
+        assert [u["id"] for u in response.data["results"]] == [
+            str(self.other_user.id),
+            str(self.user.id),
+        ]
+
+        # later pages are only the page
+        with django_assert_num_queries(1):
+            response = self.client.get(response.data["next"])
+        assert "count" not in response.data
+        assert [u["id"] for u in response.data["results"]] == [str(self.admin.id)]
+        assert response.data["next"] is None
+
     def test_user_can_retrieve_own_profile(self):
         self.client.force_authenticate(self.user)
         response = self.client.get(f"{self.url}{self.user.id}/")
@@ -87,6 +108,7 @@ class TestUserViewSet:
 
         self.user.refresh_from_db()
         assert self.user.check_password("NewPass123!!!")
+        assert self.user.token_version == 1
 
     def test_wrong_old_password_in_password_change(self):
         self.client.force_authenticate(self.user)
@@ -185,3 +207,47 @@ class TestLogoutEndpoint:
         response = self.client.post(self.logout_url, {}, format="json")
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "refresh" in response.data
+
+
+@pytest.mark.django_db
+class TestUserSessionsEndpoint:
+    """Test listing and revoking the current user's sessions."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, user_factory, obtain_tokens):
+        self.client = api_client
+        self.user = user_factory()
+        self.tokens = obtain_tokens(self.user, HTTP_USER_AGENT="phone")
+        obtain_tokens(self.user, HTTP_USER_AGENT="laptop")
+        self.url = "/api/v1/users/sessions/"
+
+    def test_lists_active_sessions_most_recent_first(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}")
+        response = self.client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+        results = response.data["results"]
+        assert [s["user_agent"] for s in results] == ["laptop", "phone"]
+        assert [s["is_current"] for s in results] == [False, True]
+
+    def test_paginates_with_cursor(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.url, {"page_size": 1})
+        assert len(response.data["results"]) == 1
+        assert "cursor=" in response.data["next"]
+
+    def test_revoke_own_session(self):
+        self.client.force_authenticate(self.user)
+        session_id = RefreshToken(self.tokens["refresh"])["sid"]
+
+        response = self.client.delete(f"{self.url}{session_id}/")
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        response = self.client.get(self.url)
+        assert [s["user_agent"] for s in response.data["results"]] == ["laptop"]
+
+    def test_cannot_revoke_other_users_session(self, user_factory):
+        self.client.force_authenticate(user_factory())
+        session_id = RefreshToken(self.tokens["refresh"])["sid"]
+
+        response = self.client.delete(f"{self.url}{session_id}/")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -1,11 +1,16 @@
 import pytest
 from django.contrib.admin.sites import AdminSite
+from django.core.cache import cache
 from django.test import RequestFactory
 from pytest_factoryboy import register
 from rest_framework.test import APIClient
 
 from apps.accounts.admin import TokenBlacklistAdmin
 from apps.accounts.models import TokenBlacklist
+from apps.accounts.revocation.filter import blacklist_filter
+from apps.accounts.signing import keyring
+from apps.accounts.token_cache import verified_tokens
+from apps.accounts.user_cache import user_cache
 
 from .factories import TokenBlacklistFactory, UserFactory
 
@@ -31,6 +36,22 @@ def api_client():
     return APIClient()
 
 
+@pytest.fixture
+def obtain_tokens(api_client):
+    """Log a user in through the token endpoint and return the token pair."""
+
+    def _obtain(user, password="password1234", **extra):
+        response = api_client.post(
+            "/api/v1/token/",
+            {"email": user.email, "password": password},
+            format="json",
+            **extra,
+        )
+        return response.json()
+
+    return _obtain
+
+
 @pytest.fixture
 def admin_client(client, admin_user):
     """Django test client logged as admin."""
@@ -48,3 +69,13 @@ def request_factory():
 def token_blacklist_admin():
     """Instance of TokenBlackListAdmin for unit testing."""
     return TokenBlacklistAdmin(TokenBlacklist, AdminSite())
+
+
+@pytest.fixture(autouse=True)
+def reset_auth_caches():
+    """Start every test with an empty blacklist filter and cache."""
+    blacklist_filter.reset()
+    user_cache.clear()
+    verified_tokens.clear()
+    keyring.reset()
+    cache.clear()
@@ -7,6 +7,7 @@ from factory import fuzzy
 from factory.django import DjangoModelFactory
 
 from apps.accounts.models import TokenBlacklist, User
+from core.ids import uuid7
 
 
 class UserFactory(DjangoModelFactory):
@@ -14,7 +15,7 @@ class UserFactory(DjangoModelFactory):
         model = User
         skip_postgeneration_save = True
 
-    id = factory.LazyFunction(uuid4)
+    id = factory.LazyFunction(uuid7)
     email = factory.Faker("email")
     first_name = factory.Faker("first_name")
     last_name = factory.Faker("last_name")
@@ -37,6 +38,6 @@ class TokenBlacklistFactory(DjangoModelFactory):
         model = TokenBlacklist
 
     user = factory.SubFactory(UserFactory)
-    jti = factory.LazyFunction(lambda: uuid4().hex)
+    jti = factory.LazyFunction(uuid4)
     expires_at = factory.LazyFunction(lambda: timezone.now() + timedelta(days=30))
     reason = fuzzy.FuzzyChoice(["logout", "rotation", "revocation", "password_change"])
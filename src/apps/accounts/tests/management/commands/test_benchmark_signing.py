@@ -0,0 +1,12 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+
+def test_benchmark_reports_each_algorithm():
+    out = StringIO()
+    call_command("benchmark_signing", "--iterations=5", stdout=out)
+
+    lines = out.getvalue().splitlines()
+    assert [line.split(":")[0] for line in lines] == ["HS256", "RS256", "EdDSA"]
+    assert all("sign " in line and "verify " in line for line in lines)
@@ -0,0 +1,16 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from apps.accounts.token_cache import verified_tokens
+
+
+def test_benchmark_reports_both_runs():
+    out = StringIO()
+    call_command("benchmark_token_validation", "--iterations=50", stdout=out)
+
+    output = out.getvalue()
+    assert output.startswith("uncached: ")
+    assert "cached: " in output
+    assert "saved " in output
+    assert not verified_tokens._entries
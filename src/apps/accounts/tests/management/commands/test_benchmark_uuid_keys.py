@@ -0,0 +1,16 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+
+@pytest.mark.django_db
+def test_benchmark_reports_both_key_types():
+    out = StringIO()
+    call_command("benchmark_uuid_keys", "--rows=300", "--batch-size=100", stdout=out)
+
+    output = out.getvalue()
+    assert output.startswith("uuid4: 300 rows")
+    assert "uuid7: 300 rows" in output
+    assert "benchmark_uuid_keys_uuid7" not in connection.introspection.table_names()
@@ -3,9 +3,13 @@ from io import StringIO
 from uuid import uuid4
 
 import pytest
+from django.core.cache import cache
 from django.core.management import call_command
+from django.db import connection
 from django.utils import timezone
 
+from apps.accounts.management.commands import cleanup_tokens
+from apps.accounts.models import JobCheckpoint, OpaqueRefreshToken, UserSession
 from apps.accounts.models.jwt_token_blacklist import TokenBlacklist
 
 
@@ -22,15 +26,20 @@ class TestCleanupTokensCommand:
         """Generate a custom black list token."""
         return TokenBlacklist.objects.create(
             user=self.user,
-            jti="test_jti" + str(uuid4()),
+            jti=uuid4(),
             expires_at=timezone.now() + timedelta(expires_days),
             reason="logout",
         )
 
+    def analyze(self):
+        """Refresh the statistics the command's estimates are based on."""
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE accounts_tokenblacklist")
+
     def test_no_expired_tokens(self):
         self.create_blacklist_token(expires_days=7)  # valid token
 
-        call_command("cleanup_tokens", stdout=self.out)
+        call_command("cleanup_tokens", "--sleep=0", stdout=self.out)
 
         output = self.out.getvalue()
         assert "No expired tokens to clean up" in output
@@ -40,28 +49,115 @@ class TestCleanupTokensCommand:
         self.create_blacklist_token(expires_days=-1)  # expired
         self.create_blacklist_token(expires_days=-2)  # expired
         self.create_blacklist_token(expires_days=1)  # active
+        self.analyze()
 
         call_command("cleanup_tokens", "--dry-run", stdout=self.out)
 
         output = self.out.getvalue()
 
-        assert "[DRY RUN] Would delete 2 expired token entries" in output
-        assert "Total tokens in blacklist: 3" in output
+        assert "[DRY RUN] Would delete ~" in output
+        assert "Total tokens in blacklist: ~3" in output
         assert TokenBlacklist.objects.count() == 3  # nothing has been deleted
 
+    def test_dry_run_without_expired_tokens(self):
+        self.create_blacklist_token(expires_days=7)
+        self.analyze()
+
+        call_command("cleanup_tokens", "--dry-run", stdout=self.out)
+
+        assert "No expired tokens to clean up" in self.out.getvalue()
+
     def test_actual_cleanup_deletes_only_expired_tokens(self):
         expired1 = self.create_blacklist_token(expires_days=-5)
         expired2 = self.create_blacklist_token(expires_days=-1)
         active = self.create_blacklist_token(expires_days=3)
 
-        call_command("cleanup_tokens", stdout=self.out)
+        call_command("cleanup_tokens", "--sleep=0", stdout=self.out)
 
         output = self.out.getvalue()
-        assert "Successfully deleted 2 expired token entries" in output
-        assert "Total tokens in blacklist: 1" in output
+        assert "Successfully deleted ~2 expired token entries" in output
+        assert "rows/s" in output
+        assert "Total tokens in blacklist: ~" in output
 
         assert not TokenBlacklist.objects.filter(
             pk__in=[expired1.pk, expired2.pk]
         ).exists()
         assert TokenBlacklist.objects.filter(pk=active.pk).exists()
         assert TokenBlacklist.objects.count() == 1
+
+    def test_deletes_expired_opaque_tokens(self):
+        session = UserSession.objects.create(user=self.user, current_jti="jti")
+        OpaqueRefreshToken.issue(self.user.pk, session.pk, 0)
+        OpaqueRefreshToken.objects.update(expires_at=timezone.now())
+        kept = OpaqueRefreshToken.issue(self.user.pk, session.pk, 0)
+
+        call_command("cleanup_tokens", "--sleep=0", stdout=self.out)
+
+        assert "Deleted 1 expired opaque refresh tokens" in self.out.getvalue()
+        assert list(OpaqueRefreshToken.objects.values_list("pk", flat=True)) == [
+            OpaqueRefreshToken.hash(kept)
+        ]
+
+    def test_deletes_in_batches_and_clears_checkpoint(self):
+        for days in (-1, -2, -3):
+            self.create_blacklist_token(expires_days=days)
+
+        call_command("cleanup_tokens", "--batch-size=2", "--sleep=0", stdout=self.out)
+
+        output = self.out.getvalue()
+        assert output.count("Deleted 2 rows") == 1
+        assert output.count("Deleted 1 rows") == 1
+        assert "replication lag n/a" in output
+        assert not TokenBlacklist.objects.exists()
+        assert JobCheckpoint.load(cleanup_tokens.CHECKPOINT_NAME) is None
+
+    def test_resumes_from_checkpoint(self):
+        expired = self.create_blacklist_token(expires_days=-1)
+        later = self.create_blacklist_token(expires_days=-1)
+        # an interrupted run started before the second token expired
+        JobCheckpoint.store(
+            cleanup_tokens.CHECKPOINT_NAME,
+            {"now": expired.expires_at.isoformat(), "page": 0},
+        )
+        TokenBlacklist.objects.filter(pk=later.pk).update(
+            expires_at=expired.expires_at + timedelta(seconds=1)
+        )
+
+        call_command("cleanup_tokens", "--sleep=0", stdout=self.out)
+
+        assert "Resuming interrupted cleanup from page 0" in self.out.getvalue()
+        assert list(TokenBlacklist.objects.values_list("pk", flat=True)) == [later.pk]
+
+    def test_killed_run_resumes_in_a_new_process(self, monkeypatch):
+        for days in (-1, -2, -3):
+            self.create_blacklist_token(expires_days=days)
+
+        def interrupt(*args):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(cleanup_tokens.Command, "wait_for_replicas", interrupt)
+        with pytest.raises(KeyboardInterrupt):
+            call_command("cleanup_tokens", "--batch-size=2", stdout=self.out)
+        assert TokenBlacklist.objects.count() == 1
+        assert JobCheckpoint.load(cleanup_tokens.CHECKPOINT_NAME)["page"] >= 0
+        monkeypatch.undo()
+        # a new process starts with nothing in its local cache
+        cache.clear()
+
+        call_command("cleanup_tokens", "--batch-size=2", "--sleep=0", stdout=self.out)
+
+        assert "Resuming interrupted cleanup from page" in self.out.getvalue()
+        assert not TokenBlacklist.objects.exists()
+        assert JobCheckpoint.load(cleanup_tokens.CHECKPOINT_NAME) is None
+
+    def test_waits_for_lagging_replicas(self, monkeypatch):
+        self.create_blacklist_token(expires_days=-1)
+        lags = iter([5.0, 0.5])
+        monkeypatch.setattr(cleanup_tokens, "replication_lag", lambda: next(lags))
+        monkeypatch.setattr(cleanup_tokens.time, "sleep", lambda seconds: None)
+
+        call_command("cleanup_tokens", "--max-lag=1", "--sleep=0", stdout=self.out)
+
+        output = self.out.getvalue()
+        assert "Replication lag 5.0s, waiting" in output
+        assert "replication lag 0.5s" in output
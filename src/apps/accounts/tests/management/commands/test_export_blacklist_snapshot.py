@@ -0,0 +1,41 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from core.jti_snapshot import JTISnapshot
+
+
+@pytest.mark.django_db
+class TestExportBlacklistSnapshotCommand:
+    """Test the export_blacklist_snapshot management command."""
+
+    def test_exports_unexpired_entries(self, tmp_path, token_blacklist_factory):
+        active = token_blacklist_factory.create_batch(3)
+        expired = token_blacklist_factory(
+            expires_at=timezone.now() - timezone.timedelta(days=1)
+        )
+        path = tmp_path / "blacklist.snap"
+        out = StringIO()
+        call_command("export_blacklist_snapshot", f"--path={path}", stdout=out)
+
+        snapshot = JTISnapshot(path)
+        assert len(snapshot) == 3
+        assert all(entry.jti in snapshot for entry in active)
+        assert expired.jti not in snapshot
+        assert snapshot.max_expiry == int(
+            max(entry.expires_at for entry in active).timestamp()
+        )
+        assert f"Wrote 3 jtis to {path}" in out.getvalue()
+
+    def test_path_from_backend_options(self, settings, tmp_path):
+        path = tmp_path / "blacklist.snap"
+        settings.ACCOUNTS_AUTH = {"BLACKLIST_BACKEND_OPTIONS": {"path": str(path)}}
+        call_command("export_blacklist_snapshot", stdout=StringIO())
+        assert len(JTISnapshot(path)) == 0
+
+    def test_requires_a_path(self):
+        with pytest.raises(CommandError):
+            call_command("export_blacklist_snapshot", stdout=StringIO())
@@ -0,0 +1,78 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from apps.accounts.models import SigningKey
+from apps.accounts.signing import keyring
+from apps.accounts.token_cache import verified_tokens
+from apps.accounts.tokens import AccessToken
+
+
+@pytest.mark.django_db
+class TestRotateSigningKeysCommand:
+    """Test the rotate_signing_keys management command."""
+
+    def test_requires_an_algorithm(self):
+        with pytest.raises(CommandError):
+            call_command("rotate_signing_keys", stdout=StringIO())
+
+    def test_first_key_signs_immediately(self):
+        out = StringIO()
+        call_command("rotate_signing_keys", "--algorithm=EdDSA", stdout=out)
+
+        key = SigningKey.objects.get()
+        assert key.activates_at <= timezone.now()
+        assert f"Created EdDSA key {key.kid}" in out.getvalue()
+
+    def test_new_key_waits_for_jwks_caches(self, settings):
+        settings.ACCOUNTS_AUTH = {"SIGNING_ALGORITHM": "EdDSA", "JWKS_MAX_AGE": 600}
+        current = SigningKey.generate("EdDSA")
+        call_command("rotate_signing_keys", stdout=StringIO())
+
+        new = SigningKey.objects.exclude(kid=current.kid).get()
+        assert new.activates_at > timezone.now() + timedelta(seconds=590)
+
+    def test_immediately(self, settings):
+        settings.ACCOUNTS_AUTH = {"SIGNING_ALGORITHM": "EdDSA"}
+        current = SigningKey.generate("EdDSA")
+        call_command("rotate_signing_keys", "--immediately", stdout=StringIO())
+
+        new = SigningKey.objects.exclude(kid=current.kid).get()
+        assert new.activates_at <= timezone.now()
+
+    def test_removes_expired_keys(self):
+        now = timezone.now()
+        old = SigningKey.generate("EdDSA", now - timedelta(days=30))
+        previous = SigningKey.generate("EdDSA", now - timedelta(days=20))
+        out = StringIO()
+        call_command("rotate_signing_keys", "--algorithm=EdDSA", stdout=out)
+
+        assert not SigningKey.objects.filter(kid=old.kid).exists()
+        assert SigningKey.objects.filter(kid=previous.kid).exists()
+        assert "Removed 1 expired keys" in out.getvalue()
+
+    def test_revoke(self, settings):
+        settings.ACCOUNTS_AUTH = {"SIGNING_ALGORITHM": "EdDSA", "JWKS_MAX_AGE": 600}
+        compromised = SigningKey.generate("EdDSA")
+        token = AccessToken()
+        raw = str(token).encode()
+        verified_tokens.add(raw, token)
+        out = StringIO()
+        call_command("rotate_signing_keys", f"--revoke={compromised.kid}", stdout=out)
+
+        new = SigningKey.objects.get()
+        assert new.kid != compromised.kid
+        assert new.activates_at <= timezone.now()
+        assert f"Revoked key {compromised.kid}" in out.getvalue()
+        assert verified_tokens.get(raw) is None
+        published = {key["kid"] for key in keyring.jwks()["keys"]}
+        assert published == {new.kid}
+
+    def test_revoke_unknown_key(self, settings):
+        settings.ACCOUNTS_AUTH = {"SIGNING_ALGORITHM": "EdDSA"}
+        with pytest.raises(CommandError):
+            call_command("rotate_signing_keys", "--revoke=unknown", stdout=StringIO())
@@ -1,3 +1,5 @@
+from uuid import uuid4
+
 import pytest
 from django.db import IntegrityError
 from django.utils import timezone
@@ -11,7 +13,7 @@ class TestTokenBlacklistModel:
 
     def test_blacklist_token_creation_and_str(self, user_factory):
         user = user_factory()
-        jti = "test-jti-1"
+        jti = uuid4().hex
         exp = timezone.now() + timezone.timedelta(days=1)
         exp_timestamp = int(exp.timestamp())
         entry = TokenBlacklist.blacklist_token(
@@ -25,16 +27,19 @@ class TestTokenBlacklistModel:
 
     def test_is_blacklisted_true_false(self, user_factory):
         user = user_factory()
-        jti = "test-jti-2"
+        jti = uuid4().hex
         exp = timezone.now() + timezone.timedelta(days=1)
         exp_timestamp = int(exp.timestamp())
         assert not TokenBlacklist.is_blacklisted(jti)
         TokenBlacklist.blacklist_token(user=user, jti=jti, exp_timestamp=exp_timestamp)
         assert TokenBlacklist.is_blacklisted(jti)
 
+    def test_is_blacklisted_with_malformed_jti(self):
+        assert not TokenBlacklist.is_blacklisted("not-a-uuid")
+
     def test_duplicate_blacklist_prevention(self, user_factory):
         user = user_factory()
-        jti = "test-jti-3"
+        jti = uuid4().hex
         exp = timezone.now() + timezone.timedelta(days=1)
         exp_timestamp = int(exp.timestamp())
         TokenBlacklist.blacklist_token(user=user, jti=jti, exp_timestamp=exp_timestamp)
@@ -48,16 +53,31 @@ class TestTokenBlacklistModel:
         # expired
         past_exp = timezone.now() - timezone.timedelta(days=1)
         past_exp_timestamp = int(past_exp.timestamp())
+        expired_jti, valid_jti = uuid4().hex, uuid4().hex
         TokenBlacklist.blacklist_token(
-            user=user, jti="expired-jti", exp_timestamp=past_exp_timestamp
+            user=user, jti=expired_jti, exp_timestamp=past_exp_timestamp
         )
         # valid
         future_exp = timezone.now() + timezone.timedelta(days=7)
         future_exp_timestamp = int(future_exp.timestamp())
         TokenBlacklist.blacklist_token(
-            user=user, jti="valid-jti", exp_timestamp=future_exp_timestamp
+            user=user, jti=valid_jti, exp_timestamp=future_exp_timestamp
         )
         deleted_count, _ = TokenBlacklist.cleanup_expired()
         assert deleted_count >= 1
-        assert not TokenBlacklist.is_blacklisted("expired-jti")
-        assert TokenBlacklist.is_blacklisted("valid-jti")
+        assert not TokenBlacklist.is_blacklisted(expired_jti)
+        assert TokenBlacklist.is_blacklisted(valid_jti)
+
+    def test_claim_is_insert_if_absent(self, user_factory, django_assert_num_queries):
+        user = user_factory()
+        exp_timestamp = int((timezone.now() + timezone.timedelta(days=1)).timestamp())
+
+        jti = uuid4().hex
+
+        with django_assert_num_queries(1):
+            assert TokenBlacklist.claim(jti, exp_timestamp, user.pk) is True
+        assert TokenBlacklist.claim(jti, exp_timestamp, user.pk) is False
+
+        entry = TokenBlacklist.objects.get(jti=jti)
+        assert entry.user == user
+        assert entry.reason == "logout"
@@ -0,0 +1,62 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.accounts.models import OpaqueRefreshToken, UserSession
+
+
+@pytest.mark.django_db
+class TestOpaqueRefreshTokenModel:
+    """Test OpaqueRefreshToken model functionality."""
+
+    def test_issue_stores_only_the_hash(self, user_factory):
+        user = user_factory()
+        session = UserSession.objects.create(user=user, current_jti="jti")
+        raw = OpaqueRefreshToken.issue(user.pk, session.pk, 3)
+
+        stored = OpaqueRefreshToken.objects.get()
+        assert stored.token_hash == OpaqueRefreshToken.hash(raw)
+        assert raw not in stored.token_hash
+        assert stored.token_version == 3
+        assert str(user.pk) in str(stored)
+
+    def test_consume_is_single_use(self, user_factory):
+        user = user_factory()
+        session = UserSession.objects.create(user=user, current_jti="jti")
+        raw = OpaqueRefreshToken.issue(user.pk, session.pk, 0)
+
+        assert OpaqueRefreshToken.consume(raw) == (user.pk, session.pk, 0)
+        assert OpaqueRefreshToken.consume(raw) is None
+        assert OpaqueRefreshToken.consume("unknown") is None
+
+    def test_expired_handles_are_rejected_and_cleaned_up(self, user_factory):
+        user = user_factory()
+        session = UserSession.objects.create(user=user, current_jti="jti")
+        raw = OpaqueRefreshToken.issue(user.pk, session.pk, 0)
+        OpaqueRefreshToken.objects.update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        assert OpaqueRefreshToken.consume(raw) is None
+        deleted, _ = OpaqueRefreshToken.cleanup_expired()
+        assert deleted == 1
+
+    def test_cleanup_deletes_in_batches(self, user_factory, monkeypatch):
+        user = user_factory()
+        session = UserSession.objects.create(user=user, current_jti="jti")
+        for _ in range(5):
+            OpaqueRefreshToken.issue(user.pk, session.pk, 0)
+        OpaqueRefreshToken.objects.update(expires_at=timezone.now())
+        kept = OpaqueRefreshToken.issue(user.pk, session.pk, 0)
+        pauses = []
+        monkeypatch.setattr(time, "sleep", pauses.append)
+
+        deleted, _ = OpaqueRefreshToken.cleanup_expired(batch_size=2, pause=0.5)
+
+        assert deleted == 5
+        assert pauses == [0.5, 0.5]
+        assert list(OpaqueRefreshToken.objects.values_list("pk", flat=True)) == [
+            OpaqueRefreshToken.hash(kept)
+        ]
@@ -96,3 +96,20 @@ def test_create_batch_users(user_factory):
     users = user_factory.create_batch(5)
     assert User.objects.count() == 5
     assert all(user.is_active for user in users)
+
+
+@pytest.mark.django_db
+def test_revoke_tokens_bumps_token_version(user_factory):
+    """revoke_tokens should bump the version in the database and on the instance."""
+    user = user_factory()
+    assert user.token_version == 0
+    user.revoke_tokens()
+    assert user.token_version == 1
+    assert User.objects.get(pk=user.pk).token_version == 1
+
+
+@pytest.mark.django_db
+def test_user_ids_are_time_ordered(user_factory):
+    users = user_factory.create_batch(5)
+    assert all(user.id.version == 7 for user in users)
+    assert [user.id for user in users] == sorted(user.id for user in users)
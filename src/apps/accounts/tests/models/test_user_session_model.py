@@ -0,0 +1,22 @@
+import pytest
+
+from apps.accounts.models import UserSession
+
+
+@pytest.mark.django_db
+class TestUserSessionModel:
+    """Test UserSession model functionality."""
+
+    def test_revoke_active_session(self, user_factory):
+        session = UserSession.objects.create(user=user_factory())
+        assert not session.is_revoked
+        assert UserSession.revoke(session.id) is True
+
+        session.refresh_from_db()
+        assert session.is_revoked
+        assert str(session.user_id) in str(session)
+
+    def test_revoke_twice_reports_already_revoked(self, user_factory):
+        session = UserSession.objects.create(user=user_factory())
+        UserSession.revoke(session.id)
+        assert UserSession.revoke(session.id) is False
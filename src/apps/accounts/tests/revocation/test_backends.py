@@ -0,0 +1,204 @@
+import time
+from uuid import uuid4
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.models.jwt_token_blacklist import TokenBlacklist
+from apps.accounts.revocation.backends import (
+    DatabaseBlacklistBackend,
+    InMemoryBlacklistBackend,
+    RedisBlacklistBackend,
+    SnapshotBlacklistBackend,
+    get_blacklist_backend,
+)
+from apps.accounts.revocation.snapshot import export_snapshot
+
+
+class LocalRedis:
+    """In-process stand-in for the subset of the redis client the backend uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def _alive(self, key):
+        value = self.data.get(key)
+        if value is None or value[1] <= time.time():
+            self.data.pop(key, None)
+            return False
+        return True
+
+    def set(self, name, value, ex=None, nx=False):
+        if nx and self._alive(name):
+            return None
+        self.data[name] = (value, time.time() + ex)
+        return True
+
+    def exists(self, *names):
+        return sum(self._alive(name) for name in names)
+
+
+@pytest.fixture(params=["database", "memory", "redis", "snapshot"])
+def backend(request):
+    if request.param == "database":
+        request.getfixturevalue("db")
+        return DatabaseBlacklistBackend()
+    if request.param == "snapshot":
+        request.getfixturevalue("db")
+        path = request.getfixturevalue("tmp_path") / "blacklist.snap"
+        export_snapshot(path)
+        return SnapshotBlacklistBackend(path)
+    if request.param == "memory":
+        return InMemoryBlacklistBackend()
+    return RedisBlacklistBackend(client=LocalRedis())
+
+
+@pytest.fixture
+def user_id(backend, request):
+    """Owner id for entries, only the database backend needs a real user."""
+    if isinstance(backend, DatabaseBlacklistBackend):
+        return request.getfixturevalue("user_factory")().pk
+    return None
+
+
+class TestBlacklistBackends:
+    """Run the same contract against every backend."""
+
+    def test_blacklist_and_lookup(self, backend, user_id):
+        exp = int(time.time()) + 3600
+        jti, other = uuid4().hex, uuid4().hex
+
+        assert not backend.is_blacklisted(jti)
+        assert backend.blacklist_token(jti, exp, user_id) is True
+        assert backend.blacklist_token(jti, exp, user_id) is False
+        assert backend.is_blacklisted(jti)
+        assert not backend.is_blacklisted(other)
+
+    def test_blacklisted_among(self, backend, user_id):
+        exp = int(time.time()) + 3600
+        first, second, other = uuid4().hex, uuid4().hex, uuid4().hex
+        backend.blacklist_token(first, exp, user_id)
+        backend.blacklist_token(second, exp, user_id)
+
+        found = backend.blacklisted_among([first, second, other, "not-a-uuid"])
+        assert found == {first, second}
+
+    def test_expired_entries_are_not_reported(self, backend, user_id):
+        jti = uuid4().hex
+        backend.blacklist_token(jti, int(time.time()) - 10, user_id)
+        backend.cleanup_expired()
+        assert not backend.is_blacklisted(jti)
+
+
+class TestInMemoryBlacklistBackend:
+    def test_cleanup_expired_returns_count(self):
+        backend = InMemoryBlacklistBackend()
+        backend.blacklist_token("old", int(time.time()) - 10, None)
+        backend.blacklist_token("new", int(time.time()) + 10, None)
+        assert backend.cleanup_expired() == 1
+        assert backend.is_blacklisted("new")
+
+
+class TestRedisBlacklistBackend:
+    def test_sets_ttl_from_token_expiry(self):
+        client = LocalRedis()
+        backend = RedisBlacklistBackend(client=client, key_prefix="bl:")
+        backend.blacklist_token("jti", int(time.time()) + 60, None, reason="logout")
+        value, expires = client.data["bl:jti"]
+        assert value == "logout"
+        assert 50 < expires - time.time() <= 60
+        assert backend.cleanup_expired() == 0
+
+    def test_requires_client_or_url(self):
+        with pytest.raises(ImproperlyConfigured):
+            RedisBlacklistBackend()
+
+
+@pytest.mark.django_db
+class TestSnapshotBlacklistBackend:
+    @pytest.fixture
+    def path(self, tmp_path):
+        return tmp_path / "blacklist.snap"
+
+    def test_falls_back_to_database_without_file(self, path, token_blacklist_factory):
+        entry = token_blacklist_factory()
+        backend = SnapshotBlacklistBackend(path)
+        assert backend.is_blacklisted(entry.jti)
+        assert not backend.is_blacklisted(uuid4())
+
+    def test_lookups_make_no_query(
+        self, path, token_blacklist_factory, django_assert_num_queries
+    ):
+        entries = token_blacklist_factory.create_batch(3)
+        export_snapshot(path)
+        backend = SnapshotBlacklistBackend(path)
+        backend.is_blacklisted(uuid4())
+
+        with django_assert_num_queries(0):
+            assert all(backend.is_blacklisted(entry.jti.hex) for entry in entries)
+            assert not backend.is_blacklisted(uuid4().hex)
+            assert not backend.is_blacklisted("not-a-uuid")
+
+    def test_entries_after_snapshot_are_pulled(
+        self, settings, path, token_blacklist_factory
+    ):
+        settings.ACCOUNTS_AUTH = {"BLACKLIST_FILTER_SYNC_INTERVAL": 0}
+        export_snapshot(path)
+        backend = SnapshotBlacklistBackend(path)
+        assert not backend.is_blacklisted(uuid4())
+
+        # blacklisted by another worker after the export
+        entry = token_blacklist_factory()
+        assert backend.is_blacklisted(entry.jti)
+
+    def test_new_snapshot_is_picked_up(self, settings, path, token_blacklist_factory):
+        settings.ACCOUNTS_AUTH = {"BLACKLIST_FILTER_SYNC_INTERVAL": 0}
+        export_snapshot(path)
+        backend = SnapshotBlacklistBackend(path)
+        backend.is_blacklisted(uuid4())
+        entry = token_blacklist_factory()
+
+        export_snapshot(path)
+        assert backend.is_blacklisted(entry.jti)
+        assert entry.jti in backend._snapshot
+
+
+@pytest.mark.django_db
+class TestBackendSelection:
+    def test_default_is_database_backend(self):
+        assert isinstance(get_blacklist_backend(), DatabaseBlacklistBackend)
+
+    def test_backend_follows_settings(self, settings):
+        settings.ACCOUNTS_AUTH = {
+            "BLACKLIST_BACKEND": (
+                "apps.accounts.revocation.backends.InMemoryBlacklistBackend"
+            )
+        }
+        assert isinstance(get_blacklist_backend(), InMemoryBlacklistBackend)
+
+    def test_database_backend_without_filter(self, settings, token_blacklist_factory):
+        settings.ACCOUNTS_AUTH = {"BLACKLIST_FILTER_ENABLED": False}
+        entry = token_blacklist_factory()
+        backend = get_blacklist_backend()
+        assert backend.is_blacklisted(entry.jti)
+        assert not backend.is_blacklisted("unknown")
+        assert TokenBlacklist.objects.count() == 1
+
+    def test_logout_goes_through_configured_backend(
+        self, settings, api_client, user_factory
+    ):
+        settings.ACCOUNTS_AUTH = {
+            "BLACKLIST_BACKEND": (
+                "apps.accounts.revocation.backends.InMemoryBlacklistBackend"
+            )
+        }
+        user = user_factory()
+        refresh = RefreshToken.for_user(user)
+        api_client.force_authenticate(user=user)
+        api_client.post(
+            "/api/v1/users/logout/", {"refresh": str(refresh)}, format="json"
+        )
+
+        assert get_blacklist_backend().is_blacklisted(refresh["jti"])
+        assert not TokenBlacklist.objects.exists()
@@ -0,0 +1,113 @@
+from uuid import uuid4
+
+import pytest
+from django.utils import timezone
+
+from apps.accounts.models.jwt_token_blacklist import TokenBlacklist
+from apps.accounts.revocation.filter import BlacklistFilter
+from core.bloom import BloomFilter
+
+
+class TestBloomFilter:
+    """Test the bloom filter data structure."""
+
+    def test_added_items_are_always_found(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f"jti-{i}" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+        assert all(item in bloom for item in items)
+
+    def test_false_positive_rate_close_to_target(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"jti-{i}")
+        false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+        assert false_positives < 300
+
+    def test_duplicate_add_is_not_counted(self):
+        bloom = BloomFilter(capacity=10)
+        bloom.add("a")
+        bloom.add("a")
+        assert len(bloom) == 1
+
+    def test_is_full(self):
+        bloom = BloomFilter(capacity=2)
+        for item in ["a", "b", "c"]:
+            bloom.add(item)
+        assert bloom.is_full
+
+    @pytest.mark.parametrize(
+        "capacity,error_rate", [(0, 0.01), (10, 0), (10, 1)], ids=str
+    )
+    def test_invalid_arguments(self, capacity, error_rate):
+        with pytest.raises(ValueError):
+            BloomFilter(capacity, error_rate)
+
+
+@pytest.mark.django_db
+class TestBlacklistFilter:
+    """Test the per-worker blacklist filter."""
+
+    def test_rebuild_loads_only_unexpired_entries(self, token_blacklist_factory):
+        active = token_blacklist_factory()
+        token_blacklist_factory(expires_at=timezone.now() - timezone.timedelta(days=1))
+
+        bl_filter = BlacklistFilter()
+        assert bl_filter.is_blacklisted(active.jti)
+        assert bl_filter.stats()["entries"] == 1
+
+    def test_negative_lookup_does_not_query_db(
+        self, token_blacklist_factory, django_assert_num_queries
+    ):
+        token_blacklist_factory()
+        bl_filter = BlacklistFilter()
+        bl_filter.is_blacklisted("warm-up")
+
+        with django_assert_num_queries(0):
+            assert not bl_filter.is_blacklisted("not-blacklisted")
+        assert bl_filter.stats()["negatives"] >= 1
+
+    def test_blacklisted_among_checks_maybes_in_one_query(
+        self, token_blacklist_factory, django_assert_num_queries
+    ):
+        entries = token_blacklist_factory.create_batch(3)
+        bl_filter = BlacklistFilter()
+        bl_filter.is_blacklisted("warm-up")
+        jtis = [entry.jti.hex for entry in entries] + ["not-blacklisted"]
+
+        with django_assert_num_queries(1):
+            assert bl_filter.blacklisted_among(jtis) == set(jtis[:3])
+        assert bl_filter.stats()["hits"] == 3
+
+    def test_sync_pulls_entries_from_other_workers(
+        self, settings, token_blacklist_factory
+    ):
+        settings.ACCOUNTS_AUTH = {"BLACKLIST_FILTER_SYNC_INTERVAL": 0}
+        bl_filter = BlacklistFilter()
+        late_jti = uuid4().hex
+        assert not bl_filter.is_blacklisted(late_jti)
+
+        # written without going through this worker's filter
+        TokenBlacklist.objects.bulk_create(
+            [
+                TokenBlacklist(
+                    user=token_blacklist_factory().user,
+                    jti=late_jti,
+                    expires_at=timezone.now() + timezone.timedelta(days=1),
+                )
+            ]
+        )
+        assert bl_filter.is_blacklisted(late_jti)
+
+    def test_counts_false_positives(self, token_blacklist_factory):
+        entry = token_blacklist_factory()
+        bl_filter = BlacklistFilter()
+        bl_filter.is_blacklisted("warm-up")
+        bl_filter.add("rolled-back-jti")
+
+        assert not bl_filter.is_blacklisted("rolled-back-jti")
+        assert bl_filter.is_blacklisted(entry.jti)
+        stats = bl_filter.stats()
+        assert stats["false_positives"] == 1
+        assert stats["hits"] == 1
@@ -0,0 +1,120 @@
+import queue
+import uuid
+
+import pytest
+from django.db import connection
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.revocation import listener
+from apps.accounts.revocation.backends import get_blacklist_backend
+from apps.accounts.revocation.listener import (
+    RevocationListener,
+    apply_notification,
+    start_revocation_listener,
+    stop_revocation_listener,
+)
+from apps.accounts.revocation.notify import notify
+from apps.accounts.revocation.sessions import is_session_revoked, start_session
+from apps.accounts.user_cache import user_cache
+
+
+@pytest.mark.django_db
+class TestApplyNotification:
+    def test_session_is_revoked_without_a_query(
+        self, user_factory, django_assert_num_queries
+    ):
+        user = user_factory()
+        session = start_session(RefreshToken.for_user(user), user)
+        assert not is_session_revoked(session.id)
+
+        apply_notification(f"session:{session.id}")
+        with django_assert_num_queries(0):
+            assert is_session_revoked(session.id)
+
+    def test_user_is_reloaded(self, user_factory, django_assert_num_queries):
+        user = user_factory()
+        user_cache.get(user.pk)
+
+        apply_notification(f"user:{user.pk}")
+        with django_assert_num_queries(1):
+            user_cache.get(user.pk)
+
+    def test_jti_reaches_the_filter(self, django_assert_num_queries):
+        jti = uuid.uuid4().hex
+        backend = get_blacklist_backend()
+        assert not backend.is_blacklisted(jti)
+
+        apply_notification(f"jti:{jti}")
+        # the filter now answers maybe and asks the database
+        with django_assert_num_queries(1):
+            backend.is_blacklisted(jti)
+
+    def test_unknown_kind_is_ignored(self):
+        apply_notification("nonsense")
+
+    def test_disabled_notify_does_not_query(self, settings, django_assert_num_queries):
+        settings.ACCOUNTS_AUTH = {"REVOCATION_NOTIFY": False}
+        with django_assert_num_queries(0):
+            notify("user", 1)
+
+
+def wait_for(received, payload):
+    """Return True once payload arrives, skipping others, False after 5s."""
+    try:
+        while received.get(timeout=5) != payload:
+            pass
+    except queue.Empty:
+        return False
+    return True
+
+
+@pytest.fixture
+def running_listener():
+    received = queue.Queue()
+    reconnects = queue.Queue()
+    background = RevocationListener(
+        handler=received.put, on_reconnect=lambda: reconnects.put(True)
+    )
+    background.start()
+    assert background.listening.wait(5)
+    yield background, received, reconnects
+    background.stop(timeout=5)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRevocationListener:
+    def test_receives_committed_revocations(self, running_listener, user_factory):
+        _background, received, _reconnects = running_listener
+        user = user_factory()
+        assert wait_for(received, f"user:{user.pk}")
+
+        access = RefreshToken.for_user(user).access_token
+        get_blacklist_backend().blacklist_token(access["jti"], access["exp"], user.pk)
+        assert wait_for(received, f"jti:{access['jti']}")
+
+        user.revoke_tokens()
+        assert wait_for(received, f"user:{user.pk}")
+
+    def test_resyncs_after_reconnect(self, running_listener):
+        background, received, reconnects = running_listener
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                "WHERE query LIKE 'LISTEN %%' AND pid <> pg_backend_pid()"
+            )
+        assert reconnects.get(timeout=10)
+        assert background.listening.wait(5)
+
+        notify("session", "abc")
+        assert wait_for(received, "session:abc")
+
+    def test_start_and_stop_process_listener(self, settings, monkeypatch):
+        monkeypatch.setattr(listener, "revocation_listener", None)
+        started = start_revocation_listener()
+        assert start_revocation_listener() is started
+        stop_revocation_listener()
+        assert not started._thread.is_alive()
+
+        settings.ACCOUNTS_AUTH = {"REVOCATION_NOTIFY": False}
+        monkeypatch.setattr(listener, "revocation_listener", None)
+        assert start_revocation_listener() is None
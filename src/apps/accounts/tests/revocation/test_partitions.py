@@ -0,0 +1,92 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from apps.accounts.models.jwt_token_blacklist import TokenBlacklist
+from apps.accounts.revocation.partitions import (
+    DEFAULT_PARTITION,
+    PARTITION_PREFIX,
+    delete_expired_rows,
+    drop_expired_partitions,
+    ensure_partitions,
+    list_partitions,
+)
+
+
+def partition_of(entry):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT tableoid::regclass::text FROM accounts_tokenblacklist WHERE jti = %s",
+            [entry.pk],
+        )
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+class TestBlacklistPartitions:
+    def test_partitions_cover_the_refresh_lifetime(self):
+        ensure_partitions()
+        today = timezone.now().astimezone(UTC)
+
+        partitions = list_partitions()
+        assert partitions[0] == f"{PARTITION_PREFIX}{today:%Y%m%d}"
+        assert f"{PARTITION_PREFIX}{today + timedelta(days=7):%Y%m%d}" in partitions
+        assert ensure_partitions() == []
+
+    def test_entries_are_routed_by_expiry(self, token_blacklist_factory):
+        expires_at = timezone.now() + timedelta(hours=1)
+        entry = token_blacklist_factory(expires_at=expires_at)
+        far = token_blacklist_factory(expires_at=timezone.now() + timedelta(days=90))
+
+        assert partition_of(entry) == (
+            f"{PARTITION_PREFIX}{expires_at.astimezone(UTC):%Y%m%d}"
+        )
+        assert partition_of(far) == DEFAULT_PARTITION
+
+    def test_new_partition_takes_over_rows_from_default(self, token_blacklist_factory):
+        later = timezone.now() + timedelta(days=90)
+        entry = token_blacklist_factory(expires_at=later)
+
+        created = ensure_partitions(now=later - timedelta(days=1))
+
+        assert f"{PARTITION_PREFIX}{later.astimezone(UTC):%Y%m%d}" in created
+        assert partition_of(entry) != DEFAULT_PARTITION
+        assert TokenBlacklist.objects.filter(pk=entry.pk).exists()
+
+    def test_hourly_partitions_skip_ranges_already_covered(self, settings):
+        settings.ACCOUNTS_AUTH = {"BLACKLIST_PARTITION_INTERVAL": "hour"}
+        now = datetime(2099, 1, 1, 22, 30, tzinfo=UTC)
+
+        created = ensure_partitions(now=now)
+
+        assert created[0] == f"{PARTITION_PREFIX}2099010122"
+        assert all(len(name) == len(created[0]) for name in created)
+        # the daily partitions created by the migration are left alone
+        assert not any(name.endswith("2099010122") for name in ensure_partitions(now))
+
+    def test_drop_expired_partitions(self, token_blacklist_factory):
+        now = timezone.now()
+        soon = token_blacklist_factory(expires_at=now + timedelta(hours=1))
+        kept = token_blacklist_factory(expires_at=now + timedelta(days=5))
+        partition = partition_of(soon)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE accounts_tokenblacklist")
+
+        removed = drop_expired_partitions(now=now + timedelta(days=2))
+
+        assert removed == 1
+        assert partition not in list_partitions()
+        assert list(TokenBlacklist.objects.values_list("pk", flat=True)) == [kept.pk]
+
+    def test_delete_expired_rows_in_batches(self, token_blacklist_factory):
+        now = timezone.now()
+        for days in (1, 2, 3):
+            token_blacklist_factory(expires_at=now - timedelta(days=days))
+        kept = token_blacklist_factory()
+
+        batches = list(delete_expired_rows(now, batch_size=2))
+
+        assert [deleted for deleted, _ in batches] == [2, 1]
+        assert list(TokenBlacklist.objects.values_list("pk", flat=True)) == [kept.pk]
@@ -0,0 +1,156 @@
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from apps.accounts.models import OpaqueRefreshToken, UserSession
+from apps.accounts.models.jwt_token_blacklist import TokenBlacklist
+from apps.accounts.revocation import scheduler
+from apps.accounts.revocation.scheduler import (
+    CleanupScheduler,
+    run_cleanup,
+    run_cleanup_in_background,
+    start_cleanup_scheduler,
+    stop_cleanup_scheduler,
+)
+
+
+def in_other_connection(func):
+    """Run func in a thread, which gets its own database connection."""
+
+    def target():
+        try:
+            func()
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+
+
+def advisory_locks_held():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM pg_locks "
+            "WHERE locktype = 'advisory' AND pid = pg_backend_pid()"
+        )
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+class TestCleanupScheduler:
+    def test_only_the_leader_runs_the_job(self):
+        runs = []
+        leader = CleanupScheduler(60, job=lambda: runs.append("leader"))
+        follower = CleanupScheduler(60, job=lambda: runs.append("follower"))
+
+        leader.tick()
+        in_other_connection(follower.tick)
+        assert runs == ["leader"]
+        assert leader.is_leader
+        assert not follower.is_leader
+
+        leader.resign()
+        in_other_connection(lambda: (follower.tick(), follower.resign()))
+        assert runs == ["leader", "follower"]
+
+    def test_leader_keeps_a_single_lock_hold(self):
+        leader = CleanupScheduler(60, job=lambda: None)
+        leader.tick()
+        leader.tick()
+        assert advisory_locks_held() == 1
+
+        leader.resign()
+        assert advisory_locks_held() == 0
+
+    def test_failing_job_gives_up_leadership(self):
+        def job():
+            raise RuntimeError("boom")
+
+        failing = CleanupScheduler(60, job=job)
+        failing.tick()
+        assert not failing.is_leader
+
+    def test_thread_runs_job_on_interval(self):
+        ran = threading.Event()
+        background = CleanupScheduler(0.01, job=ran.set)
+
+        background.start()
+        background.start()
+        assert ran.wait(5)
+        background.stop(timeout=5)
+        assert not background._thread.is_alive()
+
+    def test_stop_does_not_wait_for_a_stuck_job(self, monkeypatch):
+        running, release = threading.Event(), threading.Event()
+
+        def job():
+            running.set()
+            release.wait(10)
+
+        stuck = CleanupScheduler(0.01, job=job)
+        monkeypatch.setattr(scheduler, "cleanup_scheduler", stuck)
+        stuck.start()
+        assert running.wait(5)
+
+        started = time.monotonic()
+        stop_cleanup_scheduler(timeout=0.1)
+        assert time.monotonic() - started < 5
+        assert stuck._thread.is_alive()
+
+        release.set()
+        stuck._thread.join(5)
+
+    def test_run_cleanup_in_background(self):
+        ran = threading.Event()
+        run_cleanup_in_background(job=ran.set).join(5)
+        assert ran.is_set()
+
+    def test_background_run_skips_while_another_process_leads(self):
+        runs = []
+        leader = CleanupScheduler(60, job=lambda: None)
+        leader.tick()
+
+        run_cleanup_in_background(job=lambda: runs.append(True)).join(5)
+        assert runs == []
+        leader.resign()
+
+    def test_run_cleanup_removes_expired_entries(self, token_blacklist_factory):
+        token_blacklist_factory(expires_at=timezone.now() - timedelta(days=1))
+        kept = token_blacklist_factory()
+
+        run_cleanup()
+
+        assert list(TokenBlacklist.objects.values_list("pk", flat=True)) == [kept.pk]
+
+    def test_run_cleanup_removes_expired_opaque_tokens(self, user_factory):
+        user = user_factory()
+        session = UserSession.objects.create(user=user, current_jti="jti")
+        expired = OpaqueRefreshToken.issue(user.pk, session.pk, 0)
+        OpaqueRefreshToken.objects.update(expires_at=timezone.now())
+        kept = OpaqueRefreshToken.issue(user.pk, session.pk, 0)
+
+        run_cleanup()
+
+        assert OpaqueRefreshToken.consume(expired) is None
+        assert list(OpaqueRefreshToken.objects.values_list("pk", flat=True)) == [
+            OpaqueRefreshToken.hash(kept)
+        ]
+
+    def test_disabled_by_zero_interval(self, settings, monkeypatch):
+        settings.ACCOUNTS_AUTH = {"CLEANUP_INTERVAL": 0}
+        monkeypatch.setattr(scheduler, "cleanup_scheduler", None)
+        assert start_cleanup_scheduler() is None
+
+    def test_start_and_stop_process_scheduler(self, settings, monkeypatch):
+        settings.ACCOUNTS_AUTH = {"CLEANUP_INTERVAL": 3600}
+        monkeypatch.setattr(scheduler, "cleanup_scheduler", None)
+
+        started = start_cleanup_scheduler()
+        assert start_cleanup_scheduler() is started
+        stop_cleanup_scheduler()
+        assert not started._thread.is_alive()
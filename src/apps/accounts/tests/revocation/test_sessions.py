@@ -0,0 +1,101 @@
+import uuid
+
+import pytest
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.models import UserSession
+from apps.accounts.revocation.sessions import (
+    advance_session,
+    is_session_revoked,
+    revoke_session,
+    start_session,
+    token_session_revoked,
+)
+
+
+@pytest.mark.django_db
+class TestSessionStatus:
+    """Test the cached session status lookup."""
+
+    def test_start_session_stamps_sid_claim(self, user_factory):
+        user = user_factory()
+        refresh = RefreshToken.for_user(user)
+        session = start_session(refresh, user)
+        assert refresh["sid"] == str(session.id)
+        assert refresh.access_token["sid"] == str(session.id)
+
+    def test_status_is_cached(self, user_factory, django_assert_num_queries):
+        user = user_factory()
+        session = start_session(RefreshToken.for_user(user), user)
+
+        with django_assert_num_queries(1):
+            assert not is_session_revoked(session.id)
+            assert not is_session_revoked(session.id)
+
+    def test_revoke_updates_cached_status(self, user_factory):
+        user = user_factory()
+        session = start_session(RefreshToken.for_user(user), user)
+        assert not is_session_revoked(session.id)
+
+        assert revoke_session(session.id) is True
+        assert is_session_revoked(session.id)
+
+    def test_unknown_session_is_revoked(self):
+        assert is_session_revoked(uuid.uuid4())
+
+    def test_tokens_without_session_are_not_revoked(self, user_factory):
+        assert not token_session_revoked(RefreshToken.for_user(user_factory()))
+
+
+@pytest.mark.django_db
+class TestSessionFamilies:
+    """Test rotation, reuse detection and the per-user cap."""
+
+    def test_advance_moves_family_forward(self, user_factory):
+        user = user_factory()
+        refresh = RefreshToken.for_user(user)
+        session = start_session(refresh, user)
+
+        assert advance_session(session.id, refresh["jti"], "next-jti") is True
+        session.refresh_from_db()
+        assert session.current_jti == "next-jti"
+        assert session.previous_jti == refresh["jti"]
+
+    def test_reuse_after_grace_period_revokes_family(self, settings, user_factory):
+        settings.ACCOUNTS_AUTH = {"REFRESH_GRACE_PERIOD": 0}
+        user = user_factory()
+        refresh = RefreshToken.for_user(user)
+        session = start_session(refresh, user)
+        advance_session(session.id, refresh["jti"], "next-jti")
+
+        assert advance_session(session.id, refresh["jti"], "other-jti") is False
+        assert is_session_revoked(session.id)
+
+    def test_reuse_within_grace_period_keeps_family(self, user_factory):
+        user = user_factory()
+        refresh = RefreshToken.for_user(user)
+        session = start_session(refresh, user)
+        advance_session(session.id, refresh["jti"], "next-jti")
+
+        assert advance_session(session.id, refresh["jti"], "other-jti") is False
+        assert not is_session_revoked(session.id)
+
+    def test_older_token_within_grace_period_revokes_family(self, user_factory):
+        user = user_factory()
+        refresh = RefreshToken.for_user(user)
+        session = start_session(refresh, user)
+        advance_session(session.id, refresh["jti"], "second-jti")
+        advance_session(session.id, "second-jti", "third-jti")
+
+        assert advance_session(session.id, refresh["jti"], "other-jti") is False
+        assert is_session_revoked(session.id)
+
+    def test_cap_revokes_least_recently_used(self, settings, user_factory):
+        settings.ACCOUNTS_AUTH = {"MAX_SESSIONS_PER_USER": 2}
+        user = user_factory()
+        sessions = [start_session(RefreshToken.for_user(user), user) for _ in range(3)]
+
+        assert is_session_revoked(sessions[0].id)
+        assert not is_session_revoked(sessions[1].id)
+        assert not is_session_revoked(sessions[2].id)
+        assert UserSession.objects.filter(revoked_at__isnull=True).count() == 2
@@ -1,26 +1,23 @@
-from datetime import timedelta
+import uuid
 
 import pytest
 from django.contrib.messages.storage.fallback import FallbackStorage
 from django.urls import reverse
-from django.utils import timezone
 
-from apps.accounts.models import TokenBlacklist
+from apps.accounts import admin as admin_module
+from apps.accounts.models import TokenBlacklist, User
+from core.ids import uuid7
+from core.paginator import EstimatedCountPaginator
 
 
 @pytest.mark.django_db
 class TestTokenBlacklistAdmin:
     """Tests for TokenBlacklistAdmin customizations."""
 
-    def test_jti_short_short_jti(self, token_blacklist_admin):
-        """Short JTI should be returned unchanged."""
-        obj = type("obj", (), {"jti": "shortjti"})()
-        assert token_blacklist_admin.jti_short(obj) == "shortjti"
-
-    def test_jti_short_long_jti(self, token_blacklist_admin):
-        """Long JTI should be truncated with ellipsis."""
-        obj = type("obj", (), {"jti": "a" * 30})()
-        assert token_blacklist_admin.jti_short(obj) == "a" * 20 + "..."
+    def test_jti_short(self, token_blacklist_admin):
+        """JTI should be truncated with ellipsis."""
+        obj = type("obj", (), {"jti": uuid.UUID("a" * 32)})()
+        assert token_blacklist_admin.jti_short(obj) == "a" * 12 + "..."
 
     def test_has_add_permission(
         self, token_blacklist_admin, request_factory, admin_user
@@ -47,17 +44,13 @@ class TestTokenBlacklistAdmin:
         assert token_blacklist_admin.has_delete_permission(request) is False
 
     def test_cleanup_expired_tokens(
-        self,
-        token_blacklist_admin,
-        request_factory,
-        admin_user,
-        token_blacklist_factory,
+        self, token_blacklist_admin, request_factory, admin_user, monkeypatch
     ):
-        """Custom action should delete expired tokens and show correct message."""
-        token_blacklist_factory(
-            expires_at=timezone.now() - timedelta(days=1)
-        )  # expired
-        token_blacklist_factory(expires_at=timezone.now() + timedelta(days=1))  # active
+        """Custom action should start the cleanup in the background."""
+        started = []
+        monkeypatch.setattr(
+            admin_module, "run_cleanup_in_background", lambda: started.append(True)
+        )
 
         request = request_factory.post("/")
         request.user = admin_user
@@ -69,20 +62,19 @@ class TestTokenBlacklistAdmin:
         token_blacklist_admin.cleanup_expired_tokens(request, queryset)
 
         message = list(messages)[0].message
-        assert "Deleted 1 expired token entries" in message
-        assert TokenBlacklist.objects.count() == 1
+        assert "started in the background" in message
+        assert started == [True]
 
     def test_changelist_view_loads_and_displays_short_jti(
         self, admin_client, token_blacklist_factory
     ):
         """Changelist page should load and display shortened JTI."""
-        long_jti = "x" * 40
-        token_blacklist_factory(jti=long_jti)
+        token_blacklist_factory(jti=uuid.UUID("b" * 32))
         url = reverse("admin:accounts_tokenblacklist_changelist")
         response = admin_client.get(url)
         assert response.status_code == 200
         assert "JWT ID" in str(response.content)
-        assert ("x" * 20 + "...") in str(response.content)
+        assert ("b" * 12 + "...") in str(response.content)
 
     def test_add_button_not_present(self, admin_client):
         """Add button should be absent due to has_add_permission=False."""
@@ -101,3 +93,79 @@ class TestTokenBlacklistAdmin:
         response = admin_client.get(url)
         assert response.status_code == 200
         assert "searchtest@example.com" in str(response.content)
+
+    def test_search_by_jti_prefix(self, admin_client, token_blacklist_factory):
+        """A hex term matches the start of the jti, dashes or not."""
+        wanted = token_blacklist_factory(
+            jti=uuid.UUID("0192f0c4-5a1b-7c00-8000-000000000001")
+        )
+        token_blacklist_factory(jti=uuid.UUID("0192f0c5-0000-7000-8000-000000000000"))
+        url = reverse("admin:accounts_tokenblacklist_changelist")
+
+        for term in ("0192f0c4", "0192F0C4-5A1B", wanted.jti.hex):
+            response = admin_client.get(url, {"q": term})
+            assert list(response.context["cl"].result_list) == [wanted]
+
+    def test_changelist_queries_do_not_grow_with_rows(
+        self, admin_client, token_blacklist_factory, django_assert_max_num_queries
+    ):
+        """Owners are joined in and counting reads a bounded number of rows."""
+        token_blacklist_factory.create_batch(20)
+        url = reverse("admin:accounts_tokenblacklist_changelist")
+        with django_assert_max_num_queries(10) as captured:
+            response = admin_client.get(url)
+        assert len(response.context["cl"].result_list) == 20
+        counts = [
+            query["sql"]
+            for query in captured.captured_queries
+            if query["sql"].startswith("SELECT COUNT(*)")
+        ]
+        assert counts
+        assert all("LIMIT" in sql for sql in counts)
+
+    def test_newest_jti_first(self, admin_client, token_blacklist_factory):
+        """uuid7 jtis sort by issue time, the primary key orders the list."""
+        older = token_blacklist_factory(jti=uuid7())
+        newer = token_blacklist_factory(jti=uuid7())
+        url = reverse("admin:accounts_tokenblacklist_changelist")
+        response = admin_client.get(url)
+        assert list(response.context["cl"].result_list) == [newer, older]
+
+
+@pytest.mark.django_db
+class TestUserAdmin:
+    """Tests for UserAdmin search."""
+
+    url = "/admin/accounts/user/"
+
+    def test_search_ranks_email_prefix_first(self, admin_client, user_factory):
+        # joined later and sorting first by email, only the rank puts it last
+        user_factory(email="anna@example.com")
+        user_factory(email="aaron@example.com", first_name="Annabel")
+        user_factory(email="bob@example.com")
+
+        response = admin_client.get(self.url, {"q": "anna"})
+        assert response.status_code == 200
+        results = [user.email for user in response.context["cl"].result_list]
+        assert results == ["anna@example.com", "aaron@example.com"]
+
+    def test_clicked_column_overrides_rank(self, admin_client, user_factory):
+        user_factory(email="anna@example.com")
+        user_factory(email="aaron@example.com", first_name="Annabel")
+
+        response = admin_client.get(self.url, {"q": "anna", "o": "1"})
+        results = [user.email for user in response.context["cl"].result_list]
+        assert results == ["aaron@example.com", "anna@example.com"]
+
+
+@pytest.mark.django_db
+class TestEstimatedCountPaginator:
+    def test_counts_small_querysets(self, user_factory):
+        user_factory.create_batch(3)
+        assert EstimatedCountPaginator(User.objects.order_by("pk"), 2).count == 3
+
+    def test_estimates_large_querysets(self, user_factory, monkeypatch):
+        user_factory.create_batch(3)
+        monkeypatch.setattr(EstimatedCountPaginator, "exact_below", 2)
+        paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 2)
+        assert paginator.count >= 2
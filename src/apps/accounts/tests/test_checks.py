@@ -0,0 +1,35 @@
+import pytest
+
+from apps.accounts.checks import check_refresh_replay_cache, check_shared_cache
+
+
+@pytest.fixture
+def local_cache(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+
+
+@pytest.mark.usefixtures("local_cache")
+def test_process_local_cache_warns():
+    assert [warning.id for warning in check_shared_cache(None)] == ["accounts.W001"]
+
+
+@pytest.mark.usefixtures("local_cache")
+def test_refresh_grace_period_needs_a_shared_cache(settings):
+    settings.ACCOUNTS_AUTH = {"REFRESH_GRACE_PERIOD": 10}
+    assert [w.id for w in check_refresh_replay_cache(None)] == ["accounts.W002"]
+
+    settings.ACCOUNTS_AUTH = {"REFRESH_GRACE_PERIOD": 0}
+    assert check_refresh_replay_cache(None) == []
+
+
+def test_shared_cache_passes(settings):
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://localhost:6379/0",
+        }
+    }
+    assert check_shared_cache(None) == []
+    assert check_refresh_replay_cache(None) == []
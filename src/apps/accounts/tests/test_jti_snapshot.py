@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+from core.jti_snapshot import HEADER, JTISnapshot, SnapshotWatcher, write_snapshot
+
+
+def write(path, jtis, generation=1, max_expiry=2):
+    return write_snapshot(
+        path, sorted(jti.bytes for jti in jtis), generation, max_expiry
+    )
+
+
+class TestJTISnapshot:
+    """Test the memory-mapped jti snapshot format."""
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "blacklist.snap"
+        jtis = [uuid.uuid4() for _ in range(1000)]
+        assert write(path, jtis, generation=123, max_expiry=456) == 1000
+
+        snapshot = JTISnapshot(path)
+        assert len(snapshot) == 1000
+        assert snapshot.generation == 123
+        assert snapshot.max_expiry == 456
+        assert os.path.getsize(path) == HEADER.size + 16 * 1000
+        assert all(jti in snapshot for jti in jtis)
+        assert jtis[0].hex in snapshot
+        assert str(jtis[1]) in snapshot
+        assert uuid.uuid4() not in snapshot
+        assert "not-a-uuid" not in snapshot
+
+    def test_empty_snapshot(self, tmp_path):
+        path = tmp_path / "blacklist.snap"
+        write(path, [])
+        snapshot = JTISnapshot(path)
+        assert len(snapshot) == 0
+        assert uuid.uuid4() not in snapshot
+
+    def test_unsorted_input_leaves_old_file(self, tmp_path):
+        path = tmp_path / "blacklist.snap"
+        kept = uuid.uuid4()
+        write(path, [kept])
+
+        with pytest.raises(ValueError):
+            write_snapshot(path, [b"\xff" * 16, b"\x00" * 16], 1, 2)
+        assert kept in JTISnapshot(path)
+        assert os.listdir(tmp_path) == ["blacklist.snap"]
+
+    def test_invalid_files(self, tmp_path):
+        path = tmp_path / "blacklist.snap"
+        path.write_bytes(b"garbage")
+        with pytest.raises(ValueError):
+            JTISnapshot(path)
+
+        write(path, [uuid.uuid4(), uuid.uuid4()])
+        path.write_bytes(path.read_bytes()[:-1])
+        with pytest.raises(ValueError):
+            JTISnapshot(path)
+
+    def test_watcher_maps_replaced_file(self, tmp_path):
+        path = tmp_path / "blacklist.snap"
+        watcher = SnapshotWatcher(path, interval=0)
+        first, second = uuid.uuid4(), uuid.uuid4()
+        assert watcher.current() is None
+        assert first not in watcher
+
+        write(path, [first])
+        old = watcher.current()
+        assert first in watcher
+
+        write(path, [second])
+        assert not old.is_current()
+        assert second in watcher
+        assert first not in watcher
+        # readers still holding the old mapping keep working
+        assert first in old
+
+    def test_usable_without_django(self):
+        src = Path(__file__).resolve().parents[3]
+        code = "import sys, core.jti_snapshot; assert 'django' not in sys.modules"
+        subprocess.run([sys.executable, "-c", code], cwd=src, check=True)
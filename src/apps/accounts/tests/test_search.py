@@ -0,0 +1,106 @@
+import importlib
+import re
+
+import pytest
+from django.db import connection
+
+from apps.accounts.models import User
+from apps.accounts.search import has_trigram_extension, search_index, search_users
+
+
+def emails(queryset):
+    return [user.email for user in queryset]
+
+
+def plan(queryset):
+    """EXPLAIN queryset with sequential scans ruled out, the tables are tiny."""
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+    return queryset.explain()
+
+
+@pytest.mark.django_db
+class TestSearchUsers:
+    @pytest.fixture(autouse=True)
+    def setup(self, user_factory):
+        user_factory(email="ann@example.com", first_name="Zoe", last_name="Ng")
+        user_factory(email="anne.smith@example.com", first_name="Anne")
+        user_factory(email="zed@example.com", first_name="Joanna", last_name="Ann")
+        user_factory(email="bob@example.org", first_name="Bob")
+
+    def test_exact_email_then_prefixes_then_names(self):
+        assert emails(search_users(User.objects.all(), "ann@example.com")) == [
+            "ann@example.com"
+        ]
+        # equal ranks are newest first
+        assert emails(search_users(User.objects.all(), "ANN")) == [
+            "anne.smith@example.com",
+            "ann@example.com",
+            "zed@example.com",
+        ]
+
+    def test_matches_anywhere_in_email_and_names(self):
+        assert emails(search_users(User.objects.all(), "example.org")) == [
+            "bob@example.org"
+        ]
+        assert emails(search_users(User.objects.all(), "joanna ann")) == [
+            "zed@example.com"
+        ]
+
+    def test_short_and_email_terms_only_match_email_prefixes(self):
+        assert emails(search_users(User.objects.all(), "an")) == [
+            "ann@example.com",
+            "anne.smith@example.com",
+        ]
+        assert emails(search_users(User.objects.all(), "@example")) == []
+
+    def test_blank_term_returns_everything(self):
+        assert search_users(User.objects.all(), "  ").count() == 4
+
+    def test_email_prefix_uses_its_index(self):
+        explained = plan(search_users(User.objects.all(), "ann@"))
+        assert "accounts_user_email_prefix_idx" in explained
+
+    def test_document_search_uses_trigram_index(self):
+        if not has_trigram_extension():
+            pytest.skip("pg_trgm is not installed")
+        explained = plan(search_users(User.objects.all(), "smith"))
+        assert "accounts_user_search_idx" in explained
+
+
+def normalized(sql):
+    return re.sub(r"\s+|\(|\)|\"", "", sql).upper()
+
+
+@pytest.mark.django_db
+def test_migration_indexes_the_searched_expression():
+    migration = importlib.import_module(
+        "apps.accounts.migrations.0015_user_search_indexes"
+    )
+    with connection.schema_editor(collect_sql=True) as schema_editor:
+        schema_editor.add_index(User, search_index(), concurrently=True)
+    expected = normalized(schema_editor.collected_sql[0]).removesuffix(";")
+    frozen = normalized(migration.CREATE_SEARCH_INDEX).replace("IFNOTEXISTS", "")
+    assert frozen == expected
+
+
+@pytest.mark.django_db
+class TestUserListSearch:
+    url = "/api/v1/users/"
+
+    def test_returns_ranked_matches(self, api_client, admin_user, user_factory):
+        user_factory(email="zed@example.com", first_name="Anna")
+        user_factory(email="anna@example.com")
+        api_client.force_authenticate(admin_user)
+
+        response = api_client.get(self.url, {"search": "anna", "page_size": 1})
+        assert response.status_code == 200
+        assert [u["email"] for u in response.data["results"]] == ["anna@example.com"]
+
+    def test_combines_with_filters(self, api_client, admin_user, user_factory):
+        user_factory(email="anna@example.com")
+        inactive = user_factory(email="annabel@example.com", is_active=False)
+        api_client.force_authenticate(admin_user)
+
+        response = api_client.get(self.url, {"search": "anna", "is_active": "false"})
+        assert [u["id"] for u in response.data["results"]] == [str(inactive.id)]
@@ -0,0 +1,153 @@
+import threading
+from datetime import timedelta
+
+import jwt
+import pytest
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken as LegacyAccessToken
+
+from apps.accounts.models import SigningKey
+from apps.accounts.signing import KeyRing, expired_keys, keyring
+from apps.accounts.tokens import AccessToken, RefreshToken
+
+
+@pytest.fixture
+def asymmetric(settings):
+    settings.ACCOUNTS_AUTH = {"SIGNING_ALGORITHM": "EdDSA"}
+
+
+def kid_of(token):
+    return jwt.get_unverified_header(str(token))["kid"]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("asymmetric")
+class TestKeyRingSigning:
+    """Test tokens signed with the rotating asymmetric keys."""
+
+    def test_first_use_creates_a_key(self):
+        token = AccessToken()
+        kid = kid_of(token)
+        key = SigningKey.objects.get()
+        assert key.algorithm == "EdDSA"
+        assert kid == key.kid
+        assert AccessToken(str(token))["jti"] == token["jti"]
+
+    def test_login_and_authenticate(self, user_factory, obtain_tokens):
+        tokens = obtain_tokens(user_factory())
+        assert kid_of(tokens["access"]) == SigningKey.objects.get().kid
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        assert client.get("/api/v1/users/sessions/").status_code == 200
+
+    def test_refresh_and_access_tokens_share_the_key(self):
+        refresh = RefreshToken()
+        assert kid_of(refresh) == kid_of(refresh.access_token)
+
+    def test_rs256(self, settings):
+        settings.ACCOUNTS_AUTH = {"SIGNING_ALGORITHM": "RS256"}
+        token = AccessToken()
+        assert jwt.get_unverified_header(str(token))["alg"] == "RS256"
+        assert AccessToken(str(token))["jti"] == token["jti"]
+
+    def test_unknown_kid_is_rejected(self):
+        raw = jwt.encode(
+            dict(AccessToken().payload),
+            SigningKey.build("EdDSA").private_key,
+            algorithm="EdDSA",
+            headers={"kid": "unknown"},
+        )
+        with pytest.raises(TokenError):
+            AccessToken(raw)
+
+    def test_key_from_another_node_is_loaded_on_first_sight(self):
+        token = AccessToken()
+        str(token)
+        other = SigningKey.generate("EdDSA")
+        raw = jwt.encode(
+            dict(token.payload),
+            other.private_key,
+            algorithm="EdDSA",
+            headers={"kid": other.kid},
+        )
+        assert AccessToken(raw)["jti"] == token["jti"]
+
+    def test_legacy_tokens(self, settings):
+        legacy = str(LegacyAccessToken())
+        assert AccessToken(legacy)
+
+        settings.ACCOUNTS_AUTH = {
+            "SIGNING_ALGORITHM": "EdDSA",
+            "ACCEPT_LEGACY_TOKENS": False,
+        }
+        with pytest.raises(TokenError):
+            AccessToken(legacy)
+
+    def test_removed_key_drops_verified_tokens(self, user_factory, obtain_tokens):
+        tokens = obtain_tokens(user_factory())
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        assert client.get("/api/v1/users/sessions/").status_code == 200
+
+        SigningKey.objects.filter(kid=kid_of(tokens["access"])).delete()
+        SigningKey.generate("EdDSA")
+        keyring.load()
+        assert client.get("/api/v1/users/sessions/").status_code == 401
+
+    def test_pending_key_is_published_but_does_not_sign(self):
+        current = kid_of(AccessToken())
+        pending = SigningKey.generate("EdDSA", timezone.now() + timedelta(hours=1))
+        keyring.reset()
+
+        assert kid_of(AccessToken()) == current
+        published = {key["kid"] for key in keyring.jwks()["keys"]}
+        assert published == {current, pending.kid}
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("asymmetric")
+def test_workers_racing_on_first_use_create_one_key():
+    start = threading.Barrier(4)
+    kids = []
+
+    def worker():
+        ring = KeyRing()
+        start.wait()
+        try:
+            kids.append(ring.signing_backend().kid)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert SigningKey.objects.count() == 1
+    assert kids == [SigningKey.objects.get().kid] * 4
+
+
+def test_expired_keys():
+    now = timezone.now()
+    lifetime = timedelta(days=7)
+    keys = [
+        SigningKey(kid="old", activates_at=now - lifetime * 3),
+        SigningKey(kid="previous", activates_at=now - lifetime * 2),
+        SigningKey(kid="current", activates_at=now - timedelta(days=1)),
+        SigningKey(kid="pending", activates_at=now + timedelta(hours=1)),
+    ]
+    assert [key.kid for key in expired_keys(keys, now)] == ["old"]
+
+
+def test_jwk_round_trip():
+    key = SigningKey.build("EdDSA")
+    jwk = key.public_jwk()
+    assert jwk["kid"] == key.kid
+    assert jwk["alg"] == "EdDSA"
+    assert jwk["use"] == "sig"
+    assert "d" not in jwk
@@ -0,0 +1,59 @@
+import time
+
+from apps.accounts.token_cache import VerifiedTokenCache
+from apps.accounts.tokens import AccessToken
+
+
+class TestVerifiedTokenCache:
+    """Test the per-worker cache of verified access tokens."""
+
+    def test_cached_token_matches_decoded_token(self):
+        token = AccessToken()
+        raw = str(token).encode()
+        cache = VerifiedTokenCache()
+        cache.add(raw, AccessToken(raw))
+
+        cached = cache.get(raw)
+        assert isinstance(cached, AccessToken)
+        assert cached.payload == token.payload
+        assert cached["jti"] == token["jti"]
+
+    def test_payload_is_copied(self):
+        raw = str(AccessToken()).encode()
+        cache = VerifiedTokenCache()
+        cache.add(raw, AccessToken(raw))
+
+        cache.get(raw)["jti"] = "changed"
+        assert cache.get(raw)["jti"] != "changed"
+
+    def test_tampered_token_misses(self):
+        raw = str(AccessToken()).encode()
+        cache = VerifiedTokenCache()
+        cache.add(raw, AccessToken(raw))
+        tampered = raw[:-2] + (b"BB" if raw.endswith(b"AA") else b"AA")
+        assert cache.get(tampered) is None
+
+    def test_entries_expire_with_the_token(self):
+        token = AccessToken()
+        raw = str(token).encode()
+        token["exp"] = int(time.time()) - 1
+        cache = VerifiedTokenCache()
+        cache.add(raw, token)
+        assert cache.get(raw) is None
+        assert not cache._entries
+
+    def test_least_recently_used_is_evicted(self, settings):
+        settings.ACCOUNTS_AUTH = {"TOKEN_CACHE_SIZE": 2}
+        raws = [str(AccessToken()).encode() for _ in range(3)]
+        cache = VerifiedTokenCache()
+        for raw in raws:
+            cache.add(raw, AccessToken(raw))
+        assert cache.get(raws[0]) is None
+        assert cache.get(raws[2]) is not None
+
+    def test_zero_size_disables_cache(self, settings):
+        settings.ACCOUNTS_AUTH = {"TOKEN_CACHE_SIZE": 0}
+        raw = str(AccessToken()).encode()
+        cache = VerifiedTokenCache()
+        cache.add(raw, AccessToken(raw))
+        assert cache.get(raw) is None
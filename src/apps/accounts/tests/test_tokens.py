@@ -0,0 +1,30 @@
+import time
+import uuid
+
+from apps.accounts.tokens import RefreshToken
+from core.ids import uuid7
+
+
+def test_uuid7_layout_and_order():
+    ids = [uuid7() for _ in range(1000)]
+    assert all(value.version == 7 for value in ids)
+    assert all(value.variant == uuid.RFC_4122 for value in ids)
+    assert ids == sorted(ids)
+    assert len({value.int >> 64 for value in ids}) == len(ids)
+
+
+def test_uuid7_is_monotonic_when_the_clock_stands_still(monkeypatch):
+    monkeypatch.setattr(time, "time_ns", lambda: 1_700_000_000_000_000_000)
+    ids = [uuid7() for _ in range(10)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_tokens_carry_uuid7_jtis():
+    refresh = RefreshToken()
+    access = refresh.access_token
+    assert uuid.UUID(refresh["jti"]).version == 7
+    assert uuid.UUID(access["jti"]).version == 7
+
+    refresh.set_jti()
+    assert uuid.UUID(refresh["jti"]).version == 7
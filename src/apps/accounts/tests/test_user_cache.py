@@ -0,0 +1,142 @@
+import uuid
+
+import pytest
+from rest_framework.test import APIClient
+
+from apps.accounts.user_cache import UserCache, user_cache
+
+
+@pytest.mark.django_db
+class TestUserCache:
+    """Test the per-worker cache of users resolved from access tokens."""
+
+    def test_snapshot_is_reused(self, user_factory, django_assert_num_queries):
+        user = user_factory()
+        with django_assert_num_queries(1):
+            first = user_cache.get(user.id)
+            second = user_cache.get(str(user.id))
+        assert first is second
+        assert first.to_user() == user
+        assert first.to_user().email == user.email
+
+    def test_unknown_user(self):
+        assert user_cache.get(uuid.uuid4()) is None
+
+    def test_save_invalidates_snapshot(
+        self, user_factory, django_capture_on_commit_callbacks
+    ):
+        user = user_factory()
+        assert user_cache.get(user.id).to_user().is_active
+
+        user.is_active = False
+        with django_capture_on_commit_callbacks(execute=True):
+            user.save()
+        assert not user_cache.get(user.id).to_user().is_active
+
+    def test_other_workers_see_the_version_bump(
+        self, user_factory, django_capture_on_commit_callbacks
+    ):
+        user = user_factory(first_name="Before")
+        other_worker = UserCache()
+        assert other_worker.get(user.id).to_user().first_name == "Before"
+
+        user.first_name = "After"
+        with django_capture_on_commit_callbacks(execute=True):
+            user.save()
+        assert other_worker.get(user.id).to_user().first_name == "After"
+
+    def test_revoke_tokens_invalidates_snapshot(
+        self, user_factory, django_capture_on_commit_callbacks
+    ):
+        user = user_factory()
+        assert user_cache.get(user.id).to_user().token_version == 0
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user.revoke_tokens()
+        assert user_cache.get(user.id).to_user().token_version == 1
+
+    def test_delete_invalidates_snapshot(
+        self, user_factory, django_capture_on_commit_callbacks
+    ):
+        user = user_factory()
+        user_id = user.id
+        assert user_cache.get(user_id) is not None
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user.delete()
+        assert user_cache.get(user_id) is None
+
+    def test_invalidation_waits_for_commit(
+        self, user_factory, django_capture_on_commit_callbacks
+    ):
+        user = user_factory(first_name="Before")
+        other_worker = UserCache()
+        other_worker.get(user.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user.first_name = "After"
+            user.save()
+            # a concurrent reader must not cache the uncommitted row
+            assert other_worker.get(user.id).to_user().first_name == "Before"
+        assert other_worker.get(user.id).to_user().first_name == "After"
+
+    def test_password_fingerprint_follows_password(
+        self, user_factory, django_capture_on_commit_callbacks
+    ):
+        user = user_factory()
+        before = user_cache.get(user.id).password_fingerprint
+
+        user.set_password("another-password")
+        with django_capture_on_commit_callbacks(execute=True):
+            user.save()
+        assert user_cache.get(user.id).password_fingerprint != before
+
+    def test_least_recently_used_is_evicted(self, settings, user_factory):
+        settings.ACCOUNTS_AUTH = {"USER_CACHE_SIZE": 2}
+        first, second, third = user_factory.create_batch(3)
+        cache = UserCache()
+
+        cache.get(first.id)
+        cache.get(second.id)
+        cache.get(first.id)
+        cache.get(third.id)
+        assert list(cache._entries) == [str(first.id), str(third.id)]
+
+    def test_zero_ttl_disables_cache(
+        self, settings, user_factory, django_assert_num_queries
+    ):
+        settings.ACCOUNTS_AUTH = {"USER_CACHE_TTL": 0}
+        user = user_factory()
+        with django_assert_num_queries(2):
+            user_cache.get(user.id)
+            user_cache.get(user.id)
+
+
+@pytest.mark.django_db
+class TestCachedAuthentication:
+    """Test JWT authentication backed by the user cache."""
+
+    def test_repeat_requests_skip_user_query(
+        self, user_factory, obtain_tokens, django_assert_max_num_queries
+    ):
+        user = user_factory()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {obtain_tokens(user)['access']}")
+
+        assert client.get("/api/v1/users/sessions/").status_code == 200
+        with django_assert_max_num_queries(1):
+            # only the sessions listing itself hits the database
+            assert client.get("/api/v1/users/sessions/").status_code == 200
+
+    def test_deactivated_user_is_rejected(
+        self, user_factory, obtain_tokens, django_capture_on_commit_callbacks
+    ):
+        user = user_factory()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {obtain_tokens(user)['access']}")
+        assert client.get("/api/v1/users/sessions/").status_code == 200
+
+        user.is_active = False
+        with django_capture_on_commit_callbacks(execute=True):
+            user.save()
+        assert client.get("/api/v1/users/sessions/").status_code == 401
@@ -0,0 +1,32 @@
+import jwt
+import pytest
+from rest_framework.test import APIClient
+
+from apps.accounts.tokens import AccessToken
+
+
+@pytest.mark.django_db
+class TestJWKS:
+    """Test the JWKS endpoint."""
+
+    def test_not_found_without_asymmetric_keys(self):
+        assert APIClient().get("/.well-known/jwks.json").status_code == 404
+
+    def test_tokens_verify_with_published_keys(self, settings):
+        settings.ACCOUNTS_AUTH = {"SIGNING_ALGORITHM": "EdDSA", "JWKS_MAX_AGE": 600}
+        token = str(AccessToken())
+
+        response = APIClient().get("/.well-known/jwks.json")
+        assert response.status_code == 200
+        assert "max-age=600" in response["Cache-Control"]
+        assert "public" in response["Cache-Control"]
+
+        # what a downstream service does with the document
+        header = jwt.get_unverified_header(token)
+        jwk = next(k for k in response.json()["keys"] if k["kid"] == header["kid"])
+        payload = jwt.decode(token, jwt.PyJWK(jwk).key, algorithms=[jwk["alg"]])
+        assert payload["token_type"] == "access"
+
+    def test_only_get_is_allowed(self, settings):
+        settings.ACCOUNTS_AUTH = {"SIGNING_ALGORITHM": "EdDSA"}
+        assert APIClient().post("/.well-known/jwks.json").status_code == 405
@@ -0,0 +1,69 @@
+"""Per-worker cache of access tokens whose signature was already verified.
+
+Clients present the same access token on every request until it expires.
+Decoding it means base64, an HMAC over the token and JSON parsing each time,
+for a result that cannot change: the token is immutable and keyed here by
+a digest of its full encoded form, signature included. Entries expire at
+the token's ``exp`` claim. Revocation is not cached, sessions, versions and
+the blacklist are still checked on every request.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from apps.accounts.conf import get_setting
+
+
+def _digest(raw_token):
+    return hashlib.blake2b(raw_token, digest_size=16).digest()
+
+
+class VerifiedTokenCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def clear(self):
+        """Drop every token held by this worker."""
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, raw_token):
+        """Return a validated token for raw_token, or None if not cached."""
+        key = _digest(raw_token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            token_class, payload, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+
+        # what Token.__init__ leaves behind after decoding and verifying
+        token = token_class.__new__(token_class)
+        token.token = raw_token
+        token.current_time = aware_utcnow()
+        token.payload = dict(payload)
+        return token
+
+    def add(self, raw_token, token):
+        """Remember a token that passed verification."""
+        size = get_setting("TOKEN_CACHE_SIZE")
+        expires_at = token.payload.get("exp")
+        if not size or expires_at is None:
+            return
+        with self._lock:
+            key = _digest(raw_token)
+            self._entries[key] = (type(token), dict(token.payload), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
+
+
+verified_tokens = VerifiedTokenCache()
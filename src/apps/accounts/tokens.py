@@ -0,0 +1,36 @@
+"""SimpleJWT tokens with time ordered jtis, signed by the accounts key ring.
+
+Blacklisted jtis are the primary key of ``TokenBlacklist``, uuid7 jtis keep
+those inserts on the right edge of the index instead of scattering them.
+Signing goes through apps/accounts/signing.py, which falls back to
+SIMPLE_JWT's own backend unless ``SIGNING_ALGORITHM`` is set.
+"""
+
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import (
+    AccessToken as BaseAccessToken,
+    RefreshToken as BaseRefreshToken,
+)
+
+from apps.accounts.signing import get_token_backend
+from core.ids import uuid7
+
+
+class TimeOrderedJTIMixin:
+    def set_jti(self):
+        """Set a uuid7 jti, in the hex form SimpleJWT uses."""
+        self.payload[api_settings.JTI_CLAIM] = uuid7().hex
+
+
+class KeyRingMixin:
+    def get_token_backend(self):
+        """Sign and verify with the key ring when asymmetric keys are on."""
+        return get_token_backend()
+
+
+class AccessToken(KeyRingMixin, TimeOrderedJTIMixin, BaseAccessToken):
+    pass
+
+
+class RefreshToken(KeyRingMixin, TimeOrderedJTIMixin, BaseRefreshToken):
+    access_token_class = AccessToken
@@ -0,0 +1,147 @@
+"""Per-worker cache of the users resolved from access tokens.
+
+Every authenticated request needs the token owner, loading it from the
+database each time is a query per request for a row that rarely changes.
+Workers keep an LRU of user snapshots for ``USER_CACHE_TTL`` seconds. Every
+committed save or delete of a user bumps a per-user version in the django
+cache, a snapshot taken at an older version is reloaded. Workers and nodes
+only see each other's bumps through a shared cache backend, with the
+per-process default each worker falls back to its TTL, see checks.py.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.accounts.conf import get_setting
+from apps.accounts.models.user import User
+
+# fields a snapshot carries, anything else is loaded on first access. Kept in
+# model order, Model.from_db() matches values to fields positionally
+SNAPSHOT_FIELDS = tuple(
+    field.attname
+    for field in User._meta.concrete_fields
+    if field.attname
+    in {
+        "id",
+        "email",
+        "first_name",
+        "last_name",
+        "is_active",
+        "is_staff",
+        "is_superuser",
+        "email_verified",
+        "token_version",
+    }
+)
+
+
+def _version_key(user_id):
+    return f"accounts:user_version:{user_id}"
+
+
+class UserSnapshot:
+    """The cached fields of a user, turned into a fresh instance per request."""
+
+    __slots__ = ("values", "password_fingerprint", "version", "expires_at")
+
+    def __init__(self, values, password_fingerprint, version, expires_at):
+        self.values = values
+        # what SimpleJWT's CHECK_REVOKE_TOKEN compares, the hash itself is
+        # never cached
+        self.password_fingerprint = password_fingerprint
+        self.version = version
+        self.expires_at = expires_at
+
+    def to_user(self):
+        """Return a User with the snapshot fields loaded and the rest deferred."""
+        return User.from_db(User.objects.db, SNAPSHOT_FIELDS, self.values)
+
+
+class UserCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def clear(self):
+        """Drop every snapshot held by this worker."""
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, user_id):
+        """Return a snapshot of the user, or None if it does not exist."""
+        key = str(user_id)
+        # read before loading, a bump racing with the load forces a reload
+        version = cache.get(_version_key(key), 0)
+
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if (
+                snapshot is not None
+                and snapshot.version == version
+                and snapshot.expires_at > time.monotonic()
+            ):
+                self._entries.move_to_end(key)
+                return snapshot
+
+        snapshot, _ = self.load(user_id, version=version)
+        return snapshot
+
+    def load(self, user_id, version=None, **annotations):
+        """Load and cache a snapshot of the user, skipping the local copy.
+
+        Keyword arguments are query expressions evaluated in the same query,
+        so checks that would otherwise need their own round trip come back
+        with the user.
+
+        Returns:
+            tuple: (snapshot or None, dict of the annotated values)
+
+        """
+        key = str(user_id)
+        if version is None:
+            version = cache.get(_version_key(key), 0)
+
+        row = (
+            User.objects.filter(pk=user_id)
+            .annotate(**annotations)
+            .values_list(*SNAPSHOT_FIELDS, "password", *annotations)
+            .first()
+        )
+        if row is None:
+            self.forget(key)
+            return None, {}
+
+        fields = len(SNAPSHOT_FIELDS)
+        snapshot = UserSnapshot(
+            row[:fields],
+            get_md5_hash_password(row[fields]),
+            version,
+            time.monotonic() + get_setting("USER_CACHE_TTL"),
+        )
+        with self._lock:
+            self._entries[key] = snapshot
+            self._entries.move_to_end(key)
+            while len(self._entries) > get_setting("USER_CACHE_SIZE"):
+                self._entries.popitem(last=False)
+        return snapshot, dict(zip(annotations, row[fields + 1 :], strict=True))
+
+    def forget(self, user_id):
+        """Drop this worker's snapshot of a user."""
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def invalidate(self, user_id):
+        """Make every worker reload the user on its next request."""
+        self.forget(user_id)
+        key = _version_key(user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+user_cache = UserCache()
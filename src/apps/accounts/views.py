@@ -0,0 +1,21 @@
+from django.http import Http404, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET
+
+from apps.accounts.conf import get_setting
+from apps.accounts.signing import keyring
+
+
+@require_GET
+def jwks(request):
+    """Serve the public signing keys so other services verify tokens locally.
+
+    Keys are published ``JWKS_MAX_AGE`` seconds before they start signing,
+    so verifiers may cache the document for that long.
+    """
+    if get_setting("SIGNING_ALGORITHM") is None:
+        raise Http404("Tokens are not signed with asymmetric keys")
+
+    response = JsonResponse(keyring.jwks())
+    patch_cache_control(response, public=True, max_age=get_setting("JWKS_MAX_AGE"))
+    return response
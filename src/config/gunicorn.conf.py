@@ -1,3 +1,4 @@
+import os
 import sys
 
 log_format = "%(asctime)s %(levelname)s %(name)s %(message)s %(process)d %(thread)d"
@@ -35,9 +36,39 @@ logconfig_dict = {
 
 bind = "0.0.0.0:8000"
 workers = 3
-worker_class = "sync"
+# a sync worker serving one request longer than `timeout` seconds is killed,
+# as a large user export would be. Nodes serving exports set
+# GUNICORN_WORKER_CLASS=gthread, whose heartbeat does not wait for requests
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+threads = int(os.environ.get("GUNICORN_THREADS", "1"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
 
 loglevel = "info"
 accesslog = None  # access log set to offf
 access_log_format = None
 errorlog = "-"
+
+
+def post_worker_init(worker):
+    """Start the blacklist cleanup scheduler and the revocation listener.
+
+    A single worker runs the cleanup, every worker listens for revocations.
+    """
+    from apps.accounts.revocation.listener import start_revocation_listener
+    from apps.accounts.revocation.scheduler import start_cleanup_scheduler
+
+    start_cleanup_scheduler()
+    start_revocation_listener()
+
+
+def worker_exit(server, worker):
+    """Hand cleanup over to another worker right away.
+
+    The waits are bounded, a cleanup batch in flight must not hold up the
+    worker's exit past the arbiter's graceful timeout.
+    """
+    from apps.accounts.revocation.listener import stop_revocation_listener
+    from apps.accounts.revocation.scheduler import stop_cleanup_scheduler
+
+    stop_cleanup_scheduler(timeout=5)
+    stop_revocation_listener(timeout=5)
@@ -7,6 +7,7 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from apps.accounts import views as accounts_views
 from apps.accounts.api.v1 import urls as accounts_api
 
 
@@ -18,6 +19,7 @@ def health_check(request):
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("health/", health_check),
+    path(".well-known/jwks.json", accounts_views.jwks, name="jwks"),
     # api view
     path("api/v1/", include(accounts_api)),
     # drf specracular
@@ -0,0 +1,55 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """Space efficient set membership test with no false negatives.
+
+    ``item in bloom`` returns False only when the item was never added. A True
+    answer means "maybe" and must be confirmed against the real data source.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # optimal bit count and hash count for the requested error rate
+        self.num_bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, item):
+        """Yield bit positions using double hashing over a single digest."""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item):
+        """Add an item to the filter, ignoring items it already reports."""
+        if item in self:
+            return
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self._count += 1
+
+    def __contains__(self, item):
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item)
+        )
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def is_full(self):
+        """Return True once more items were added than the filter was sized for."""
+        return self._count > self.capacity
@@ -0,0 +1,63 @@
+from django.db import connection
+
+
+def estimate_count(sql, params=None):
+    """Return the planner's row estimate for a query without running it.
+
+    Use it instead of ``COUNT(*)`` on large tables, where an exact count
+    needs a full scan. The estimate is only as good as the table statistics
+    and is never below 1.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_or_estimate(queryset, exact_below):
+    """Return the number of rows in queryset and whether it is an estimate.
+
+    Counts exactly, reading at most ``exact_below`` rows, when the planner
+    expects fewer than that. Larger results get the planner's estimate.
+    """
+    queryset = queryset.order_by()
+    sql, params = queryset.query.sql_with_params()
+    estimate = estimate_count(sql, params)
+    if estimate < exact_below:
+        count = queryset[:exact_below].count()
+        if count < exact_below:
+            return count, False
+    return max(estimate, exact_below), True
+
+
+def estimate_table_rows(table):
+    """Return the row count of a table as of its last ANALYZE.
+
+    Partitioned tables are summed over their partitions. Tables that were
+    never analyzed count as empty.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT coalesce(sum(greatest(c.reltuples, 0)), 0)
+            FROM pg_partition_tree(%s::regclass) AS t
+            JOIN pg_class c ON c.oid = t.relid
+            WHERE t.isleaf
+            """,
+            [table],
+        )
+        return int(cursor.fetchone()[0])
+
+
+def replication_lag():
+    """Return the replay lag of the slowest replica in seconds.
+
+    Returns None when there are no replicas, or when the database user is
+    not allowed to see them.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT extract(epoch FROM max(replay_lag)) FROM pg_stat_replication"
+        )
+        lag = cursor.fetchone()[0]
+    return None if lag is None else float(lag)
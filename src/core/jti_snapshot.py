@@ -0,0 +1,189 @@
+"""Sorted, memory-mapped snapshot of blacklisted token ids.
+
+The file is a 32 byte header followed by the 16 byte uuid of every jti in
+ascending byte order, so membership is a binary search over the mapping.
+Every process on a host maps the same file and shares its page cache copy.
+Writers publish a new file by renaming it over the old one, readers notice
+the new inode and remap it. Only the standard library is used so services
+verifying tokens without Django can read it too.
+
+Header, little endian:
+
+    magic        4s   b"JTIS"
+    version      H    1
+    reserved     H
+    generation   Q    microseconds since the epoch, entries blacklisted
+                      before this time are in the file
+    max_expiry   Q    seconds since the epoch, the latest expiry in the file
+    count        Q    number of jtis
+"""
+
+import bisect
+import mmap
+import os
+import struct
+import tempfile
+import time
+import uuid
+
+MAGIC = b"JTIS"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQQQ")
+ENTRY_SIZE = 16
+
+
+def jti_bytes(jti):
+    """Return the 16 byte form of a jti given as uuid, bytes or string."""
+    if isinstance(jti, uuid.UUID):
+        return jti.bytes
+    if isinstance(jti, bytes) and len(jti) == ENTRY_SIZE:
+        return jti
+    return uuid.UUID(str(jti)).bytes
+
+
+def write_snapshot(path, jtis, generation, max_expiry):
+    """Write jtis to path atomically.
+
+    Args:
+        path: Destination file, replaced by rename once fully written
+        jtis: Jtis in ascending order, as accepted by jti_bytes()
+        generation: Microseconds since the epoch the snapshot is current to
+        max_expiry: Seconds since the epoch of the latest expiry in jtis
+
+    Returns:
+        int: Number of jtis written
+
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".jti-snapshot-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"\0" * HEADER.size)
+            count = 0
+            previous = b""
+            for jti in jtis:
+                entry = jti_bytes(jti)
+                if entry <= previous:
+                    raise ValueError("jtis must be unique and in ascending order")
+                f.write(entry)
+                previous = entry
+                count += 1
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, 0, generation, max_expiry, count))
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return count
+
+
+class _Entries:
+    """Sequence view of the jtis in a mapping, for bisect."""
+
+    def __init__(self, buffer, count):
+        self._buffer = buffer
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        start = HEADER.size + index * ENTRY_SIZE
+        return self._buffer[start : start + ENTRY_SIZE]
+
+
+class JTISnapshot:
+    """Read-only view of a snapshot file.
+
+    Args:
+        path: Snapshot file written by write_snapshot()
+
+    Raises:
+        FileNotFoundError: if the file does not exist
+        ValueError: if the file is not a valid snapshot
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self.inode = (stat.st_dev, stat.st_ino)
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"{path} is not a jti snapshot")
+            magic, version, _reserved, generation, max_expiry, count = HEADER.unpack(
+                header
+            )
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} jti snapshot")
+            if stat.st_size != HEADER.size + count * ENTRY_SIZE:
+                raise ValueError(f"{path} is truncated")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.generation = generation
+        self.max_expiry = max_expiry
+        self._entries = _Entries(self._mmap, count)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, jti):
+        try:
+            entry = jti_bytes(jti)
+        except ValueError:
+            return False
+        index = bisect.bisect_left(self._entries, entry)
+        return index < len(self._entries) and self._entries[index] == entry
+
+    def is_current(self):
+        """Return False once a newer snapshot was renamed over the file."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return (stat.st_dev, stat.st_ino) == self.inode
+
+    def close(self):
+        """Unmap the file."""
+        self._mmap.close()
+
+
+class SnapshotWatcher:
+    """Keep the newest snapshot at a path mapped.
+
+    Checks for a replaced file at most every ``interval`` seconds. Readers
+    that only need membership use ``jti in watcher``.
+
+    Args:
+        path: Snapshot file written by write_snapshot()
+        interval: Seconds between checks for a newer file
+
+    """
+
+    def __init__(self, path, interval=5):
+        self.path = path
+        self.interval = interval
+        self._snapshot = None
+        self._next_check = 0.0
+
+    def current(self):
+        """Return the mapped snapshot, or None while no file exists."""
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.interval
+            if self._snapshot is None or not self._snapshot.is_current():
+                try:
+                    # the old mapping is unmapped once no reader holds it
+                    self._snapshot = JTISnapshot(self.path)
+                except FileNotFoundError:
+                    self._snapshot = None
+        return self._snapshot
+
+    def __contains__(self, jti):
+        snapshot = self.current()
+        return snapshot is not None and jti in snapshot
@@ -0,0 +1,20 @@
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+from core.db import count_or_estimate
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that only counts small querysets exactly.
+
+    Larger ones get the planner's estimate instead of a ``COUNT(*)`` over
+    every matching row, so the page numbers of huge tables are approximate
+    and the last pages may come out short or empty.
+    """
+
+    exact_below = 10_000
+
+    @cached_property
+    def count(self):
+        count, _is_estimate = count_or_estimate(self.object_list, self.exact_below)
+        return count